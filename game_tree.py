@@ -0,0 +1,694 @@
+import abc
+import bisect
+import gc
+import io
+import mmap
+import re
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from array import array
+
+# Node flag bits stored in CompactTree.flags
+FLAG_TERMINAL = 1
+
+# Definition tokens: at most one of each is used per line
+DEFINITION_TOKEN = re.compile(r"children=\[(?P<children>[^\]]*)\]|chance=\[(?P<chance>[^\]]*)\]|value=(?P<value>-?\d+(?:\.\d+)?)"
+                              r"|eval=(?P<eval>-?\d+(?:\.\d+)?)")
+# Fast path for the common 'NODE: children=[...]' (optionally followed by ' eval=X', as the
+# editor writes it) / 'NODE: value=X' line with nothing else on it
+SIMPLE_LINE = re.compile(r"([A-Za-z0-9_]+)\s*:\s*(?:children=\[([^\]]*)\](?:\s+eval=(-?\d+(?:\.\d+)?))?"
+                         r"|value=(-?\d+(?:\.\d+)?))")
+DEFAULT_MAX_ERRORS = 50
+PROBABILITY_TOLERANCE = 1e-6  # How far a chance node's probabilities may sum from 1
+
+# Binary tree files: a fixed header, then 8-byte aligned little-endian sections
+# child_start int32[n + 1], child_ids int32[m], values float64[n], flags uint8[n],
+# name_offsets uint64[n + 1] and the UTF-8 name bytes (the last two are omitted
+# for generated names, which only store their prefix).
+BINARY_MAGIC = b"GTREEBIN"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<8sIIQQQ16s")  # magic, version, flags, nodes, edges, name bytes, name prefix
+BINARY_HEADER_SIZE = 64
+BINARY_GENERATED_NAMES = 1  # Header flag bit
+
+
+# --- Compact Tree Representation ---
+class CompactTree:
+    """Array-backed game tree with integer node ids.
+
+    Children are stored CSR-style: the children of node `i` are
+    `child_ids[child_start[i]:child_start[i + 1]]`. Values and flags live in
+    separate typed arrays, and names are only kept for display and lookups.
+    """
+
+    def __init__(self, names, child_start, child_ids, values, flags):
+        self.names = names              # list of node names, indexed by id
+        self.child_start = child_start  # array('i') of len(names) + 1 offsets into child_ids
+        self.child_ids = child_ids      # array('i') of child ids, grouped by parent
+        self.values = values            # array('d') of leaf values (0.0 for non-terminals)
+        self.flags = flags              # array('B') of FLAG_* bits
+        self._ids = None
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def ids(self):
+        """Name -> id lookup, built on first use."""
+        if self._ids is None:
+            self._ids = {name: i for i, name in enumerate(self.names)}
+        return self._ids
+
+    def node_id(self, name):
+        try:
+            if isinstance(self.names, (GeneratedNames, NameTable)):
+                return self.names.lookup(name)
+            return self.ids[name]
+        except KeyError:
+            raise ValueError(f"Node '{name}' not found.") from None
+
+    def children(self, node_id):
+        return self.child_ids[self.child_start[node_id]:self.child_start[node_id + 1]]
+
+    def is_terminal(self, node_id):
+        return bool(self.flags[node_id] & FLAG_TERMINAL)
+
+    def value(self, node_id):
+        """Returns the leaf value as the parser would have produced it (int when integral)."""
+        return py_value(self.values[node_id])
+
+    @classmethod
+    def from_tree_data(cls, tree_data):
+        """Compiles the dict-of-dicts tree used by MinimaxComparisonApp.
+
+        Ids are assigned in depth-first preorder from the roots, so each
+        subtree occupies a contiguous block of ids and siblings sit close
+        together in memory.
+        """
+        referenced = set()
+        for node in tree_data.values():
+            referenced.update(node['children'])
+        roots = [name for name in tree_data if name not in referenced]
+
+        ids = {}
+        names = []
+        stack = list(reversed(roots))
+        while stack:
+            name = stack.pop()
+            if name in ids or name not in tree_data:
+                continue
+            ids[name] = len(names)
+            names.append(name)
+            stack.extend(reversed(tree_data[name]['children']))
+        for name in tree_data:  # Nodes only reachable through a cycle
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+
+        child_start = array('i', [0])
+        child_ids = array('i')
+        values = array('d')
+        flags = array('B')
+        for name in names:
+            node = tree_data[name]
+            child_ids.extend(ids[child] for child in node['children'] if child in ids)
+            child_start.append(len(child_ids))
+            if node['is_terminal']:
+                values.append(node['value'] if node['value'] is not None else 0.0)
+                flags.append(FLAG_TERMINAL)
+            else:
+                values.append(node.get('eval', 0))  # Static value used where a search is cut off
+                flags.append(0)
+        tree = cls(names, child_start, child_ids, values, flags)
+        tree._ids = ids
+        return tree
+
+    def node_data(self, node_id):
+        """The tree_data dict for one node."""
+        terminal = self.is_terminal(node_id)
+        names = self.names
+        node = {
+            'value': self.value(node_id) if terminal else None,
+            'children': [names[c] for c in self.children(node_id)],
+            'is_terminal': terminal,
+        }
+        if not terminal and self.values[node_id]:
+            node['eval'] = self.value(node_id)
+        return node
+
+    def to_tree_data(self):
+        """Expands back into the dict-of-dicts form used by the GUI."""
+        return {name: self.node_data(i) for i, name in enumerate(self.names)}
+
+
+class CompactTreeData(Mapping):
+    """A read-only tree_data view of a CompactTree, for code written against the dict form.
+
+    Node dicts are built when looked up and not kept, so a large (e.g.
+    memory-mapped) tree can be browsed and searched by name without being
+    expanded. The ids of names this view hands out as children are
+    remembered, so following them never searches the name table.
+    """
+
+    def __init__(self, tree):
+        self.compact = tree
+        self._ids = {}  # name -> id for the names seen so far
+
+    def node_id(self, name):
+        node_id = self._ids.get(name)
+        if node_id is None:
+            try:
+                node_id = self.compact.node_id(name)
+            except (ValueError, TypeError):
+                raise KeyError(name) from None
+            self._ids[name] = node_id
+        return node_id
+
+    def __getitem__(self, name):
+        node_id = self.node_id(name)
+        node = self.compact.node_data(node_id)
+        self._ids.update(zip(node['children'], self.compact.children(node_id)))
+        return node
+
+    def __contains__(self, name):
+        try:
+            self.node_id(name)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return len(self.compact)
+
+    def __iter__(self):
+        return iter(self.compact.names)
+
+
+class GeneratedNames(Sequence):
+    """Node names 'N0', 'N1', ... computed on demand, for generated trees too large to store names for."""
+
+    def __init__(self, count, prefix="N"):
+        self.count = count
+        self.prefix = prefix
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, node_id):
+        if isinstance(node_id, slice):
+            return [self[i] for i in range(*node_id.indices(self.count))]
+        if node_id < 0:
+            node_id += self.count
+        if not 0 <= node_id < self.count:
+            raise IndexError(node_id)
+        return f"{self.prefix}{node_id}"
+
+    def lookup(self, name):
+        """Name -> id without building a dict. Raises KeyError for names not in the tree."""
+        digits = name[len(self.prefix):] if isinstance(name, str) and name.startswith(self.prefix) else ""
+        if not digits.isdigit() or (len(digits) > 1 and digits[0] == "0") or int(digits) >= self.count:
+            raise KeyError(name)
+        return int(digits)
+
+
+class NameTable(Sequence):
+    """Node names decoded on demand from a binary tree file's string table."""
+
+    def __init__(self, offsets, buffer, base):
+        self.offsets = offsets  # uint64[n + 1] offsets of each name, relative to `base`
+        self.buffer = buffer    # bytes-like object holding the table (the file's mmap)
+        self.base = base
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, node_id):
+        if isinstance(node_id, slice):
+            return [self[i] for i in range(*node_id.indices(len(self)))]
+        if node_id < 0:
+            node_id += len(self)
+        if not 0 <= node_id < len(self):
+            raise IndexError(node_id)
+        return self.buffer[self.base + self.offsets[node_id]:self.base + self.offsets[node_id + 1]].decode('utf-8')
+
+    def lookup(self, name):
+        """Name -> id by searching the string table, without decoding every name."""
+        encoded = name.encode('utf-8')
+        end = self.base + self.offsets[-1]
+        position = self.buffer.find(encoded, self.base, end)
+        while position != -1:
+            offset = position - self.base
+            node_id = bisect.bisect_right(self.offsets, offset) - 1
+            if self.offsets[node_id] == offset and self.offsets[node_id + 1] - offset == len(encoded):
+                return node_id
+            position = self.buffer.find(encoded, position + 1, end)
+        raise KeyError(name)
+
+
+def py_value(value):
+    """Converts a stored float back to an int when it is integral, matching the parser's output."""
+    if value == value and value not in (float('inf'), float('-inf')) and value == int(value):
+        return int(value)
+    return value
+
+
+def static_value(node):
+    """What a search scores a tree_data node it stops at: the value of a terminal,
+    otherwise the node's static evaluation ('eval=' in the definition, default 0)."""
+    return node['value'] if node['is_terminal'] else node.get('eval', 0)
+
+
+# --- Subtree Size Index ---
+class SubtreeIndex:
+    """Node and leaf counts of every subtree, computed once per tree in linear time.
+
+    `sizes[n]` is the number of nodes under n (n included) and `leaves[n]` the
+    number of childless ones. A subtree shared by several parents is counted
+    under each of them, as a search meets it once per path. Keys are node
+    names for a tree_data dict and node ids for a CompactTree; with `key`
+    (e.g. CompactTreeData.node_id) an id-keyed index is looked up by name.
+    """
+
+    def __init__(self, sizes, leaves, key=None):
+        self.sizes = sizes
+        self.leaves = leaves
+        self.key = key
+
+    def size(self, node):
+        return self.sizes[node if self.key is None else self.key(node)]
+
+    def counts(self, roots):
+        """(nodes, leaves) in the subtrees under `roots`."""
+        sizes, leaves = self.sizes, self.leaves
+        if self.key is not None:
+            roots = [self.key(r) for r in roots]
+        return sum(sizes[r] for r in roots), sum(leaves[r] for r in roots)
+
+    @classmethod
+    def for_tree(cls, tree):
+        """Builds the index for a tree_data dict or a CompactTree. Raises ValueError on a cycle."""
+        if isinstance(tree, CompactTree):
+            sizes = array('q', bytes(8 * len(tree)))
+            leaves = array('q', bytes(8 * len(tree)))
+            return cls._postorder(cls(sizes, leaves), range(len(tree)), tree.children, tree.names)
+        sizes, leaves = {}, {}
+        # A child missing from the dict counts as a single leaf, as the tree view shows nothing under it
+        return cls._postorder(cls(sizes, leaves), tree, lambda name: tree[name]['children'] if name in tree else (), None)
+
+    def _postorder(self, nodes, children_of, names):
+        # Children are finished before their parents, with an explicit stack so depth is not bounded by recursion
+        sizes, leaves = self.sizes, self.leaves
+        done = set()
+        on_path = set()
+        for start in nodes:
+            if start in done:
+                continue
+            stack = [(start, False)]
+            while stack:
+                node, expanded = stack.pop()
+                children = children_of(node)
+                if expanded:
+                    on_path.discard(node)
+                    done.add(node)
+                    if children:
+                        sizes[node] = 1 + sum(sizes[c] for c in children)
+                        leaves[node] = sum(leaves[c] for c in children)
+                    else:
+                        sizes[node] = leaves[node] = 1
+                elif node not in done:
+                    if node in on_path:
+                        raise ValueError(f"Cycle through node '{names[node] if names is not None else node}'.")
+                    on_path.add(node)
+                    stack.append((node, True))
+                    stack.extend((c, False) for c in children if c not in done)
+        return self
+
+
+# --- Node Expansion Interface ---
+class NodeExpander(abc.ABC):
+    """A game tree described by how to expand it rather than by its nodes.
+
+    minimax_with_path and alpha_beta_with_path accept any subclass in place
+    of a tree_data dict (which they search through DictTree), and only call
+    these methods for the nodes they visit. Nodes can be any hashable value
+    (names, ids, game states).
+    """
+
+    @abc.abstractmethod
+    def children(self, node):
+        """Iterable of child nodes, in the order they should be searched."""
+
+    @abc.abstractmethod
+    def is_terminal(self, node):
+        pass
+
+    @abc.abstractmethod
+    def evaluate(self, node):
+        """Value of a terminal node, or a heuristic score where the depth limit stops the search."""
+
+
+class DictTree(NodeExpander):
+    """The dict-of-dicts tree_data as a NodeExpander."""
+
+    def __init__(self, tree_data):
+        self.tree_data = tree_data
+
+    def children(self, node):
+        return self.tree_data[node]['children']
+
+    def is_terminal(self, node):
+        return self.tree_data[node]['is_terminal']
+
+    def evaluate(self, node):
+        return static_value(self.tree_data[node])
+
+
+class CallbackTree(NodeExpander):
+    """A NodeExpander built from three functions, e.g. a game's move generator and evaluator."""
+
+    def __init__(self, children, is_terminal, evaluate):
+        self._children = children
+        self._is_terminal = is_terminal
+        self._evaluate = evaluate
+
+    def children(self, node):
+        return self._children(node)
+
+    def is_terminal(self, node):
+        return self._is_terminal(node)
+
+    def evaluate(self, node):
+        return self._evaluate(node)
+
+
+# --- Tree Definition Parser ---
+class TreeParseError(ValueError):
+    """Raised with every problem found in a tree definition, as (line number, message) pairs."""
+
+    def __init__(self, errors, truncated=False):
+        self.errors = errors
+        self.truncated = truncated
+        lines = [f"line {line_no}: {message}" if line_no else message for line_no, message in errors[:10]]
+        if len(errors) > 10 or truncated:
+            lines.append(f"... and more ({len(errors)} errors collected)")
+        super().__init__("\n".join(lines))
+
+def _is_node_name(name):
+    return name.isascii() and name.replace('_', 'a').isalnum()
+
+def _parse_number(text):
+    if '.' not in text:
+        return int(text)
+    value = float(text)
+    return int(value) if value == int(value) else value
+
+def _parse_chance(definition):
+    """Splits 'A:0.5, B:1/2' (or 'A, B' for equally likely outcomes) into children and probabilities.
+
+    Raises ValueError describing the first problem found.
+    """
+    entries = [entry.strip() for entry in definition.split(',') if entry.strip()]
+    if not entries:
+        raise ValueError("has no outcomes")
+    children = []
+    probabilities = []
+    for entry in entries:
+        child, colon, probability = entry.partition(':')
+        children.append(child.strip())
+        if not colon:
+            probabilities.append(None)
+            continue
+        numerator, slash, denominator = probability.partition('/')
+        try:
+            probability = float(numerator) / float(denominator) if slash else float(numerator)
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f"invalid probability '{entry}'")
+        if not 0 < probability <= 1:
+            raise ValueError(f"probability of '{child.strip()}' must be in (0, 1]")
+        probabilities.append(probability)
+    if all(probability is None for probability in probabilities):
+        probabilities = [1 / len(children)] * len(children)
+    elif None in probabilities:
+        raise ValueError("give a probability for every outcome or for none")
+    elif abs(sum(probabilities) - 1) > PROBABILITY_TOLERANCE:
+        raise ValueError(f"probabilities sum to {sum(probabilities):g}, not 1")
+    return children, probabilities
+
+def parse_tree_definition(source, max_errors=DEFAULT_MAX_ERRORS, allow_shared=True):
+    """Parses the 'NODE: children=[...]' / 'NODE: value=X' language in a single pass.
+
+    A chance node is written 'NODE: chance=[A:0.5, B:0.5]' (or 'chance=[A, B]'
+    for equally likely outcomes); it gets the usual 'children' plus a matching
+    'chance' list of probabilities. Internal nodes may add 'eval=X', a static
+    value the searches use when a depth limit stops them there.
+
+    `source` may be a string, an open text file or any iterable of lines; it is
+    consumed line by line, so only the resulting tree is held in memory. All
+    problems are collected with their line numbers (up to `max_errors`) and
+    raised together as a TreeParseError.
+
+    A node may be listed under several parents (a DAG, e.g. one position
+    reached by different move orders) unless `allow_shared` is False; cycles
+    are always rejected.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+
+    tree = {}
+    node_parents = {}  # child -> (first parent, line number), for multiple-parent and undefined-child checks
+    errors = []
+    truncated = False
+    # Every cycle has an edge to a node defined on an earlier line, so a file
+    # without one (any top-down definition) needs no cycle search
+    back_edges = False
+
+    def error(line_no, message):
+        nonlocal truncated
+        if len(errors) < max_errors:
+            errors.append((line_no, message))
+        else:
+            truncated = True
+
+    # Parsing allocates one dict per node and nothing cyclic, so pause the cyclic
+    # GC instead of letting it rescan the growing tree over and over
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for line_no, line in enumerate(source, start=1):
+            line = line.strip()
+            if not line or line[0] == '#':
+                continue
+
+            match = SIMPLE_LINE.fullmatch(line)
+            if match:
+                node_name, children_str, eval_str, value_str = match.groups()
+                if node_name in tree:
+                    error(line_no, f"Duplicate node '{node_name}'.")
+                    continue
+            else:
+                node_name, colon, definition = line.partition(':')
+                node_name = node_name.strip()
+                if not colon or not node_name or not _is_node_name(node_name):
+                    error(line_no, f"Invalid format: '{line}'. Expected 'NODE: definition'.")
+                    continue
+                if node_name in tree:
+                    error(line_no, f"Duplicate node '{node_name}'.")
+                    continue
+
+                children_str = chance_str = value_str = eval_str = None
+                for token in DEFINITION_TOKEN.finditer(definition):
+                    if token.group('children') is not None:
+                        if children_str is None:
+                            children_str = token.group('children')
+                    elif token.group('chance') is not None:
+                        if chance_str is None:
+                            chance_str = token.group('chance')
+                    elif token.group('eval') is not None:
+                        if eval_str is None:
+                            eval_str = token.group('eval')
+                    elif value_str is None:
+                        value_str = token.group('value')
+                if chance_str is not None:
+                    tree[node_name] = {'value': None, 'children': [], 'is_terminal': False}
+                    if children_str is not None or value_str is not None:
+                        error(line_no, f"Chance node '{node_name}' cannot also have 'children' or 'value'.")
+                        continue
+                    try:
+                        children, probabilities = _parse_chance(chance_str)
+                    except ValueError as e:
+                        error(line_no, f"Chance node '{node_name}': {e}.")
+                        continue
+                    tree[node_name]['chance'] = probabilities
+                    children_str = ", ".join(children)
+
+            node = tree.setdefault(node_name, {'value': None, 'children': [], 'is_terminal': False})
+            if eval_str is not None:
+                if value_str is not None:
+                    error(line_no, f"Terminal node '{node_name}' cannot have an 'eval'; its 'value' is used.")
+                    continue
+                node['eval'] = _parse_number(eval_str)
+            if children_str is not None:
+                if value_str is not None:
+                    error(line_no, f"Node '{node_name}' cannot have both children and value.")
+                    continue
+                if not children_str.strip():
+                    error(line_no, f"Node '{node_name}' has empty children '[]' but no 'value'.")
+                    continue
+                children = [c for c in map(str.strip, children_str.split(',')) if c]
+                if not children:
+                    error(line_no, f"Invalid children format for '{node_name}'.")
+                    continue
+                node['children'] = children
+                if len(set(children)) != len(children):
+                    error(line_no, f"Node '{node_name}' lists the same child more than once.")
+                    continue
+                for child in children:
+                    if child in tree:
+                        back_edges = True
+                    if child not in node_parents:
+                        node_parents[child] = (node_name, line_no)
+                    elif not allow_shared:
+                        error(line_no, f"Node '{child}' has multiple parents (defined under '{node_name}' and '{node_parents[child][0]}')")
+            elif value_str is not None:
+                node['value'] = _parse_number(value_str)
+                node['is_terminal'] = True
+            else:
+                error(line_no, f"Node '{node_name}' must define 'children' or 'value'.")
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    for child, (parent, line_no) in node_parents.items():
+        if child not in tree:
+            error(line_no, f"Undefined child '{child}' of '{parent}'.")
+    if not errors and back_edges:
+        cycle = find_cycle(tree)
+        if cycle:
+            error(0, f"Cycle in tree definition: {' -> '.join(cycle)}.")
+
+    if errors:
+        raise TreeParseError(errors, truncated)
+    return tree
+
+def find_cycle(tree_data):
+    """Returns the node names along a cycle (first node repeated at the end), or None if the graph is acyclic."""
+    on_path = set()  # Nodes on the current DFS path
+    finished = set()
+    for start in tree_data:
+        if start in finished:
+            continue
+        on_path.add(start)
+        path = [start]
+        stack = [iter(tree_data[start]['children'])]
+        while stack:
+            for child in stack[-1]:
+                if child in on_path:
+                    return path[path.index(child):] + [child]
+                if child not in finished and child in tree_data:
+                    on_path.add(child)
+                    path.append(child)
+                    stack.append(iter(tree_data[child]['children']))
+                    break
+            else:
+                node = path.pop()
+                on_path.remove(node)
+                finished.add(node)
+                stack.pop()
+    return None
+
+def parse_tree_file(path, max_errors=DEFAULT_MAX_ERRORS, encoding='utf-8', allow_shared=True):
+    """Streams a tree definition from a file; `allow_shared` is as for parse_tree_definition."""
+    with open(path, encoding=encoding) as f:
+        return parse_tree_definition(f, max_errors, allow_shared)
+
+
+# --- Binary Tree Files ---
+def _align(offset):
+    return (offset + 7) & ~7
+
+def save_tree_binary(tree, path):
+    """Writes a tree (tree_data dict or CompactTree) to the binary format read by load_tree_binary."""
+    if not isinstance(tree, CompactTree):
+        if any('chance' in node for node in tree.values()):
+            raise ValueError("Binary tree files cannot store chance nodes.")
+        tree = CompactTree.from_tree_data(tree)
+    generated = isinstance(tree.names, GeneratedNames)
+    flags = BINARY_GENERATED_NAMES if generated else 0
+    prefix = tree.names.prefix.encode('utf-8') if generated else b""
+    if len(prefix) > 16:
+        raise ValueError("Generated name prefix is too long for the file header.")
+
+    sections = [array('i', tree.child_start), array('i', tree.child_ids), array('d', tree.values), array('B', tree.flags)]
+    name_bytes = 0
+    if not generated:
+        encoded = [name.encode('utf-8') for name in tree.names]
+        offsets = array('Q', [0])
+        for name in encoded:
+            name_bytes += len(name)
+            offsets.append(name_bytes)
+        sections += [offsets, b"".join(encoded)]
+    if sys.byteorder != 'little':
+        for section in sections[:-1] if not generated else sections:
+            section.byteswap()
+
+    with open(path, 'wb') as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, len(tree), len(tree.child_ids), name_bytes, prefix))
+        offset = BINARY_HEADER_SIZE
+        f.write(bytes(offset - BINARY_HEADER.size))
+        for section in sections:
+            data = memoryview(section).cast('B')
+            f.write(data)
+            offset += len(data)
+            f.write(bytes(_align(offset) - offset))
+            offset = _align(offset)
+
+def load_tree_binary(path):
+    """Opens a binary tree file as a CompactTree whose arrays are views of a read-only memory map.
+
+    Nothing is read up front: pages are loaded by the OS as the search touches
+    them and are shared with every other process mapping the same file.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            raise ValueError(f"'{path}' is not a binary tree file.") from None
+    if len(mapped) < BINARY_HEADER_SIZE:
+        raise ValueError(f"'{path}' is not a binary tree file.")
+    magic, version, flags, count, edges, name_bytes, prefix = BINARY_HEADER.unpack_from(mapped)
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"'{path}' is not a binary tree file.")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary tree file version {version}.")
+
+    buffer = memoryview(mapped)
+    offset = BINARY_HEADER_SIZE
+    def section(typecode, length):
+        nonlocal offset
+        nbytes = length * array(typecode).itemsize
+        if offset + nbytes > len(buffer):
+            raise ValueError(f"'{path}' is truncated.")
+        view = buffer[offset:offset + nbytes]
+        start = offset
+        offset = _align(offset + nbytes)
+        if sys.byteorder != 'little' and typecode != 'B':
+            data = array(typecode, view.tobytes())
+            data.byteswap()
+            return data, start
+        return view.cast(typecode), start
+
+    child_start, _ = section('i', count + 1)
+    child_ids, _ = section('i', edges)
+    values, _ = section('d', count)
+    node_flags, _ = section('B', count)
+    if flags & BINARY_GENERATED_NAMES:
+        names = GeneratedNames(count, prefix.rstrip(b"\0").decode('utf-8'))
+    else:
+        offsets, _ = section('Q', count + 1)
+        _, names_start = section('B', name_bytes)
+        names = NameTable(offsets, mapped, names_start)
+
+    tree = CompactTree(names, child_start, child_ids, values, node_flags)
+    tree.source_path = path
+    return tree
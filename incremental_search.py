@@ -0,0 +1,97 @@
+import math
+
+from game_tree import static_value
+
+
+# --- Incremental Minimax ---
+class IncrementalMinimax:
+    """Minimax over a tree_data dict that keeps every subtree's value between searches.
+
+    After an edit, call node_changed() (or node_added()) and only the edited
+    node and its ancestors are dropped from the cache; the next evaluate()
+    re-searches that chain and reuses the cached values of everything else.
+    Shared subtrees (DAGs) are cached once and invalidated through every parent.
+    """
+
+    def __init__(self, tree_data):
+        self.tree_data = tree_data
+        self.parents = {}  # child -> list of parents
+        for name, node in tree_data.items():
+            for child in node['children']:
+                self.parents.setdefault(child, []).append(name)
+        # node -> {(is_maximizing, remaining depth): (value, best child)}
+        self.cache = {}
+        self.searched = set()  # (root, is_maximizing, depth) of every evaluate() so far
+
+    def node_added(self, node_name, parent_name=None):
+        """Records a new node (already in tree_data) and invalidates its parent's ancestors."""
+        if parent_name is not None:
+            self.parents.setdefault(node_name, []).append(parent_name)
+        self.node_changed(node_name)
+
+    def node_changed(self, node_name):
+        """Drops the cached values of `node_name` and every node above it."""
+        stack = [node_name]
+        seen = set()
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            self.cache.pop(name, None)
+            stack.extend(self.parents.get(name, ()))
+        return len(seen)
+
+    def clear(self):
+        self.cache.clear()
+        self.searched.clear()
+
+    def has_searched(self, node_name, is_maximizing=True, depth=None):
+        """True once evaluate() has filled the cache for this search: repeating it only re-searches edited chains."""
+        return (node_name, is_maximizing, depth) in self.searched
+
+    def evaluate(self, node_name, is_maximizing=True, depth=None, stats=None):
+        """Returns (value, path) like minimax_with_path, searching only nodes without a cached value."""
+        value = self._evaluate(node_name, is_maximizing, depth, 0, stats)
+        self.searched.add((node_name, is_maximizing, depth))
+        return value, self._cached_pv(node_name, is_maximizing, depth)
+
+    def _evaluate(self, node_name, is_maximizing, depth, ply, stats):
+        node = self.tree_data[node_name]
+        children = node['children']
+        if node['is_terminal'] or (depth is not None and depth <= 0) or not children:
+            if stats is not None:
+                stats.record_leaf(ply)
+            return static_value(node)
+
+        key = (is_maximizing, depth)
+        entries = self.cache.get(node_name)
+        if entries is not None and key in entries:
+            if stats is not None:
+                stats.memory_hits += 1
+            return entries[key][0]
+        if stats is not None:
+            stats.record_expand(ply)
+
+        next_depth = None if depth is None else depth - 1
+        best_value = -math.inf if is_maximizing else math.inf
+        best_child = None
+        for child in children:
+            value = self._evaluate(child, not is_maximizing, next_depth, ply + 1, stats)
+            if value > best_value if is_maximizing else value < best_value:
+                best_value = value
+                best_child = child
+        self.cache.setdefault(node_name, {})[key] = (best_value, best_child)
+        return best_value
+
+    def _cached_pv(self, node_name, is_maximizing, depth):
+        path = [node_name]
+        while True:
+            entry = self.cache.get(node_name, {}).get((is_maximizing, depth))
+            if entry is None or entry[1] is None:
+                break
+            node_name = entry[1]
+            is_maximizing = not is_maximizing
+            depth = None if depth is None else depth - 1
+            path.append(node_name)
+        return path
@@ -1,101 +1,238 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import os
 import re
+import json
+import heapq
+import itertools
 import time
 import math
 import threading
 
-# --- Algorithm Implementation ---
-def minimax_with_path(node_name, tree, is_maximizing, depth=None):
-    node = tree[node_name]
-    
-    # Base case: terminal node or depth limit reached
-    if node['is_terminal']:
-        return node['value'], [node_name]
-    if depth is not None and depth <= 0:
-        # Return a heuristic value at depth limit (or a default value)
-        # For simplicity, we'll use 0 as the heuristic when depth limit is reached
-        return 0, [node_name]
-    
-    children = node['children']
-    if not children:  # Safety check for non-terminal with no children
-        return 0, [node_name]
-    
-    best_path = []
-    if is_maximizing:
-        best_value = -math.inf
-        for child in children:
-            value, path = minimax_with_path(child, tree, False, None if depth is None else depth - 1)
-            if value > best_value:
-                best_value = value
-                best_path = [node_name] + path
-    else:  # Minimizing player
-        best_value = math.inf
-        for child in children:
-            value, path = minimax_with_path(child, tree, True, None if depth is None else depth - 1)
-            if value < best_value:
-                best_value = value
-                best_path = [node_name] + path
-    
-    return best_value, best_path
+from game_tree import CompactTree, CompactTreeData, SubtreeIndex, parse_tree_definition, parse_tree_file, py_value, save_tree_binary, load_tree_binary
+from incremental_search import IncrementalMinimax
+from parallel_search import parallel_alpha_beta, shutdown_search_pool
+from search_trace import TraceWriter, TraceReader, TraceReplay, format_event
+from tree_generator import VALUE_DISTRIBUTIONS, ORDERINGS, generate_tree, uniform_tree_size
+from tree_search import (SearchStats, minimax_with_path, alpha_beta_with_path, minimax_compact, alpha_beta_compact,
+                         minimax_iterative, alpha_beta_iterative, negamax_with_path, pvs_with_path,
+                         aspiration_search, mtdf_with_path, StaticValueOrdering, KillerMoveOrdering,
+                         HistoryOrdering, ShallowSearchOrdering, search_shape, best_case_leaves,
+                         expectiminimax_with_path, star1_with_path, star2_with_path, iterative_deepening)
+from vector_search import HAVE_NUMPY, minimax_vectorized
+
+# Search engines selectable in the comparison tab: (tree preparation, minimax, alpha-beta).
+# The preparation is CompactTree.from_tree_data for the compact engines, dict for engines that
+# want tree_data expanded into a dict, and None to search tree_data as it is (dict or CompactTreeData)
+SEARCH_ENGINES = {
+    "Recursive (dict tree)": (dict, minimax_with_path, alpha_beta_with_path),
+    "Compact array tree": (CompactTree.from_tree_data, minimax_compact, alpha_beta_compact),
+    "Iterative (explicit stack)": (None, minimax_iterative, alpha_beta_iterative),
+    "Parallel alpha-beta (processes)": (CompactTree.from_tree_data, minimax_compact, parallel_alpha_beta),
+}
+if HAVE_NUMPY:  # Complete trees only; alpha-beta runs on the same compact tree
+    SEARCH_ENGINES["Vectorized levels (NumPy)"] = (CompactTree.from_tree_data, minimax_vectorized, alpha_beta_compact)
+DEFAULT_ENGINE = "Recursive (dict tree)"
+
+# Synthetic trees are expanded into tree_data for the GUI, so keep them to a size it can hold;
+# larger trees are for tree_bench, which searches the compact form directly
+MAX_GENERATED_NODES = 2000000
+GENERATED_TEXT_LIMIT = 5000  # Larger generated trees are not written out to the definition text
+
+# Additional engines run on the same dict tree and listed in the engine table:
+# each is called as fn(root, tree, is_maximizing, depth=..., stats=...) -> (value, path)
+EXTRA_ENGINES = {
+    "Negamax (fail-soft)": negamax_with_path,
+    "PVS / NegaScout": pvs_with_path,
+    "Aspiration PVS": aspiration_search,
+    "MTD(f)": mtdf_with_path,
+}
+# Expectiminimax engines, run only when the tree has chance nodes
+CHANCE_ENGINES = {
+    "Expectiminimax (full)": expectiminimax_with_path,
+    "Star1": star1_with_path,
+    "Star2 (probing)": star2_with_path,
+}
+# Move orderings tried with alpha-beta on the dict tree (factories, since orderings keep per-search state)
+MOVE_ORDERINGS = {
+    "Static value (lookahead 2)": lambda: StaticValueOrdering(lookahead=2),
+    "Killer moves": KillerMoveOrdering,
+    "History heuristic": HistoryOrdering,
+    "Shallow search (depth 2)": lambda: ShallowSearchOrdering(depth=2),
+}
+# Optional comparison runs, each another search of the whole tree: off until ticked in the comparison tab
+EXTRA_RUNS = ("Negamax engines", "Move orderings", "Transposition tables", "Iterative deepening")
+ENGINE_TABLE_COLUMNS = (("value", "Value", 70), ("nodes", "Nodes", 70), ("leaves", "Leaves", 70),
+                        ("cutoffs", "Cutoffs", 70), ("pruned", "Pruned", 70), ("pruned_leaves", "Pruned Leaves", 90),
+                        ("re_searches", "Re-searches", 85),
+                        ("memory_hits", "TT Hits", 70), ("ordering_cost", "Order Cost", 80), ("time", "Time (ms)", 80))
+
+NODE_LIST_LIMIT = 2000  # Nodes listed in the 'Add Nodes' tab before the list is truncated
+PRUNED_LIST_LIMIT = 50  # Pruned node names spelled out in the comparison summary
+TRACE_CONTEXT_EVENTS = 10  # Events listed before and after the current one in the trace tab
+
+
+# --- Lazy Tree View ---
+class LazyTreeView:
+    """A ttk.Treeview over tree_data that only creates rows for nodes whose parent is expanded.
+
+    Each collapsed node gets a single placeholder row; its children are
+    inserted when it is opened, PAGE_SIZE at a time, so the cost of a redraw
+    depends on what is on screen rather than on the size of the tree.
+    """
+    PAGE_SIZE = 500
+
+    def __init__(self, parent, font=None):
+        self.frame = ttk.Frame(parent)
+        self.view = ttk.Treeview(self.frame, columns=("value", "status"), selectmode="browse")
+        self.view.heading("#0", text="Node")
+        self.view.heading("value", text="Value")
+        self.view.heading("status", text="Search")
+        self.view.column("#0", width=400, stretch=True)
+        self.view.column("value", width=80, anchor=tk.E, stretch=False)
+        self.view.column("status", width=100, stretch=False)
+        scroll_y = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.view.yview)
+        scroll_x = ttk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.view.xview)
+        self.view.configure(yscrollcommand=scroll_y.set, xscrollcommand=scroll_x.set)
+        self.view.grid(row=0, column=0, sticky="nsew")
+        scroll_y.grid(row=0, column=1, sticky="ns")
+        scroll_x.grid(row=1, column=0, sticky="ew")
+        self.frame.rowconfigure(0, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+
+        tag_font = font or ("Segoe UI", 10)
+        self.view.tag_configure("pv", background="#d4edda", font=(tag_font[0], tag_font[1], "bold"))
+        self.view.tag_configure("pruned", foreground="#c0392b")
+        self.view.tag_configure("inside_pruned", foreground="#a0a0a0")
+        self.view.tag_configure("more", foreground="#5b8cb8")
+        self.view.bind("<<TreeviewOpen>>", self._on_open)
+        self.view.bind("<<TreeviewSelect>>", self._on_select)
+
+        self.tree_data = {}
+        self.pruned = frozenset()
+        self.pv = ()
+        self.subtree_index = None  # Sizes of the pruned subtrees, shown next to them
+        self._rows = {}   # row iid -> (node name, depth, on the PV, inside a pruned subtree)
+        self._name_rows = {}  # node name -> row iids showing it (several for shared subtrees)
+        self._pages = {}  # "more" row iid -> (parent row iid, offset of the next child)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def clear(self, message=None):
+        self.view.delete(*self.view.get_children())
+        self._rows.clear()
+        self._name_rows.clear()
+        self._pages.clear()
+        if message:
+            self.view.insert("", tk.END, text=message)
+
+    def show(self, tree_data, root, pruned=(), pv=(), subtree_index=None):
+        """Shows the tree from `root`, opening the principal variation so it is visible.
+
+        With a SubtreeIndex for tree_data, each pruned row also shows how many
+        nodes its eliminated subtree holds; rows under it are greyed out as
+        they are opened, so the subtree is never walked to mark it.
+        """
+        self.clear()
+        self.tree_data = tree_data
+        self.pruned = frozenset(pruned)
+        self.pv = tuple(pv)
+        self.subtree_index = subtree_index
+        iid = self._insert_node("", root, 0, bool(self.pv) and self.pv[0] == root, False)
+        # Expand along the PV
+        for depth in range(1, len(self.pv)):
+            self.view.item(iid, open=True)
+            self._load_children(iid)
+            iid = next((child for child in self.view.get_children(iid)
+                        if self._rows.get(child, (None,))[0] == self.pv[depth] and self._rows[child][2]), None)
+            if iid is None:
+                break
+        if iid is not None:
+            self.view.see(iid)
+
+    def _insert_node(self, parent_iid, name, depth, on_pv, inside_pruned):
+        node = self.tree_data[name]
+        if name in self.pruned and not inside_pruned:
+            tags, status = ("pruned",), "PRUNED"
+            if self.subtree_index is not None:
+                status = f"PRUNED ({self.subtree_index.size(name)})"
+        elif inside_pruned:
+            tags, status = ("inside_pruned",), ""
+        elif on_pv:
+            tags, status = ("pv",), "PV"
+        else:
+            tags, status = (), ""
+        value = node['value'] if node['is_terminal'] else ("chance" if 'chance' in node else "")
+        iid = self.view.insert(parent_iid, tk.END, text=name, values=(value, status), tags=tags)
+        self._rows[iid] = (name, depth, on_pv, inside_pruned or name in self.pruned)
+        self._name_rows.setdefault(name, []).append(iid)
+        if node['children']:
+            self.view.insert(iid, tk.END, text="...")  # Placeholder so the node shows an expand arrow
+        return iid
+
+    def _load_children(self, iid, offset=0):
+        """Replaces the placeholder (or a 'more' row) with the next page of children."""
+        name, depth, on_pv, inside_pruned = self._rows[iid]
+        if offset == 0:
+            if any(child in self._rows for child in self.view.get_children(iid)):
+                return  # Already loaded
+            self.view.delete(*self.view.get_children(iid))
+        children = self.tree_data[name]['children']
+        pv_child = self.pv[depth + 1] if on_pv and depth + 1 < len(self.pv) else None
+        end = min(offset + self.PAGE_SIZE, len(children))
+        for child in children[offset:end]:
+            if child in self.tree_data:
+                self._insert_node(iid, child, depth + 1, child == pv_child, inside_pruned)
+        if end < len(children):
+            more_iid = self.view.insert(iid, tk.END, text=f"... {len(children) - end} more children (select to load)", tags=("more",))
+            self._pages[more_iid] = (iid, end)
+
+    def is_showing(self, tree_data):
+        return self.tree_data is tree_data and bool(self._rows)
+
+    def node_added(self, parent_name, name):
+        """Adds `name` under every visible row of `parent_name` without redrawing the rest of the tree."""
+        for iid in self._name_rows.get(parent_name, ()):
+            _, depth, _, inside_pruned = self._rows[iid]
+            self.view.set(iid, "value", "")  # The parent may have been a terminal until now
+            rows = self.view.get_children(iid)
+            if not rows:
+                self.view.insert(iid, tk.END, text="...")
+            elif any(row in self._rows for row in rows) and not any(row in self._pages for row in rows):
+                self._insert_node(iid, name, depth + 1, False, inside_pruned)
+            # Otherwise the children are not loaded yet (or are paged) and the new child is picked up on load
+
+    def _on_open(self, event=None):
+        iid = self.view.focus()
+        if iid in self._rows:
+            self._load_children(iid)
+
+    def _on_select(self, event=None):
+        for iid in self.view.selection():
+            if iid in self._pages:
+                parent_iid, offset = self._pages.pop(iid)
+                self.view.delete(iid)
+                self._load_children(parent_iid, offset)
 
-def alpha_beta_with_path(node_name, tree, alpha, beta, is_maximizing, depth=None, pruned_info=None):
-    if pruned_info is None:
-        pruned_info = {"count": 0, "nodes": []}
-    
-    node = tree[node_name]
-    
-    # Base case: terminal node or depth limit reached
-    if node['is_terminal']:
-        return node['value'], [node_name], pruned_info
-    if depth is not None and depth <= 0:
-        # Return a heuristic value at depth limit
-        return 0, [node_name], pruned_info
-    
-    children = node['children']
-    if not children:  # Safety check
-        return 0, [node_name], pruned_info
-    
-    best_path = []
-    if is_maximizing:
-        best_value = -math.inf
-        for i, child in enumerate(children):
-            value, path, pruned_info = alpha_beta_with_path(child, tree, alpha, beta, False, None if depth is None else depth - 1, pruned_info)
-            if value > best_value:
-                best_value = value
-                best_path = [node_name] + path
-            alpha = max(alpha, best_value)
-            if beta <= alpha:
-                # Beta cutoff - prune remaining children
-                pruned_info["count"] += len(children) - (i + 1)
-                for j in range(i + 1, len(children)):
-                    pruned_info["nodes"].append(children[j])
-                break  # Beta cutoff
-    else:  # Minimizing player
-        best_value = math.inf
-        for i, child in enumerate(children):
-            value, path, pruned_info = alpha_beta_with_path(child, tree, alpha, beta, True, None if depth is None else depth - 1, pruned_info)
-            if value < best_value:
-                best_value = value
-                best_path = [node_name] + path
-            beta = min(beta, best_value)
-            if beta <= alpha:
-                # Alpha cutoff - prune remaining children
-                pruned_info["count"] += len(children) - (i + 1)
-                for j in range(i + 1, len(children)):
-                    pruned_info["nodes"].append(children[j])
-                break  # Alpha cutoff
-    
-    return best_value, best_path, pruned_info
 
 # --- GUI Application ---
 class MinimaxComparisonApp:
     def __init__(self, master):
         self.master = master
         self.tree_data = {}  # Will store the parsed tree
+        self.compact_tree = None  # CompactTree form of tree_data (e.g. a memory-mapped file), reused across runs
+        self.compact_tree_source = None  # The tree_data dict and node count compact_tree was built from
+        self.compact_tree_size = 0
+        self.incremental = None  # IncrementalMinimax over tree_data, kept up to date by add_node_base
+        self.subtree_indexes = {}  # Whether the tree is compact -> (tree_data, node count, SubtreeIndex)
+        self.last_comparison = None  # Instrumentation from the last run, for export
+        self.trace_reader = None  # Open TraceReader and its TraceReplay in the trace tab
+        self.trace_replay = None
         
         # Configure the window
         master.title("Minimax & Alpha-Beta Pruning Comparison")
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
         master.geometry("1000x680")
         master.minsize(800, 600)
         
@@ -111,10 +248,16 @@ class MinimaxComparisonApp:
         self.setup_node_addition_tab()
         self.setup_tree_visualization_tab()
         self.setup_comparison_tab()
+        self.setup_trace_tab()
         
         # Setup status bar at bottom of window
         self.setup_status_bar()
         
+    def on_close(self):
+        """Stops the parallel engine's worker processes before the window goes away."""
+        shutdown_search_pool()
+        self.master.destroy()
+
     def setup_styles(self):
         self.style = ttk.Style()
         
@@ -148,6 +291,14 @@ class MinimaxComparisonApp:
     def setup_ui_variables(self):
         self.status_var = tk.StringVar(value="Ready")
         self.depth_var = tk.StringVar(value="")
+        self.time_limit_var = tk.StringVar(value="")
+        self.engine_var = tk.StringVar(value=DEFAULT_ENGINE)
+        self.extra_run_vars = {name: tk.BooleanVar(value=False) for name in EXTRA_RUNS}
+        self.gen_branching_var = tk.StringVar(value="3")
+        self.gen_depth_var = tk.StringVar(value="6")
+        self.gen_seed_var = tk.StringVar(value="0")
+        self.gen_values_var = tk.StringVar(value="uniform")
+        self.gen_ordering_var = tk.StringVar(value="random")
     
     def setup_main_structure(self):
         self.master.configure(background=self.bg_color)
@@ -168,12 +319,14 @@ class MinimaxComparisonApp:
         self.node_tab = ttk.Frame(self.notebook)
         self.viz_tab = ttk.Frame(self.notebook)
         self.comparison_tab = ttk.Frame(self.notebook)
+        self.trace_tab = ttk.Frame(self.notebook)
         
         # Add tabs to notebook
         self.notebook.add(self.tree_tab, text="1. Define Tree")
         self.notebook.add(self.node_tab, text="2. Add Nodes")
         self.notebook.add(self.viz_tab, text="3. Visualize Tree")
         self.notebook.add(self.comparison_tab, text="4. Compare Algorithms")
+        self.notebook.add(self.trace_tab, text="5. Search Trace")
         
     def setup_status_bar(self):
         status_frame = ttk.Frame(self.master, style="TFrame")
@@ -191,7 +344,9 @@ class MinimaxComparisonApp:
         ttk.Label(tree_frame, text="Tree Definition", style="HeaderBG.TLabel").pack(fill=tk.X, pady=(0, 10))
         ttk.Label(tree_frame, text="Define the game tree by specifying nodes and their relationships:").pack(anchor="w", pady=(0, 5))
         ttk.Label(tree_frame, text="• Non-terminal nodes: NodeName: children=[Child1, Child2, ...]").pack(anchor="w")
-        ttk.Label(tree_frame, text="• Terminal nodes: NodeName: value=X").pack(anchor="w", pady=(0, 5))
+        ttk.Label(tree_frame, text="• Terminal nodes: NodeName: value=X").pack(anchor="w")
+        ttk.Label(tree_frame, text="• Chance nodes: NodeName: chance=[Child1:0.5, Child2:1/2] (no probabilities = equally likely)").pack(anchor="w")
+        ttk.Label(tree_frame, text="• A node may appear under several parents (shared subtree), but not in a cycle").pack(anchor="w", pady=(0, 5))
         ttk.Label(tree_frame, text="Example: A: children=[B, C]").pack(anchor="w", pady=(0, 10))
         
         # Text area for tree definition
@@ -217,6 +372,15 @@ class MinimaxComparisonApp:
         
         sample_button = ttk.Button(button_frame, text="Load Sample", command=lambda: self.tree_definition_text.insert("1.0", self._get_sample_tree_def()))
         sample_button.pack(side=tk.LEFT, padx=5)
+
+        load_button = ttk.Button(button_frame, text="Load From File...", command=self.load_tree_file)
+        load_button.pack(side=tk.LEFT, padx=5)
+
+        open_binary_button = ttk.Button(button_frame, text="Open Binary...", command=self.open_binary_tree)
+        open_binary_button.pack(side=tk.LEFT, padx=5)
+
+        save_binary_button = ttk.Button(button_frame, text="Save Binary...", command=self.save_binary_tree)
+        save_binary_button.pack(side=tk.LEFT, padx=5)
         
         # Additional configuration for running the algorithms
         config_frame = ttk.Frame(tree_frame, style="Output.TFrame", padding=10)
@@ -236,6 +400,22 @@ class MinimaxComparisonApp:
         ttk.Label(depth_frame, text="Max Depth (optional):").pack(side=tk.LEFT, padx=(0, 5))
         ttk.Entry(depth_frame, textvariable=self.depth_var, width=5).pack(side=tk.LEFT)
         ttk.Label(depth_frame, text="(Leave empty for unlimited depth)").pack(side=tk.LEFT, padx=5)
+        ttk.Label(depth_frame, text="Time Limit (s):").pack(side=tk.LEFT, padx=(15, 5))
+        ttk.Entry(depth_frame, textvariable=self.time_limit_var, width=6).pack(side=tk.LEFT)
+        ttk.Label(depth_frame, text="(iterative deepening; internal nodes may set eval=X)").pack(side=tk.LEFT, padx=5)
+
+        # Seeded synthetic trees for measuring at scale
+        generator_frame = ttk.Frame(config_frame)
+        generator_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(generator_frame, text="Synthetic Tree:").pack(side=tk.LEFT, padx=(0, 5))
+        for label, var in (("Branching", self.gen_branching_var), ("Depth", self.gen_depth_var), ("Seed", self.gen_seed_var)):
+            ttk.Label(generator_frame, text=f"{label}:").pack(side=tk.LEFT, padx=(5, 2))
+            ttk.Entry(generator_frame, textvariable=var, width=5).pack(side=tk.LEFT)
+        ttk.Label(generator_frame, text="Values:").pack(side=tk.LEFT, padx=(5, 2))
+        ttk.Combobox(generator_frame, textvariable=self.gen_values_var, values=list(VALUE_DISTRIBUTIONS), state="readonly", width=9).pack(side=tk.LEFT)
+        ttk.Label(generator_frame, text="Ordering:").pack(side=tk.LEFT, padx=(5, 2))
+        ttk.Combobox(generator_frame, textvariable=self.gen_ordering_var, values=list(ORDERINGS), state="readonly", width=11).pack(side=tk.LEFT)
+        ttk.Button(generator_frame, text="Generate", command=self.generate_synthetic_tree).pack(side=tk.LEFT, padx=10)
         
     def setup_comparison_tab(self):
         comparison_frame = ttk.Frame(self.comparison_tab, padding=15)
@@ -246,8 +426,19 @@ class MinimaxComparisonApp:
         # Run button
         button_frame = ttk.Frame(comparison_frame)
         button_frame.pack(fill=tk.X, pady=(0, 15))
+        engine_frame = ttk.Frame(button_frame)
+        engine_frame.pack(pady=(0, 10))
+        ttk.Label(engine_frame, text="Search Engine:").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Combobox(engine_frame, textvariable=self.engine_var, values=list(SEARCH_ENGINES), state="readonly", width=28).pack(side=tk.LEFT)
+        extra_runs_frame = ttk.Frame(button_frame)
+        extra_runs_frame.pack(pady=(0, 10))
+        ttk.Label(extra_runs_frame, text="Also Run:").pack(side=tk.LEFT, padx=(0, 5))
+        for name, var in self.extra_run_vars.items():
+            ttk.Checkbutton(extra_runs_frame, text=name, variable=var).pack(side=tk.LEFT, padx=5)
         self.compare_button = ttk.Button(button_frame, text="Run Comparison", style="Run.TButton", command=self.run_comparison_threaded)
         self.compare_button.pack()
+        self.export_stats_button = ttk.Button(button_frame, text="Export Stats (JSON)...", command=self.export_comparison_stats, state=tk.DISABLED)
+        self.export_stats_button.pack(pady=(5, 0))
         
         # Results display
         output_frame = ttk.Frame(comparison_frame)
@@ -264,7 +455,7 @@ class MinimaxComparisonApp:
         ttk.Label(minimax_frame, text="Optimal Path:").pack(anchor='w', pady=(10, 0))
         self.minimax_path_label = ttk.Label(minimax_frame, text="-", style="Path.TLabel", wraplength=350, justify=tk.LEFT)
         self.minimax_path_label.pack(anchor='w', pady=2, fill=tk.X)
-        ttk.Label(minimax_frame, text="Nodes Evaluated:").pack(anchor='w', pady=(10, 0))
+        ttk.Label(minimax_frame, text="Nodes Evaluated (expanded / leaves):").pack(anchor='w', pady=(10, 0))
         self.minimax_nodes_label = ttk.Label(minimax_frame, text="-", style="Value.TLabel")
         self.minimax_nodes_label.pack(anchor='w', pady=2)
         
@@ -277,10 +468,25 @@ class MinimaxComparisonApp:
         ttk.Label(ab_frame, text="Optimal Path:").pack(anchor='w', pady=(10, 0))
         self.ab_path_label = ttk.Label(ab_frame, text="-", style="Path.TLabel", wraplength=350, justify=tk.LEFT)
         self.ab_path_label.pack(anchor='w', pady=2, fill=tk.X)
-        ttk.Label(ab_frame, text="Nodes Pruned:").pack(anchor='w', pady=(10, 0))
+        ttk.Label(ab_frame, text="Nodes Evaluated (expanded / leaves):").pack(anchor='w', pady=(10, 0))
+        self.ab_nodes_label = ttk.Label(ab_frame, text="-", style="Value.TLabel")
+        self.ab_nodes_label.pack(anchor='w', pady=2)
+        ttk.Label(ab_frame, text="Nodes Pruned (cutoffs / eliminated nodes / eliminated leaves):").pack(anchor='w', pady=(10, 0))
         self.ab_pruned_label = ttk.Label(ab_frame, text="-", style="Value.TLabel")
         self.ab_pruned_label.pack(anchor='w', pady=2)
         
+        # Every engine's node counts on the same tree
+        engines_frame = ttk.Frame(comparison_frame, style="Output.TFrame", padding=15)
+        engines_frame.pack(fill=tk.X, pady=(15, 0))
+        ttk.Label(engines_frame, text="All Engines", style="Header.TLabel").pack(anchor='w', pady=(0, 10))
+        self.engine_table = ttk.Treeview(engines_frame, columns=[c[0] for c in ENGINE_TABLE_COLUMNS], height=8)
+        self.engine_table.heading("#0", text="Engine")
+        self.engine_table.column("#0", width=260)
+        for column, heading, width in ENGINE_TABLE_COLUMNS:
+            self.engine_table.heading(column, text=heading)
+            self.engine_table.column(column, width=width, anchor=tk.E)
+        self.engine_table.pack(fill=tk.X)
+
         # Add a section for displaying pruned nodes
         pruned_frame = ttk.Frame(comparison_frame, style="Output.TFrame", padding=15)
         pruned_frame.pack(fill=tk.X, pady=(15, 0))
@@ -295,6 +501,42 @@ class MinimaxComparisonApp:
         self.pruned_nodes_text['yscrollcommand'] = pruned_scrollbar.set
         self.pruned_nodes_text.config(state=tk.DISABLED)
         
+    def setup_trace_tab(self):
+        trace_frame = ttk.Frame(self.trace_tab, padding=15)
+        trace_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(trace_frame, text="Search Trace Replay", style="HeaderBG.TLabel").pack(pady=(0, 15))
+        
+        # Record a search of the current tree, or open an earlier trace
+        button_frame = ttk.Frame(trace_frame)
+        button_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Button(button_frame, text="Record Minimax Trace...", command=lambda: self.record_trace("minimax")).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(button_frame, text="Record Alpha-Beta Trace...", command=lambda: self.record_trace("alpha-beta")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Open Trace...", command=self.open_trace).pack(side=tk.LEFT, padx=5)
+        self.trace_info_label = ttk.Label(trace_frame, text="(No trace loaded)")
+        self.trace_info_label.pack(anchor="w", pady=(0, 5))
+        
+        # Step and scrub controls
+        control_frame = ttk.Frame(trace_frame)
+        control_frame.pack(fill=tk.X, pady=(0, 10))
+        for text, command in (("|<", lambda: self.show_trace_event(0)), ("<", lambda: self.step_trace(-1)),
+                              (">", lambda: self.step_trace(1)), (">|", lambda: self.show_trace_event(-1))):
+            ttk.Button(control_frame, text=text, width=4, command=command).pack(side=tk.LEFT, padx=(0, 5))
+        self.trace_position_var = tk.DoubleVar(value=0)
+        self.trace_scale = ttk.Scale(control_frame, from_=0, to=0, orient=tk.HORIZONTAL, variable=self.trace_position_var,
+                                     command=lambda value: self.show_trace_event(int(float(value))))
+        self.trace_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        
+        # The current event, the search stack at that point and the events around it
+        trace_text_frame = ttk.Frame(trace_frame, style="Output.TFrame", padding=10)
+        trace_text_frame.pack(fill=tk.BOTH, expand=True)
+        self.trace_text = tk.Text(trace_text_frame, font=self.mono_font, bg=self.text_bg, relief=tk.FLAT, wrap=tk.NONE)
+        self.trace_text.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
+        trace_scrollbar = ttk.Scrollbar(trace_text_frame, orient=tk.VERTICAL, command=self.trace_text.yview)
+        trace_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.trace_text['yscrollcommand'] = trace_scrollbar.set
+        self.trace_text.config(state=tk.DISABLED)
+        
     def setup_node_addition_tab(self):
         node_frame = ttk.Frame(self.node_tab, padding=15)
         node_frame.pack(fill=tk.BOTH, expand=True)
@@ -359,24 +601,14 @@ class MinimaxComparisonApp:
         
         ttk.Label(viz_frame, text="Tree Visualization", style="HeaderBG.TLabel").pack(pady=(0, 10))
         
-        viz_text_frame = ttk.Frame(viz_frame, style="Output.TFrame", padding=10)
-        viz_text_frame.pack(fill=tk.BOTH, expand=True)
-        
-        text_frame = ttk.Frame(viz_text_frame)
-        text_frame.pack(fill=tk.BOTH, expand=True)
+        viz_tree_frame = ttk.Frame(viz_frame, style="Output.TFrame", padding=10)
+        viz_tree_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.viz_text = tk.Text(text_frame, font=self.mono_font, bg=self.text_bg, relief=tk.FLAT, wrap=tk.NONE) # No wrap for structure
-        self.viz_text.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
-        
-        viz_scrollbar_y = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=self.viz_text.yview)
-        viz_scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
-        self.viz_text['yscrollcommand'] = viz_scrollbar_y.set
-        
-        viz_scrollbar_x = ttk.Scrollbar(viz_text_frame, orient=tk.HORIZONTAL, command=self.viz_text.xview)
-        viz_scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
-        self.viz_text['xscrollcommand'] = viz_scrollbar_x.set
-        
-        self.viz_text.config(state=tk.DISABLED) # Read-only
+        self.viz_info_label = ttk.Label(viz_tree_frame, text="(Tree is empty)")
+        self.viz_info_label.pack(anchor="w", pady=(0, 5))
+        # Rows are created only for expanded nodes; after a comparison the PV and pruned nodes are highlighted
+        self.viz_tree = LazyTreeView(viz_tree_frame)
+        self.viz_tree.pack(fill=tk.BOTH, expand=True)
         
         refresh_button = ttk.Button(viz_frame, text="Refresh Visualization", command=self.update_tree_visualization)
         refresh_button.pack(pady=10)
@@ -407,81 +639,154 @@ G: value=2"""
             self.status_var.set(f"Parse error: {e}")
             
     def parse_tree_definition_logic(self, definition_str):
-        tree = {}
-        lines = definition_str.strip().split('\n')
-        node_pattern = re.compile(r"^\s*([a-zA-Z0-9_]+)\s*:\s*(.*)$")
-        children_pattern = re.compile(r"children=\[(.*?)\]")
-        value_pattern = re.compile(r"value=(-?\d+(\.\d+)?)") # Allow float values too
-        
-        defined_nodes = set()
-        referenced_children = set()
-        node_parents = {} # Track parent for validation {child: parent}
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line or line.startswith('#'): continue
-            
-            match = node_pattern.match(line)
-            if not match: raise ValueError(f"Invalid format on line {i+1}: '{line}'. Expected 'NODE: definition'.")
-            
-            node_name, definition = match.groups()
-            node_name = node_name.strip()
-            definition = definition.strip()
-            
-            if node_name in tree: raise ValueError(f"Duplicate node '{node_name}' (line {i+1}).")
-            defined_nodes.add(node_name)
-            tree[node_name] = {'value': None, 'children': [], 'is_terminal': False}
-            
-            child_match = children_pattern.search(definition)
-            value_match = value_pattern.search(definition)
-            
-            if child_match:
-                children_str = child_match.group(1).strip()
-                if value_match: raise ValueError(f"Node '{node_name}' cannot have both children and value (line {i+1}).")
-                if children_str:
-                    children = [c.strip() for c in children_str.split(',') if c.strip()]
-                    if not children: raise ValueError(f"Invalid children format for '{node_name}' (line {i+1}).")
-                    tree[node_name]['children'] = children
-                    referenced_children.update(children)
-                    for child in children: # Track parentage
-                        if child in node_parents: raise ValueError(f"Node '{child}' has multiple parents (defined under '{node_name}' and '{node_parents[child]}')")
-                        node_parents[child] = node_name
-                else: # children=[]
-                    # Mark as potentially terminal, will be error if no value later
-                    tree[node_name]['is_terminal'] = True # Tentative
-            elif value_match:
-                try:
-                    # Try parsing as float first, then int if possible
-                    val = float(value_match.group(1))
-                    if val == int(val): val = int(val)
-                    tree[node_name]['value'] = val
-                    tree[node_name]['is_terminal'] = True
-                except ValueError: raise ValueError(f"Invalid value for '{node_name}' (line {i+1}).")
+        return parse_tree_definition(definition_str)
+
+    def load_tree_file(self):
+        """Parses a definition file straight from disk, without going through the text widget."""
+        path = filedialog.askopenfilename(parent=self.master, title="Open Tree Definition",
+                                          filetypes=[("Tree definitions", "*.txt *.tree"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.status_var.set(f"Parsing {os.path.basename(path)}...")
+            self.master.update_idletasks()
+            self.tree_data = parse_tree_file(path)
+            self.update_node_list_display()
+            self.update_tree_visualization()
+            self.status_var.set(f"Loaded {os.path.basename(path)} with {len(self.tree_data)} nodes.")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Parse Error", f"Error loading tree: {e}", parent=self.master)
+            self.status_var.set(f"Parse error: {e}")
+
+    def generate_synthetic_tree(self):
+        """Replaces the tree with a seeded synthetic one and points the root entry at it."""
+        try:
+            try:
+                branching = int(self.gen_branching_var.get())
+                depth = int(self.gen_depth_var.get())
+                seed = int(self.gen_seed_var.get())
+            except ValueError:
+                raise ValueError("Branching, depth and seed must be integers.")
+            if branching < 1 or depth < 0:
+                raise ValueError("Branching must be at least 1 and depth non-negative.")
+            size = uniform_tree_size(branching, depth)
+            if size > MAX_GENERATED_NODES:
+                raise ValueError(f"That tree would have {size:,} nodes; the GUI is limited to {MAX_GENERATED_NODES:,}. "
+                                 "Use tree_bench.py for larger trees.")
+
+            self.status_var.set(f"Generating {size:,} nodes...")
+            self.master.update_idletasks()
+            tree = generate_tree(branching, depth, seed=seed, values=self.gen_values_var.get(), ordering=self.gen_ordering_var.get())
+            self.tree_data = CompactTreeData(tree)
+            self.set_compact_tree(tree)
+            self.root_node_entry.delete(0, tk.END)
+            self.root_node_entry.insert(0, tree.names[0])
+            if size <= GENERATED_TEXT_LIMIT:
+                self.update_text_definition()
             else:
-                raise ValueError(f"Node '{node_name}' must define 'children' or 'value' (line {i+1}).")
-        
-        # Validation
-        undefined_children = referenced_children - defined_nodes
-        if undefined_children: raise ValueError(f"Undefined children: {', '.join(sorted(list(undefined_children)))}")
-        
-        for name, node in tree.items():
-            if node['is_terminal'] and node['children']: raise ValueError(f"Terminal node '{name}' cannot have children.")
-            # Allow non-terminals with empty children list if they are added interactively later?
-            # Let's require non-terminals parsed from text to have children defined here.
-            if not node['is_terminal'] and not node['children']:
-                 # Check if it was children=
-             if not node['is_terminal'] and not node['children']:
-                 # Check if it was children=[] and no value
-                for line in lines:
-                     if line.strip().startswith(f"{name}:"):
-                         if "children=[]" in line and not value_pattern.search(line):
-                             raise ValueError(f"Node '{name}' has empty children '[]' but no 'value'.")
-                         break
-                 # Otherwise, maybe okay if added interactively? Let's assume it's an error for now from text parse.
-                if name in defined_nodes: # Ensure it was defined in the text
-                      raise ValueError(f"Non-terminal node '{name}' must have children defined in text mode.")
-
-        return tree
+                self.tree_definition_text.delete("1.0", tk.END)
+                self.tree_definition_text.insert("1.0", f"# Generated tree: branching={branching}, depth={depth}, seed={seed}, "
+                                                        f"{size:,} nodes (definition not shown)")
+            self.update_node_list_display()
+            self.update_tree_visualization()
+            self.status_var.set(f"Generated {self.gen_ordering_var.get()} tree with {size:,} nodes (b={branching}, d={depth}, seed={seed}).")
+        except ValueError as e:
+            messagebox.showerror("Generator Error", str(e), parent=self.master)
+            self.status_var.set(f"Error: {e}")
+
+    def open_binary_tree(self):
+        """Opens a binary tree file without expanding it.
+
+        The memory-mapped CompactTree stays the working tree: the compact and
+        parallel engines search it directly, and the tree view and the engines
+        that walk tree_data read it through a CompactTreeData, which builds
+        node dicts as they are looked up. It is only expanded into a dict
+        when a node is added or the dict-only engines run.
+        """
+        path = filedialog.askopenfilename(parent=self.master, title="Open Binary Tree",
+                                          filetypes=[("Binary trees", "*.gtree"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            tree = load_tree_binary(path)
+            self.tree_data = CompactTreeData(tree)
+            self.set_compact_tree(tree)
+            self.root_node_entry.delete(0, tk.END)
+            self.root_node_entry.insert(0, tree.names[0])
+            self.tree_definition_text.delete("1.0", tk.END)
+            if len(tree) <= GENERATED_TEXT_LIMIT:
+                self.update_text_definition()
+            self.update_node_list_display()
+            self.update_tree_visualization()
+            self.status_var.set(f"Opened {os.path.basename(path)} with {len(self.tree_data)} nodes.")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Open Error", f"Error opening binary tree: {e}", parent=self.master)
+            self.status_var.set(f"Open error: {e}")
+
+    def save_binary_tree(self):
+        if not self.tree_data:
+            messagebox.showerror("Error", "Tree is empty. Please define or parse a tree first.", parent=self.master)
+            return
+        path = filedialog.asksaveasfilename(parent=self.master, title="Save Binary Tree", defaultextension=".gtree",
+                                            filetypes=[("Binary trees", "*.gtree"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            save_tree_binary(self.get_compact_tree(), path)
+            self.status_var.set(f"Saved {len(self.tree_data)} nodes to {os.path.basename(path)}.")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Save Error", f"Could not save tree: {e}", parent=self.master)
+
+    def is_current_tree(self, source, size):
+        """Whether tree_data is still the dict `source` with `size` nodes.
+
+        tree_data is replaced by a new dict on every parse or load and only
+        grows in place when nodes are added. The dict itself is compared, not
+        its id(), since a replaced dict's id can be reused by the next one.
+        """
+        return source is self.tree_data and size == len(self.tree_data)
+
+    def set_compact_tree(self, tree):
+        """Remembers the compact form of the current tree_data."""
+        self.compact_tree = tree
+        self.compact_tree_source = self.tree_data
+        self.compact_tree_size = len(self.tree_data)
+
+    def materialize_tree_data(self):
+        """tree_data as a dict, expanding an opened or generated CompactTree the first time an edit or a dict-only engine needs it."""
+        if not isinstance(self.tree_data, dict):
+            compact = self.tree_data.compact
+            self.status_var.set(f"Expanding {len(compact)} nodes...")
+            self.master.update_idletasks()
+            self.tree_data = compact.to_tree_data()
+            self.set_compact_tree(compact)  # Still the same tree
+        return self.tree_data
+
+    def get_compact_tree(self):
+        """The CompactTree for tree_data, compiled only when tree_data has changed since the last call."""
+        if self.compact_tree is None or not self.is_current_tree(self.compact_tree_source, self.compact_tree_size):
+            self.set_compact_tree(CompactTree.from_tree_data(self.tree_data))
+        return self.compact_tree
+
+    def get_subtree_index(self, tree):
+        """The SubtreeIndex for tree_data or its CompactTree, rebuilt only when tree_data has changed.
+
+        A CompactTreeData gets the CompactTree's index, looked up by name.
+        """
+        if isinstance(tree, CompactTreeData):
+            index = self.get_subtree_index(tree.compact)
+            return SubtreeIndex(index.sizes, index.leaves, tree.node_id)
+        compact = isinstance(tree, CompactTree)
+        cached = self.subtree_indexes.get(compact)
+        if cached is None or not self.is_current_tree(cached[0], cached[1]):
+            cached = self.subtree_indexes[compact] = (self.tree_data, len(self.tree_data), SubtreeIndex.for_tree(tree))
+        return cached[2]
+
+    def get_incremental_search(self):
+        """The IncrementalMinimax for tree_data, started afresh whenever tree_data is replaced."""
+        if self.incremental is None or self.incremental.tree_data is not self.tree_data:
+            self.incremental = IncrementalMinimax(self.tree_data)
+        return self.incremental
 
     def update_node_list_display(self):
         """Updates the text area in the 'Add Nodes' tab."""
@@ -490,21 +795,29 @@ G: value=2"""
         if not self.tree_data:
             self.node_list_text.insert("1.0", "(Tree is empty)")
         else:
-            for name, node in sorted(self.tree_data.items()):
+            lines = []
+            # A CompactTreeData is listed in id order rather than decoding every name to sort them
+            if isinstance(self.tree_data, dict):
+                names = heapq.nsmallest(NODE_LIST_LIMIT, self.tree_data)
+            else:
+                names = itertools.islice(self.tree_data, NODE_LIST_LIMIT)
+            for name in names:
+                node = self.tree_data[name]
                 if node['is_terminal']:
-                    self.node_list_text.insert(tk.END, f"- {name} (Terminal, Value: {node['value']})\n")
+                    lines.append(f"- {name} (Terminal, Value: {node['value']})")
                 else:
                     children_str = ", ".join(node['children']) if node['children'] else "(No children added yet)"
-                    self.node_list_text.insert(tk.END, f"- {name} (Children: {children_str})\n")
+                    lines.append(f"- {name} (Children: {children_str})")
+            if len(self.tree_data) > NODE_LIST_LIMIT:
+                lines.append(f"... and {len(self.tree_data) - NODE_LIST_LIMIT} more nodes")
+            self.node_list_text.insert(tk.END, "\n".join(lines) + "\n")
         self.node_list_text.config(state=tk.DISABLED)
 
-    def update_tree_visualization(self):
-        """Updates the text area in the 'Visualize Tree' tab."""
-        self.viz_text.config(state=tk.NORMAL)
-        self.viz_text.delete("1.0", tk.END)
+    def update_tree_visualization(self, pruned=(), pv=()):
+        """Updates the tree view in the 'Visualize Tree' tab, highlighting `pruned` nodes and the `pv` path."""
         if not self.tree_data:
-            self.viz_text.insert("1.0", "(Tree is empty)")
-            self.viz_text.config(state=tk.DISABLED)
+            self.viz_info_label.config(text="(Tree is empty)")
+            self.viz_tree.clear()
             return
 
         root_node = self.root_node_entry.get().strip()
@@ -517,48 +830,34 @@ G: value=2"""
              potential_roots = sorted(list(all_nodes - children_nodes))
              if potential_roots:
                  root_node = potential_roots[0] # Pick the first one
-                 self.viz_text.insert(tk.END, f"(No valid root specified, visualizing from potential root: {root_node})\n\n")
+                 self.viz_info_label.config(text=f"(No valid root specified, visualizing from potential root: {root_node})")
              else:
-                  self.viz_text.insert(tk.END, "(Cannot determine root node for visualization)")
-                  self.viz_text.config(state=tk.DISABLED)
+                  self.viz_info_label.config(text="(Cannot determine root node for visualization)")
+                  self.viz_tree.clear()
                   return
         else:
-             self.viz_text.insert(tk.END, f"(Visualizing from root: {root_node})\n\n")
-
-
-        def build_viz_string(node_name, prefix="", is_last=True):
-            node = self.tree_data.get(node_name)
-            if not node: return ""
-
-            connector = "└── " if is_last else "├── "
-            viz_str = prefix + connector + node_name
-            if node['is_terminal']:
-                viz_str += f" ({node['value']})\n"
-            else:
-                viz_str += "\n"
+             info = f"(Visualizing from root: {root_node}, {len(self.tree_data)} nodes)"
+             if pv:
+                 info += " - principal variation highlighted, pruned nodes in red"
+             self.viz_info_label.config(text=info)
 
-            new_prefix = prefix + ("    " if is_last else "│   ")
-            children = node['children']
-            for i, child_name in enumerate(children):
-                viz_str += build_viz_string(child_name, new_prefix, i == len(children) - 1)
-            return viz_str
+        self.viz_tree.show(self.tree_data, root_node, pruned, pv, self.get_subtree_index(self.tree_data) if pruned else None)
 
-        viz_output = build_viz_string(root_node)
-        self.viz_text.insert("1.0", viz_output) # Insert at the beginning
-        self.viz_text.config(state=tk.DISABLED)
+    def definition_line(self, name):
+        node = self.tree_data[name]
+        if node['is_terminal']:
+            return f"{name}: value={node['value']}"
+        if 'chance' in node:
+            line = f"{name}: chance=[{', '.join(f'{child}:{p:.12g}' for child, p in zip(node['children'], node['chance']))}]"
+        else:
+            line = f"{name}: children=[{', '.join(node['children'])}]"
+        return line + (f" eval={node['eval']}" if 'eval' in node else "")
 
     def update_text_definition(self):
         """Updates the text definition based on the internal tree_data."""
-        lines = []
-        # Process non-terminals first to improve readability
-        for name, node in sorted(self.tree_data.items()):
-             if not node['is_terminal']:
-                 children_str = ", ".join(node['children'])
-                 lines.append(f"{name}: children=[{children_str}]")
-        # Process terminals next
-        for name, node in sorted(self.tree_data.items()):
-            if node['is_terminal']:
-                 lines.append(f"{name}: value={node['value']}")
+        # Non-terminals first to improve readability, then terminals
+        names = sorted(self.tree_data, key=lambda name: (self.tree_data[name]['is_terminal'], name))
+        lines = [self.definition_line(name) for name in names]
 
         new_def = "\n".join(lines)
         current_def = self.tree_definition_text.get("1.0", tk.END).strip()
@@ -568,6 +867,24 @@ G: value=2"""
             self.tree_definition_text.delete("1.0", tk.END)
             self.tree_definition_text.insert("1.0", new_def)
 
+    def update_definition_lines(self, node_name, parent_name=None):
+        """Appends the line for a newly added node and rewrites its parent's line, leaving the rest of the text alone.
+
+        Falls back to update_text_definition when the parent's line is not in the
+        text (it was edited by hand, or is a large generated tree that is not written out).
+        """
+        text = self.tree_definition_text
+        if parent_name:
+            index = text.search(f"^{re.escape(parent_name)}:", "1.0", tk.END, regexp=True)
+            if not index:
+                if len(self.tree_data) <= GENERATED_TEXT_LIMIT:
+                    self.update_text_definition()
+                return
+            text.delete(index, f"{index} lineend")
+            text.insert(index, self.definition_line(parent_name))
+        separator = "" if text.compare("end-1c", "==", "1.0") else "\n"
+        text.insert("end-1c", separator + self.definition_line(node_name))
+
     def add_node_base(self, node_name, parent_name, is_terminal, value=None):
         """Base logic for adding a node."""
         if not node_name or not node_name.isalnum(): # Basic validation
@@ -581,12 +898,15 @@ G: value=2"""
             parent = self.tree_data[parent_name]
             if parent['is_terminal']:
                 raise ValueError(f"Cannot add child to terminal node '{parent_name}'.")
+            if 'chance' in parent:
+                raise ValueError(f"'{parent_name}' is a chance node; add its outcomes with their probabilities in the tree definition.")
 
             # Check if child already exists under this parent (shouldn't happen with name check, but good practice)
             if node_name in parent['children']:
                  raise ValueError(f"Node '{node_name}' is already a child of '{parent_name}'.")
 
         # Create the node
+        self.materialize_tree_data()
         self.tree_data[node_name] = {
             'value': value,
             'children': [],
@@ -600,10 +920,16 @@ G: value=2"""
              self.tree_data[parent_name]['is_terminal'] = False
              self.tree_data[parent_name]['value'] = None # Non-terminals don't have a direct value
 
-        # Update displays
+        if self.incremental is not None and self.incremental.tree_data is self.tree_data:
+            self.incremental.node_added(node_name, parent_name or None)
+
+        # Update displays; the tree view and text only change around the new node
         self.update_node_list_display()
-        self.update_tree_visualization()
-        self.update_text_definition()
+        if parent_name and self.viz_tree.is_showing(self.tree_data):
+            self.viz_tree.node_added(parent_name, node_name)
+        else:
+            self.update_tree_visualization()
+        self.update_definition_lines(node_name, parent_name)
 
     def add_non_terminal_node(self):
         node_name = self.new_node_name.get().strip()
@@ -653,6 +979,7 @@ G: value=2"""
             self.tree_definition_text.delete("1.0", tk.END)
             self.root_node_entry.delete(0, tk.END)
             self.depth_var.set("")
+            self.time_limit_var.set("")
             # Clear Add Node fields
             self.new_node_name.delete(0, tk.END)
             self.new_node_parent.delete(0, tk.END)
@@ -665,15 +992,35 @@ G: value=2"""
             self.minimax_nodes_label.config(text="-")
             self.ab_value_label.config(text="-")
             self.ab_path_label.config(text="-")
+            self.ab_nodes_label.config(text="-")
             self.ab_pruned_label.config(text="-")
             self.pruned_nodes_text.config(state=tk.NORMAL)
             self.pruned_nodes_text.delete("1.0", tk.END)
             self.pruned_nodes_text.config(state=tk.DISABLED)
+            self.engine_table.delete(*self.engine_table.get_children())
             # Clear displays
             self.update_node_list_display()
             self.update_tree_visualization()
             self.status_var.set("Tree cleared. Ready for new definition.")
 
+    def get_search_root(self):
+        """The root node and depth limit entered in the comparison tab; raises ValueError if they are invalid."""
+        root_node = self.root_node_entry.get().strip()
+        depth_str = self.depth_var.get().strip()
+        depth_limit = None
+
+        if not root_node: raise ValueError("Root Node Name cannot be empty.")
+        if root_node not in self.tree_data: raise ValueError(f"Root node '{root_node}' not found.")
+        if self.tree_data[root_node]['is_terminal']: raise ValueError(f"Root node '{root_node}' cannot be a terminal node.")
+
+        if depth_str:
+            try:
+                depth_limit = int(depth_str)
+                if depth_limit < 0: raise ValueError("Depth cannot be negative.")
+            except ValueError:
+                raise ValueError("Max Depth must be a non-negative integer if specified.")
+        return root_node, depth_limit
+
     def run_comparison(self):
         """Parses input, runs algorithms, and updates UI."""
         self.status_var.set("Validating tree...")
@@ -686,88 +1033,203 @@ G: value=2"""
              return # Cannot run comparison
 
         try:
-            root_node = self.root_node_entry.get().strip()
-            depth_str = self.depth_var.get().strip()
-            depth_limit = None
-
-            if not root_node: raise ValueError("Root Node Name cannot be empty.")
-            if root_node not in self.tree_data: raise ValueError(f"Root node '{root_node}' not found.")
-            if self.tree_data[root_node]['is_terminal']: raise ValueError(f"Root node '{root_node}' cannot be a terminal node.")
-
-            if depth_str:
+            root_node, depth_limit = self.get_search_root()
+            time_str = self.time_limit_var.get().strip()
+            time_limit = None
+            if time_str:
                 try:
-                    depth_limit = int(depth_str)
-                    if depth_limit < 0: raise ValueError("Depth cannot be negative.")
+                    time_limit = float(time_str)
                 except ValueError:
-                    raise ValueError("Max Depth must be a non-negative integer if specified.")
+                    raise ValueError("Time Limit must be a number of seconds if specified.")
+                if time_limit <= 0:
+                    raise ValueError("Time Limit must be positive.")
 
             self.status_var.set(f"Running algorithms from root '{root_node}' (Depth limit: {depth_limit if depth_limit is not None else 'None'})...")
             self.master.update_idletasks()
 
-            # Track node evaluations for minimax
-            mm_evaluated = set()
-            def minimax_tracker(node_name, tree, is_maximizing, depth=None):
-                mm_evaluated.add(node_name)
-                return minimax_with_path(node_name, tree, is_maximizing, depth)
+            prepare_tree, run_minimax, run_alpha_beta = SEARCH_ENGINES.get(self.engine_var.get(), SEARCH_ENGINES[DEFAULT_ENGINE])
+            if prepare_tree == CompactTree.from_tree_data:
+                search_tree = self.get_compact_tree()
+            elif prepare_tree is dict:
+                search_tree = self.materialize_tree_data()
+            else:
+                search_tree = prepare_tree(self.tree_data) if prepare_tree else self.tree_data
+
+            # Run Minimax. Once the incremental cache holds this search the result is read from it, re-searching
+            # only the ancestors of nodes added since; otherwise the engine searches the whole tree
+            incremental = self.get_incremental_search() if isinstance(self.tree_data, dict) else None
+            mm_cached = incremental is not None and incremental.has_searched(root_node, True, depth_limit)
+            mm_stats = SearchStats("incremental minimax" if mm_cached else "minimax")
+            mm_start_time = time.perf_counter_ns()
+            if mm_cached:
+                mm_value, mm_path = incremental.evaluate(root_node, True, depth=depth_limit, stats=mm_stats)
+            else:
+                mm_value, mm_path = run_minimax(root_node, search_tree, True, depth=depth_limit, stats=mm_stats)
+            mm_stats.elapsed_ns = time.perf_counter_ns() - mm_start_time
 
-            # Run Minimax
-            mm_start_time = time.time()
-            mm_value, mm_path = minimax_tracker(root_node, self.tree_data, True, depth=depth_limit)
-            mm_time = time.time() - mm_start_time
-            mm_nodes_evaluated = len(mm_evaluated)
+            # Fill the incremental cache on the first comparison of a tree so the next one can read Minimax from it
+            inc_value = inc_path = inc_stats = None
+            if incremental is not None and not mm_cached:
+                inc_stats = SearchStats("incremental minimax")
+                start_time = time.perf_counter_ns()
+                inc_value, inc_path = incremental.evaluate(root_node, True, depth=depth_limit, stats=inc_stats)
+                inc_stats.elapsed_ns = time.perf_counter_ns() - start_time
 
             # Run Alpha-Beta
-            ab_start_time = time.time()
-            ab_value, ab_path, pruned_info = alpha_beta_with_path(root_node, self.tree_data, -math.inf, math.inf, True, depth=depth_limit)
-            ab_time = time.time() - ab_start_time
+            ab_stats = SearchStats("alpha-beta", self.get_subtree_index(search_tree))
+            ab_start_time = time.perf_counter_ns()
+            ab_value, ab_path, pruned_info = run_alpha_beta(root_node, search_tree, -math.inf, math.inf, True, depth=depth_limit, stats=ab_stats)
+            ab_stats.elapsed_ns = time.perf_counter_ns() - ab_start_time
             ab_pruned_count = pruned_info["count"]
             ab_pruned_nodes = pruned_info["nodes"]
 
+            # The optional runs ticked in the comparison tab search the dict tree, expanded only for them.
+            # Cutoffs are sized from the subtree index rather than by walking the pruned subtrees
+            extra_runs = [name for name, var in self.extra_run_vars.items() if var.get()]
+            tree_data = self.materialize_tree_data() if extra_runs else self.tree_data
+            has_chance = isinstance(tree_data, dict) and any('chance' in node for node in tree_data.values())
+            subtree_index = self.get_subtree_index(tree_data) if extra_runs or has_chance else None
+
+            # The negamax-family engines
+            extra_results = {}
+            if "Negamax engines" in extra_runs:
+                for name, run_engine in EXTRA_ENGINES.items():
+                    stats = SearchStats(name, subtree_index)
+                    start_time = time.perf_counter_ns()
+                    value, path = run_engine(root_node, tree_data, True, depth=depth_limit, stats=stats)
+                    stats.elapsed_ns = time.perf_counter_ns() - start_time
+                    extra_results[name] = (value, path, stats)
+
+            # Alpha-beta again under each move ordering
+            ordering_results = {}
+            if "Move orderings" in extra_runs:
+                for name, make_ordering in MOVE_ORDERINGS.items():
+                    ordering = make_ordering()
+                    stats = SearchStats(f"alpha-beta + {name}", subtree_index)
+                    start_time = time.perf_counter_ns()
+                    value, path, _ = alpha_beta_with_path(root_node, tree_data, -math.inf, math.inf, True, depth=depth_limit,
+                                                          stats=stats, ordering=ordering)
+                    stats.elapsed_ns = time.perf_counter_ns() - start_time
+                    ordering_results[name] = (value, path, stats, ordering.nodes_examined)
+            # Minimax and alpha-beta with a transposition table: shared subtrees (DAGs) are searched once
+            tt_results = {}
+            if "Transposition tables" in extra_runs:
+                for name, run_engine in (("Minimax", lambda stats, table: minimax_with_path(
+                                              root_node, tree_data, True, depth=depth_limit, stats=stats, table=table)),
+                                         ("Alpha-Beta", lambda stats, table: alpha_beta_with_path(
+                                              root_node, tree_data, -math.inf, math.inf, True, depth=depth_limit, stats=stats, table=table)[:2])):
+                    stats = SearchStats(f"{name} + transposition table", subtree_index)
+                    start_time = time.perf_counter_ns()
+                    value, path = run_engine(stats, {})
+                    stats.elapsed_ns = time.perf_counter_ns() - start_time
+                    tt_results[name] = (value, path, stats)
+            # Iterative deepening up to the depth limit, stopped by the time limit
+            id_value = id_path = id_depth = id_stats = None
+            if "Iterative deepening" in extra_runs:
+                id_stats = SearchStats("iterative deepening", subtree_index)
+                start_time = time.perf_counter_ns()
+                id_value, id_path, id_depth = iterative_deepening(root_node, tree_data, True, max_depth=depth_limit,
+                                                                  time_limit=time_limit, stats=id_stats)
+                id_stats.elapsed_ns = time.perf_counter_ns() - start_time
+
+            # Expectiminimax when the tree has chance nodes: the full search against Star1 / Star2 pruning
+            chance_results = {}
+            if has_chance:
+                for name, run_engine in CHANCE_ENGINES.items():
+                    stats = SearchStats(name, subtree_index)
+                    start_time = time.perf_counter_ns()
+                    value, path = run_engine(root_node, tree_data, True, depth=depth_limit, stats=stats)
+                    stats.elapsed_ns = time.perf_counter_ns() - start_time
+                    chance_results[name] = (value, path, stats)
+            branching, search_depth = search_shape(tree_data, root_node, depth_limit)
+            best_case = best_case_leaves(branching, search_depth)
+
+            self.last_comparison = {
+                'engine': self.engine_var.get(),
+                'extra_runs': extra_runs,
+                'root': root_node,
+                'depth_limit': depth_limit,
+                'tree_nodes': len(tree_data),
+                'minimax': dict(mm_stats.to_dict(), value=mm_value, path=mm_path, from_cache=mm_cached),
+                'alpha_beta': dict(ab_stats.to_dict(), value=ab_value, path=ab_path, pruned_children=ab_pruned_count),
+                'engines': {name: dict(stats.to_dict(), value=value, path=path)
+                            for name, (value, path, stats) in extra_results.items()},
+                'move_ordering': {name: dict(stats.to_dict(), value=value, path=path, ordering_nodes_examined=examined)
+                                  for name, (value, path, stats, examined) in ordering_results.items()},
+                'transposition_table': {name: dict(stats.to_dict(), value=value, path=path)
+                                         for name, (value, path, stats) in tt_results.items()},
+                'incremental': dict(inc_stats.to_dict(), value=inc_value, path=inc_path) if inc_stats else None,
+                'iterative_deepening': dict(id_stats.to_dict(), value=id_value, path=id_path, depth_completed=id_depth,
+                                            time_limit=time_limit) if id_stats else None,
+                'expectiminimax': {name: dict(stats.to_dict(), value=value, path=path)
+                                   for name, (value, path, stats) in chance_results.items()},
+                'best_case': {'branching': branching, 'depth': search_depth, 'leaves': best_case},
+            }
+            self.export_stats_button.config(state=tk.NORMAL)
+
             # Update UI
             self.minimax_value_label.config(text=str(mm_value))
             self.minimax_path_label.config(text=" -> ".join(mm_path))
-            self.minimax_nodes_label.config(text=str(mm_nodes_evaluated))
+            self.minimax_nodes_label.config(text=f"{mm_stats.nodes_visited} ({mm_stats.nodes_expanded} / {mm_stats.leaves_evaluated})")
             
             self.ab_value_label.config(text=str(ab_value))
             self.ab_path_label.config(text=" -> ".join(ab_path))
-            self.ab_pruned_label.config(text=str(ab_pruned_count))
+            self.ab_nodes_label.config(text=f"{ab_stats.nodes_visited} ({ab_stats.nodes_expanded} / {ab_stats.leaves_evaluated})")
+            self.ab_pruned_label.config(text=f"{ab_pruned_count} ({ab_stats.cutoffs} / {ab_stats.eliminated_nodes} / "
+                                             f"{ab_stats.eliminated_leaves})")
+
+            self.engine_table.delete(*self.engine_table.get_children())
+            table_rows = [("Minimax (Incremental Cache)" if mm_cached else "Minimax", mm_value, mm_stats, 0),
+                          ("Alpha-Beta", ab_value, ab_stats, 0)]
+            table_rows += [(name, value, stats, 0) for name, (value, _, stats) in extra_results.items()]
+            table_rows += [(f"Alpha-Beta + {name}", value, stats, examined)
+                           for name, (value, _, stats, examined) in ordering_results.items()]
+            table_rows += [(f"{name} + Transposition Table", value, stats, 0) for name, (value, _, stats) in tt_results.items()]
+            if inc_stats:
+                table_rows.append(("Incremental Cache (filled)", inc_value, inc_stats, 0))
+            if id_stats:
+                table_rows.append((f"Iterative Deepening (depth {id_depth})", id_value, id_stats, 0))
+            table_rows += [(name, round(value, 4), stats, 0) for name, (value, _, stats) in chance_results.items()]
+            for name, value, stats, examined in table_rows:
+                self.engine_table.insert("", tk.END, text=name, values=(value, stats.nodes_visited, stats.leaves_evaluated, stats.cutoffs,
+                                                                        stats.eliminated_nodes, stats.eliminated_leaves,
+                                                                        stats.re_searches, stats.memory_hits,
+                                                                        examined, f"{stats.elapsed_ns / 1e6:.2f}"))
+            self.engine_table.insert("", tk.END, text=f"Best case (b={branching:.2f}, d={search_depth})",
+                                     values=("-", "-", best_case, "-", "-", "-", "-", "-", "-", "-"))
             
             # Update pruned nodes visualization
             self.pruned_nodes_text.config(state=tk.NORMAL)
             self.pruned_nodes_text.delete("1.0", tk.END)
             if ab_pruned_count > 0:
-                pruned_str = f"Alpha-Beta pruned {ab_pruned_count} nodes: {', '.join(ab_pruned_nodes)}"
+                cutoffs_str = ", ".join(f"depth {d}: {n} cutoffs, {ab_stats.eliminated_by_depth[d]} nodes "
+                                        f"({ab_stats.eliminated_leaves_by_depth[d]} leaves)"
+                                        for d, n in sorted(ab_stats.cutoffs_by_depth.items()))
+                pruned_names = ", ".join(ab_pruned_nodes[:PRUNED_LIST_LIMIT])
+                if ab_pruned_count > PRUNED_LIST_LIMIT:
+                    pruned_names += f", ... ({ab_pruned_count - PRUNED_LIST_LIMIT} more)"
+                pruned_str = (f"Alpha-Beta pruned {ab_pruned_count} subtrees holding {ab_stats.eliminated_nodes} nodes "
+                              f"({ab_stats.eliminated_leaves} leaves): {pruned_names}\n{cutoffs_str}")
                 self.pruned_nodes_text.insert("1.0", pruned_str)
-                
-                # Create visualization of the tree with pruned nodes highlighted
-                def build_viz_string_with_pruning(node_name, prefix="", is_last=True):
-                    node = self.tree_data.get(node_name)
-                    if not node: return ""
-
-                    connector = "└── " if is_last else "├── "
-                    is_pruned = node_name in ab_pruned_nodes
-                    
-                    viz_str = prefix + connector + node_name
-                    if is_pruned:
-                        viz_str += " [PRUNED]"
-                    if node['is_terminal']:
-                        viz_str += f" ({node['value']})"
-                    viz_str += "\n"
-
-                    new_prefix = prefix + ("    " if is_last else "│   ")
-                    children = node['children']
-                    for i, child_name in enumerate(children):
-                        viz_str += build_viz_string_with_pruning(child_name, new_prefix, i == len(children) - 1)
-                    return viz_str
-                
-                pruned_viz = build_viz_string_with_pruning(root_node)
-                self.pruned_nodes_text.insert(tk.END, "\n\nTree with pruned nodes:\n" + pruned_viz)
+                self.pruned_nodes_text.insert(tk.END, "\n\nPruned nodes and the principal variation are highlighted in the Tree Visualization tab.")
             else:
                 self.pruned_nodes_text.insert("1.0", "No nodes were pruned during Alpha-Beta search.")
+            self.update_tree_visualization(pruned=ab_pruned_nodes, pv=ab_path)
             self.pruned_nodes_text.config(state=tk.DISABLED)
 
-            efficiency = (mm_nodes_evaluated - (mm_nodes_evaluated - ab_pruned_count)) / mm_nodes_evaluated * 100 if mm_nodes_evaluated > 0 else 0
-            self.status_var.set(f"Comparison complete. MM: {mm_time:.4f}s, AB: {ab_time:.4f}s. Efficiency gain: {efficiency:.1f}%")
+            status = f"Comparison complete. MM: {mm_stats.elapsed_ns / 1e9:.4f}s, AB: {ab_stats.elapsed_ns / 1e9:.4f}s. "
+            if mm_cached:
+                # A cached Minimax visits only the edited chains, so its node count says nothing about pruning
+                status += f"Minimax read from the incremental cache ({mm_stats.nodes_expanded} nodes re-searched)"
+            else:
+                mm_nodes = mm_stats.nodes_visited
+                efficiency = (mm_nodes - ab_stats.nodes_visited) / mm_nodes * 100 if mm_nodes > 0 else 0
+                status += f"Alpha-Beta evaluated {efficiency:.1f}% fewer nodes"
+            if chance_results:
+                full_nodes = chance_results["Expectiminimax (full)"][2].nodes_visited
+                status += (f". Chance nodes: expectiminimax {full_nodes} nodes, Star1 {chance_results['Star1'][2].nodes_visited}, "
+                           f"Star2 {chance_results['Star2 (probing)'][2].nodes_visited} (minimax engines treat chance nodes as MAX/MIN)")
+            self.status_var.set(status)
 
         except ValueError as e:
             messagebox.showerror("Input Error", str(e), parent=self.master)
@@ -778,6 +1240,21 @@ G: value=2"""
         finally:
             self.compare_button.config(state=tk.NORMAL)
 
+    def export_comparison_stats(self):
+        """Saves the instrumentation from the last comparison as JSON."""
+        if not self.last_comparison:
+            return
+        path = filedialog.asksaveasfilename(parent=self.master, title="Export Comparison Stats", defaultextension=".json",
+                                            filetypes=[("JSON", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.last_comparison, f, indent=2)
+            self.status_var.set(f"Stats exported to {os.path.basename(path)}.")
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Could not write stats: {e}", parent=self.master)
+
     def run_comparison_threaded(self):
         self.compare_button.config(state=tk.DISABLED)
         self.status_var.set("Processing...")
@@ -786,14 +1263,97 @@ G: value=2"""
         self.minimax_nodes_label.config(text="-")
         self.ab_value_label.config(text="-")
         self.ab_path_label.config(text="-")
+        self.ab_nodes_label.config(text="-")
         self.ab_pruned_label.config(text="-")
         self.pruned_nodes_text.config(state=tk.NORMAL)
         self.pruned_nodes_text.delete("1.0", tk.END)
         self.pruned_nodes_text.config(state=tk.DISABLED)
+        self.engine_table.delete(*self.engine_table.get_children())
         self.master.update_idletasks()
         thread = threading.Thread(target=self.run_comparison, daemon=True)
         thread.start()
 
+    def record_trace(self, algorithm):
+        """Searches the dict tree with `algorithm`, streaming its events to a trace file, then opens the trace."""
+        if not self.tree_data:
+            messagebox.showerror("Error", "Tree is empty. Please define or parse a tree first.", parent=self.master)
+            return
+        try:
+            root_node, depth_limit = self.get_search_root()
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e), parent=self.master)
+            return
+        path = filedialog.asksaveasfilename(parent=self.master, title="Record Search Trace", defaultextension=".gtrace",
+                                            filetypes=[("Binary traces", "*.gtrace"), ("JSON lines", "*.jsonl"), ("All files", "*.*")])
+        if not path:
+            return
+        self.status_var.set(f"Recording {algorithm} trace from '{root_node}'...")
+        self.master.update_idletasks()
+        try:
+            with TraceWriter(path) as trace:
+                if algorithm == "minimax":
+                    minimax_with_path(root_node, self.tree_data, True, depth=depth_limit, trace=trace)
+                else:
+                    alpha_beta_with_path(root_node, self.tree_data, -math.inf, math.inf, True, depth=depth_limit, trace=trace)
+        except (OSError, RecursionError) as e:
+            messagebox.showerror("Trace Error", f"Could not record trace: {e}", parent=self.master)
+            self.status_var.set(f"Trace error: {e}")
+            return
+        self.load_trace(path)
+
+    def open_trace(self):
+        path = filedialog.askopenfilename(parent=self.master, title="Open Search Trace",
+                                          filetypes=[("Search traces", "*.gtrace *.jsonl"), ("All files", "*.*")])
+        if path:
+            self.load_trace(path)
+
+    def load_trace(self, path):
+        """Indexes a trace file for replay; events are read from the file as they are shown."""
+        self.status_var.set(f"Indexing {os.path.basename(path)}...")
+        self.master.update_idletasks()
+        try:
+            reader = TraceReader(path)
+            replay = TraceReplay(reader)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Open Error", f"Error opening trace: {e}", parent=self.master)
+            self.status_var.set(f"Open error: {e}")
+            return
+        if self.trace_reader is not None:
+            self.trace_reader.close()
+        self.trace_reader, self.trace_replay = reader, replay
+        fmt = "JSON lines" if reader.jsonl else f"binary, {len(reader.names)} distinct nodes"
+        self.trace_info_label.config(text=f"{os.path.basename(path)}: {len(reader)} events ({fmt})")
+        self.trace_scale.config(to=max(len(reader) - 1, 0))
+        self.show_trace_event(0)
+        self.status_var.set(f"Loaded trace with {len(reader)} events.")
+
+    def step_trace(self, step):
+        if self.trace_replay is not None:
+            self.show_trace_event(max(int(self.trace_position_var.get()) + step, 0))
+
+    def show_trace_event(self, position):
+        """Shows event `position` (-1 for the last), the search stack after it and the events around it."""
+        if self.trace_replay is None or not len(self.trace_replay):
+            return
+        if position < 0:
+            position = len(self.trace_replay) - 1
+        position = min(position, len(self.trace_replay) - 1)
+        if int(self.trace_position_var.get()) != position:
+            self.trace_position_var.set(position)
+        reader = self.trace_reader
+        lines = [f"Event {position + 1} of {len(reader)}: {format_event(reader[position]).strip()}", "", "Search stack:"]
+        for depth, (node, alpha, beta, best) in enumerate(self.trace_replay.stack_at(position)):
+            best_text = "-" if math.isnan(best) else py_value(best)
+            lines.append(f"  {'  ' * depth}{node}  window [{py_value(alpha)}, {py_value(beta)}]  best {best_text}")
+        lines += ["", "Events:"]
+        start = max(position - TRACE_CONTEXT_EVENTS, 0)
+        for i, event in enumerate(reader[start:position + TRACE_CONTEXT_EVENTS + 1], start):
+            lines.append(f"{'>' if i == position else ' '} {i + 1:>9}  {format_event(event)}")
+        self.trace_text.config(state=tk.NORMAL)
+        self.trace_text.delete("1.0", tk.END)
+        self.trace_text.insert("1.0", "\n".join(lines))
+        self.trace_text.config(state=tk.DISABLED)
+
 def launch_app():
     """Entry point function for launching this application from Flask"""
     root = tk.Tk()
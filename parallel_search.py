@@ -0,0 +1,260 @@
+import atexit
+import contextlib
+import math
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from game_tree import CompactTree, SubtreeIndex, load_tree_binary
+from tree_search import SearchStats, _alpha_beta_compact, compact_subtree_counts, unwind_pv, py_value
+
+# CompactTree arrays placed in shared memory, with their typecodes
+SHARED_ARRAYS = (("child_start", 'i'), ("child_ids", 'i'), ("values", 'd'), ("flags", 'B'))
+# SubtreeIndex arrays (for a CompactTree) shared with the workers, so their cutoffs are sized without walking
+INDEX_ARRAYS = (("sizes", 'q'), ("leaves", 'q'))
+
+
+# --- Shared Tree Storage ---
+class SharedCompactTree:
+    """Copies a CompactTree's arrays into shared memory blocks that worker processes attach to.
+
+    Use as a context manager; the blocks are released on exit. Only the
+    block names and lengths are sent to workers, never the tree itself.
+    `arrays` selects other attributes, e.g. INDEX_ARRAYS for a SubtreeIndex.
+    """
+
+    def __init__(self, tree, arrays=SHARED_ARRAYS):
+        self.blocks = []
+        self.descriptor = []  # (block name, typecode, length) per array, picklable
+        try:
+            for attr, typecode in arrays:
+                data = getattr(tree, attr)
+                nbytes = len(data) * data.itemsize
+                block = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+                self.blocks.append(block)
+                block.buf[:nbytes] = memoryview(data).cast('B')
+                self.descriptor.append((block.name, typecode, len(data)))
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@contextlib.contextmanager
+def _worker_tree_source(tree):
+    """Yields what a worker needs to reach `tree`: the file it was loaded from, or shared memory blocks."""
+    path = getattr(tree, 'source_path', None)
+    if path is not None:
+        yield ('file', path)  # Workers map the same file, so they share its pages with this process
+    else:
+        with SharedCompactTree(tree) as shared:
+            yield ('shm', shared.descriptor)
+
+# Per-worker state, set by _attach_tree when the pool starts a process
+_worker_blocks = []
+_worker_arrays = None
+_worker_index = None
+
+def _attach_shared(descriptor):
+    arrays = []
+    for name, typecode, length in descriptor:
+        block = shared_memory.SharedMemory(name=name)
+        _worker_blocks.append(block)  # Keep the mapping alive for the life of the worker
+        itemsize = array(typecode).itemsize
+        arrays.append(block.buf[:length * itemsize].cast(typecode))
+    return arrays
+
+def _attach_tree(source, index_descriptor=None):
+    global _worker_arrays, _worker_index
+    if index_descriptor is not None:
+        _worker_index = SubtreeIndex(*_attach_shared(index_descriptor))
+    kind, descriptor = source
+    if kind == 'file':
+        tree = load_tree_binary(descriptor)
+        _worker_arrays = (tree.child_start, tree.child_ids, tree.values, tree.flags)
+    else:
+        _worker_arrays = tuple(_attach_shared(descriptor))
+
+def _search_child(child_id, alpha, beta, is_maximizing, depth, collect_stats):
+    """Searches one root child inside a worker; returns (value, pv ids, pruned ids, stats)."""
+    child_start, child_ids, values, flags = _worker_arrays
+    stats = SearchStats(subtree_index=_worker_index) if collect_stats else None
+    pruned_ids = []
+    value, pv = _alpha_beta_compact(child_start, child_ids, values, flags, child_id, alpha, beta,
+                                    is_maximizing, depth, pruned_ids, 1, stats)
+    if stats is not None:
+        stats.subtree_index = None  # Views of shared memory do not pickle; the caller has its own index
+    return value, unwind_pv(pv), pruned_ids, stats
+
+
+# --- Worker Pool ---
+class SearchPool:
+    """Worker processes attached to one CompactTree, kept between searches.
+
+    The processes (and any shared memory copy of the tree and of its
+    SubtreeIndex) are created on the first submit and released by close().
+    parallel_alpha_beta keeps one pool for the last tree it searched; see
+    get_search_pool and shutdown_search_pool.
+    """
+
+    def __init__(self, tree, subtree_index=None, max_workers=None):
+        self.tree = tree
+        # Only an index built from a CompactTree can be shared as arrays (workers look it up by id)
+        shareable = subtree_index is not None and isinstance(subtree_index.sizes, array)
+        self.subtree_index = subtree_index if shareable else None
+        self.max_workers = max_workers
+        self._executor = None
+        self._resources = None
+
+    def serves(self, tree, subtree_index=None, max_workers=None):
+        """Whether this pool can search `tree`: same tree object, index and worker count."""
+        return (tree is self.tree and max_workers == self.max_workers
+                and (subtree_index is None or subtree_index is self.subtree_index))
+
+    def submit(self, fn, *args):
+        if self._executor is None:
+            self._start()
+        return self._executor.submit(fn, *args)
+
+    def _start(self):
+        resources = contextlib.ExitStack()
+        try:
+            source = resources.enter_context(_worker_tree_source(self.tree))
+            index_descriptor = None
+            if self.subtree_index is not None:
+                index_descriptor = resources.enter_context(SharedCompactTree(self.subtree_index, INDEX_ARRAYS)).descriptor
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_attach_tree,
+                                                 initargs=(source, index_descriptor))
+        except BaseException:
+            resources.close()
+            raise
+        self._resources = resources
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._resources is not None:
+            self._resources.close()
+            self._resources = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_search_pool = None  # The pool parallel_alpha_beta used last
+
+def get_search_pool(tree, subtree_index=None, max_workers=None):
+    """The shared SearchPool for `tree`, replacing (and closing) the previous one if it served another tree."""
+    global _search_pool
+    if _search_pool is None or not _search_pool.serves(tree, subtree_index, max_workers):
+        shutdown_search_pool()
+        _search_pool = SearchPool(tree, subtree_index, max_workers)
+    return _search_pool
+
+def shutdown_search_pool():
+    """Stops the shared pool's worker processes and frees its shared memory."""
+    global _search_pool
+    if _search_pool is not None:
+        _search_pool.close()
+        _search_pool = None
+
+atexit.register(shutdown_search_pool)
+
+
+# --- Parallel Search ---
+def parallel_alpha_beta(node_name, tree, alpha, beta, is_maximizing, depth=None, pruned_info=None, stats=None,
+                        max_workers=None, pool=None):
+    """alpha_beta_compact with the root's children split across worker processes.
+
+    Young Brothers Wait at the root: the eldest child is searched here to set
+    the window, then its siblings are searched in parallel with that window.
+    Results are combined in child order, so the value and principal variation
+    are the serial ones. `tree` may be a CompactTree or the dict form; a tree
+    opened with load_tree_binary is mapped by the workers straight from its file.
+
+    The workers come from `pool` if given, otherwise from the shared pool for
+    this tree (get_search_pool), so repeated searches of one CompactTree start
+    the processes once. A dict tree is compiled, and gets a new pool, per call.
+    """
+    if not isinstance(tree, CompactTree):
+        tree = CompactTree.from_tree_data(tree)
+    if pruned_info is None:
+        pruned_info = {"count": 0, "nodes": []}
+    root_id = tree.node_id(node_name) if isinstance(node_name, str) else node_name
+    children = tree.children(root_id)
+    names = tree.names
+
+    def finish(value, path_ids, pruned_ids):
+        pruned_info["count"] += len(pruned_ids)
+        pruned_info["nodes"].extend(names[i] for i in pruned_ids)
+        return py_value(value), [names[i] for i in path_ids], pruned_info
+
+    # Nothing to split: let the serial search handle leaves, depth 0 and single children
+    if len(children) < 2 or tree.is_terminal(root_id) or (depth is not None and depth <= 0):
+        pruned_ids = []
+        value, pv = _alpha_beta_compact(tree.child_start, tree.child_ids, tree.values, tree.flags,
+                                        root_id, alpha, beta, is_maximizing, depth, pruned_ids, 0, stats)
+        return finish(value, unwind_pv(pv), pruned_ids)
+
+    if stats is not None:
+        stats.record_expand(0)
+    next_depth = None if depth is None else depth - 1
+    better = (lambda a, b: a > b) if is_maximizing else (lambda a, b: a < b)
+    best_value = -math.inf if is_maximizing else math.inf
+    best_path = None
+    pruned_ids = []
+
+    def take(k, value, path_ids, child_pruned, child_stats):
+        """Folds child k's result in exactly as the serial loop would; returns True on a cutoff."""
+        nonlocal alpha, beta, best_value, best_path
+        pruned_ids.extend(child_pruned)
+        if child_stats is not None:
+            stats.merge(child_stats)
+        if better(value, best_value):
+            best_value = value
+            best_path = [root_id] + path_ids
+        if is_maximizing:
+            alpha = max(alpha, best_value)
+        else:
+            beta = min(beta, best_value)
+        if beta <= alpha:
+            pruned_ids.extend(children[k + 1:])
+            if stats is not None:
+                stats.record_cutoff(0, *compact_subtree_counts(tree.child_start, tree.child_ids, children[k + 1:],
+                                                               stats.subtree_index))
+            return True
+        return False
+
+    # Eldest brother first, in this process
+    eldest_stats = SearchStats(subtree_index=stats.subtree_index) if stats is not None else None
+    eldest_pruned = []
+    value, pv = _alpha_beta_compact(tree.child_start, tree.child_ids, tree.values, tree.flags, children[0],
+                                    alpha, beta, not is_maximizing, next_depth, eldest_pruned, 1, eldest_stats)
+    if take(0, value, unwind_pv(pv), eldest_pruned, eldest_stats):
+        return finish(best_value, best_path, pruned_ids)
+
+    # Younger brothers in parallel, all with the window the eldest established
+    if pool is None:
+        pool = get_search_pool(tree, None if stats is None else stats.subtree_index, max_workers)
+    futures = [pool.submit(_search_child, child_id, alpha, beta, not is_maximizing, next_depth, stats is not None)
+               for child_id in children[1:]]
+    for k, future in enumerate(futures, start=1):
+        if take(k, *future.result()):
+            for pending in futures[k + 1:]:
+                pending.cancel()
+            break
+    return finish(best_value, best_path, pruned_ids)
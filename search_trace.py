@@ -0,0 +1,266 @@
+import json
+import math
+import mmap
+import struct
+from array import array
+from collections import namedtuple
+from collections.abc import Sequence
+
+from game_tree import py_value
+
+# Event kinds, in the order a search emits them for one node
+TRACE_ENTER = 0   # A node is about to be expanded (alpha, beta = the window it was given)
+TRACE_LEAF = 1    # A node was scored without expanding it (value = its score)
+TRACE_UPDATE = 2  # A node's best value improved (value = new best, alpha/beta = the window after it)
+TRACE_CUTOFF = 3  # The window closed and the remaining children were skipped (value = how many)
+TRACE_EXIT = 4    # A node's search finished (value = what it returned)
+EVENT_NAMES = ('enter', 'leaf', 'update', 'cutoff', 'exit')
+
+# Binary trace files: a header, fixed-size little-endian event records, then the
+# node names ('\n'-separated UTF-8) that the records refer to by index. The
+# header's counts are written on close, so a trace is only readable once closed.
+TRACE_MAGIC = b"GTRACE01"
+TRACE_HEADER = struct.Struct("<8sQQQ")      # magic, event count, name table offset, name count
+TRACE_RECORD = struct.Struct("<BxxxIIddd")  # kind, ply, node index, value, alpha, beta
+TRACE_BUFFER_EVENTS = 65536  # Events packed in memory between writes
+TRACE_CHECKPOINT_INTERVAL = 4096  # Events between saved search stacks in a TraceReplay
+
+TraceEvent = namedtuple('TraceEvent', 'kind node ply value alpha beta')
+
+# JSON has no infinities or NaN, so JSON lines traces store them as these strings
+JSON_NONFINITE = {'inf': math.inf, '-inf': -math.inf, 'nan': math.nan}
+
+
+# --- Recording ---
+class TraceWriter:
+    """Streams search events to a binary trace file, or to JSON lines when the path ends in '.jsonl'.
+
+    Pass one as `trace=` to minimax_with_path or alpha_beta_with_path. Events
+    are packed into a buffer and written in blocks, and node names are stored
+    once, so each event costs one struct.pack (or json.dumps) call.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.jsonl = path.lower().endswith('.jsonl')
+        self.count = 0
+        self._ids = {}
+        self._names = []
+        if self.jsonl:
+            self._file = open(path, "w", encoding="utf-8")
+            self._buffer = []
+        else:
+            self._file = open(path, "wb")
+            self._file.write(TRACE_HEADER.pack(TRACE_MAGIC, 0, 0, 0))
+            self._buffer = bytearray()
+
+    def record(self, kind, node, ply, value=math.nan, alpha=-math.inf, beta=math.inf):
+        if self.jsonl:
+            self._buffer.append(json.dumps({'event': EVENT_NAMES[kind], 'node': node, 'ply': ply,
+                                            'value': _json_number(value), 'alpha': _json_number(alpha),
+                                            'beta': _json_number(beta)}, allow_nan=False))
+        else:
+            node_index = self._ids.get(node)
+            if node_index is None:
+                node_index = self._ids[node] = len(self._names)
+                self._names.append(node)
+            self._buffer += TRACE_RECORD.pack(kind, ply, node_index, value, alpha, beta)
+        self.count += 1
+        if self.count % TRACE_BUFFER_EVENTS == 0:
+            self._flush()
+
+    def enter(self, node, ply, alpha=-math.inf, beta=math.inf):
+        self.record(TRACE_ENTER, node, ply, math.nan, alpha, beta)
+
+    def leaf(self, node, ply, value):
+        self.record(TRACE_LEAF, node, ply, value)
+
+    def update(self, node, ply, value, alpha=-math.inf, beta=math.inf):
+        self.record(TRACE_UPDATE, node, ply, value, alpha, beta)
+
+    def cutoff(self, node, ply, skipped, alpha, beta):
+        self.record(TRACE_CUTOFF, node, ply, skipped, alpha, beta)
+
+    def exit(self, node, ply, value):
+        self.record(TRACE_EXIT, node, ply, value)
+
+    def _flush(self):
+        if self.jsonl:
+            if self._buffer:
+                self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+        else:
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        if not self.jsonl:
+            names_offset = self._file.tell()
+            self._file.write("\n".join(self._names).encode('utf-8'))
+            self._file.seek(0)
+            self._file.write(TRACE_HEADER.pack(TRACE_MAGIC, self.count, names_offset, len(self._names)))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _json_number(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return 'nan' if value != value else ('inf' if value > 0 else '-inf')
+    return value
+
+
+# --- Reading ---
+class TraceReader(Sequence):
+    """Random access to the events of a trace file without loading them all.
+
+    Binary traces are memory-mapped and each event is decoded when asked for.
+    A JSON lines trace is indexed by line offset in one streaming pass when
+    opened (8 bytes per event), then read one line at a time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = None
+        self.names = []
+        if self._file.read(len(TRACE_MAGIC)) == TRACE_MAGIC:
+            self.jsonl = False
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            _, self._count, names_offset, name_count = TRACE_HEADER.unpack_from(self._map, 0)
+            if name_count:
+                self.names = self._map[names_offset:].decode('utf-8').split("\n")
+            if TRACE_HEADER.size + self._count * TRACE_RECORD.size > len(self._map):
+                self.close()
+                raise ValueError(f"Trace file '{path}' is truncated.")
+        else:
+            self.jsonl = True
+            self._file.seek(0)
+            self._offsets = array('q')
+            position = 0
+            for line in self._file:
+                if line.strip():
+                    self._offsets.append(position)
+                position += len(line)
+            self._count = len(self._offsets)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        if self.jsonl:
+            self._file.seek(self._offsets[index])
+            return self._decode_line(self._file.readline())
+        kind, ply, node_index, value, alpha, beta = TRACE_RECORD.unpack_from(self._map,
+                                                                              TRACE_HEADER.size + index * TRACE_RECORD.size)
+        return TraceEvent(kind, self.names[node_index], ply, value, alpha, beta)
+
+    def iter_from(self, start=0):
+        """Events from `start` on, decoded in blocks (faster than indexing one at a time)."""
+        if self.jsonl:
+            if start < self._count:
+                self._file.seek(self._offsets[start])
+                for line in self._file:
+                    if line.strip():
+                        yield self._decode_line(line)
+            return
+        names = self.names
+        block = TRACE_BUFFER_EVENTS * TRACE_RECORD.size
+        offset = TRACE_HEADER.size + start * TRACE_RECORD.size
+        end = TRACE_HEADER.size + self._count * TRACE_RECORD.size
+        while offset < end:
+            chunk = self._map[offset:min(offset + block, end)]
+            for kind, ply, node_index, value, alpha, beta in TRACE_RECORD.iter_unpack(chunk):
+                yield TraceEvent(kind, names[node_index], ply, value, alpha, beta)
+            offset += block
+
+    @staticmethod
+    def _decode_line(line):
+        event = json.loads(line)
+        return TraceEvent(EVENT_NAMES.index(event['event']), event['node'], event['ply'],
+                          _from_json_number(event['value']), _from_json_number(event['alpha']),
+                          _from_json_number(event['beta']))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _from_json_number(value):
+    return JSON_NONFINITE[value] if isinstance(value, str) else value
+
+
+# --- Replay ---
+class TraceReplay:
+    """The search stack at any event of a trace, without searching again.
+
+    One streaming pass saves the stack every `interval` events; seeking then
+    replays at most `interval` events from the nearest saved stack. Stack
+    frames are (node, alpha, beta, best value so far), root first.
+    """
+
+    def __init__(self, reader, interval=TRACE_CHECKPOINT_INTERVAL):
+        self.reader = reader
+        self.interval = interval
+        self.checkpoints = []  # Stack before event k * interval
+        stack = []
+        for i, event in enumerate(reader.iter_from(0)):
+            if i % interval == 0:
+                self.checkpoints.append(tuple(stack))
+            _apply_event(stack, event)
+
+    def __len__(self):
+        return len(self.reader)
+
+    def stack_at(self, position):
+        """The stack once event `position` has been applied."""
+        checkpoint = position // self.interval
+        stack = list(self.checkpoints[checkpoint])
+        replay = self.reader.iter_from(checkpoint * self.interval)
+        for _ in range(position - checkpoint * self.interval + 1):
+            _apply_event(stack, next(replay))
+        return stack
+
+def _apply_event(stack, event):
+    kind = event.kind
+    if kind == TRACE_ENTER:
+        stack.append((event.node, event.alpha, event.beta, math.nan))
+    elif kind == TRACE_UPDATE and stack:
+        stack[-1] = (event.node, event.alpha, event.beta, event.value)
+    elif kind == TRACE_EXIT and stack:
+        stack.pop()
+
+def format_event(event):
+    """One-line description of an event for the replay view."""
+    name = EVENT_NAMES[event.kind]
+    window = f"window [{py_value(event.alpha)}, {py_value(event.beta)}]"
+    if event.kind == TRACE_ENTER:
+        detail = window
+    elif event.kind == TRACE_UPDATE:
+        detail = f"best {py_value(event.value)}, {window}"
+    elif event.kind == TRACE_CUTOFF:
+        detail = f"skips {int(event.value)} children, {window}"
+    else:
+        detail = f"value {py_value(event.value)}"
+    return f"{'  ' * event.ply}{name:<6} {event.node}  {detail}"
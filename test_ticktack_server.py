@@ -0,0 +1,94 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+import ticktack_server
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StalledExecutor:
+    """Executor whose searches never finish, to exercise the AI move timeout."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def test_session_store_expires_idle_sessions():
+    clock = FakeClock()
+    store = ticktack_server.SessionStore(ttl=60, clock=clock)
+    idle, active = store.create(), store.create()
+    clock.now = 50
+    store.get(active.session_id)
+    clock.now = 100
+    with pytest.raises(KeyError):
+        store.get(idle.session_id)
+    assert store.get(active.session_id) is active
+    clock.now = 200
+    assert store.purge_expired() == 1
+    assert len(store) == 0
+
+
+def test_session_store_evicts_least_recently_used():
+    store = ticktack_server.SessionStore(max_sessions=2, clock=FakeClock())
+    first, second = store.create(), store.create()
+    store.get(first.session_id)
+    third = store.create()
+    with pytest.raises(KeyError):
+        store.get(second.session_id)
+    assert store.get(first.session_id) is first
+    assert store.get(third.session_id) is third
+
+
+def test_human_move_validation():
+    service = ticktack_server.TicTacToeService(executor=StalledExecutor())
+    session_id = service.new_game()['session_id']
+    for position in [-1, 9, '4', 4.0, True]:
+        with pytest.raises(ValueError):
+            service.human_move(session_id, position)
+    service.human_move(session_id, 4)
+    with pytest.raises(ValueError, match="turn"):
+        service.human_move(session_id, 0)
+    with pytest.raises(KeyError):
+        service.human_move('missing', 0)
+
+
+def test_ai_move_replies_and_returns_turn():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        service = ticktack_server.TicTacToeService(executor=executor)
+        session_id = service.new_game()['session_id']
+        service.human_move(session_id, 4)
+        state = service.ai_move(session_id)
+        assert state['human_turn'] and state['board'].count(state['ai_player']) == 1
+        assert state['board'][state['ai_move']] == state['ai_player']
+        with pytest.raises(ValueError, match="AI player's turn"):
+            service.ai_move(session_id)
+
+
+def test_ai_move_timeout_leaves_game_unchanged():
+    executor = StalledExecutor()
+    service = ticktack_server.TicTacToeService(executor=executor, ai_timeout=0.01)
+    session_id = service.new_game()['session_id']
+    service.human_move(session_id, 4)
+    with pytest.raises(TimeoutError):
+        service.ai_move(session_id)
+    assert executor.futures[0].cancelled()
+    state = service.get_state(session_id)
+    assert not state['human_turn'] and state['board'].count(state['ai_player']) == 0
+    # The session is not stuck: the AI move can be retried
+    with pytest.raises(TimeoutError):
+        service.ai_move(session_id)
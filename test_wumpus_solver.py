@@ -0,0 +1,46 @@
+import contextlib
+import importlib.util
+import io
+import os
+
+# The game module's file name has a space in it, so it is loaded by path
+_spec = importlib.util.spec_from_file_location(
+    "wumpus_demo4", os.path.join(os.path.dirname(os.path.abspath(__file__)), "wumpus demo4.py"))
+wumpus = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(wumpus)
+
+
+def make_world():
+    """4x4 world whose only pit breezes both cells next to the start: no frontier cell is provably safe."""
+    world = wumpus.WumpusWorld(4)
+    world.agent_pos = (0, 0)
+    world.set_pit(1, 1)
+    world.set_wumpus(3, 0)
+    world.set_gold(0, 3)
+    return world
+
+
+def solve(world, probabilistic):
+    with contextlib.redirect_stdout(io.StringIO()):  # solve() prints the gold position every step
+        agent = wumpus.WumpusSolverAgent(world, probabilistic=probabilistic)
+        return agent, agent.solve()
+
+
+def test_hazard_probabilities_match_textbook_example():
+    world = make_world()
+    agent = wumpus.WumpusSolverAgent(world, probabilistic=True)
+    for pos in [(0, 0), (1, 0), (0, 0), (0, 1)]:
+        agent.agent_pos = pos
+        agent._update_knowledge()
+    risks = agent._hazard_probabilities([(2, 0), (1, 1), (0, 2)])
+    assert round(risks[(2, 0)], 2) == 0.31
+    assert round(risks[(1, 1)], 2) == 0.86
+    assert round(risks[(0, 2)], 2) == 0.31
+
+
+def test_probabilistic_solve_takes_least_risky_step():
+    world = make_world()
+    agent, actions = solve(world, probabilistic=True)
+    assert agent.marked_goal is None  # The world's gold position was not used
+    assert "Take Risk - 31% Hazard at (0, 2)" in actions
+    assert world.won and "FAILED" not in actions
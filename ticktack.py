@@ -1,97 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, font as tkFont, messagebox
-import math
 import time
 import random
 
-# --- Game Logic ---
-class TicTacToe:
-    WIN_CONDITIONS = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
-        [0, 4, 8], [2, 4, 6]             # Diagonals
-    ]
-
-    def __init__(self):
-        self.board = [' ' for _ in range(9)]
-        self.human_player = 'X'
-        self.ai_player = 'O'
-
-    def print_board(self):
-        for i in range(0, 9, 3):
-            print('|'.join(self.board[i:i+3]))
-
-    def make_move(self, position, player):
-        if self.board[position] == ' ':
-            self.board[position] = player
-            return True
-        return False
-
-    def check_winner(self):
-        """Checks if there is a winner and returns the player and the winning line."""
-        for condition in self.WIN_CONDITIONS:
-            line = [self.board[i] for i in condition]
-            if line[0] == line[1] == line[2] and line[0] != ' ':
-                return line[0], condition # Return winner ('X' or 'O') and the line indices
-        return None, None # No winner yet
-
-    def is_draw(self):
-        winner, _ = self.check_winner()
-        return ' ' not in self.board and winner is None
-
-    def is_game_over(self):
-        winner, _ = self.check_winner()
-        return winner is not None or self.is_draw()
-
-    def get_available_moves(self):
-        return [i for i, spot in enumerate(self.board) if spot == ' ']
-
-    def reset_board(self):
-        self.board = [' ' for _ in range(9)]
-
-# --- Minimax AI Logic (remains the same) ---
-def minimax(board_state, player, maximizing_player, human_player, ai_player):
-    winner, _ = board_state.check_winner()
-    if winner == ai_player: return 1
-    if winner == human_player: return -1
-    if board_state.is_draw(): return 0
-
-    available_moves = board_state.get_available_moves()
-    scores = []
-
-    for move in available_moves:
-        board_state.make_move(move, player)
-        if maximizing_player: # AI trying to maximize
-             score = minimax(board_state, human_player, False, human_player, ai_player)
-        else: # Human trying to minimize (from AI perspective)
-             score = minimax(board_state, ai_player, True, human_player, ai_player)
-        board_state.board[move] = ' ' # Backtrack
-        scores.append(score)
-
-    return max(scores) if maximizing_player else min(scores)
-
-
-def find_best_move(board_state, ai_player, human_player):
-    best_score = -math.inf
-    best_move = -1
-    available_moves = board_state.get_available_moves()
-
-    for move in available_moves:
-        board_state.make_move(move, ai_player)
-        score = minimax(board_state, human_player, False, human_player, ai_player)
-        board_state.board[move] = ' '
-        if score > best_score:
-            best_score = score
-            best_move = move
-
-    # Fallback if no move improves score (should only happen in losing scenarios)
-    if best_move == -1 and available_moves:
-        # Deterministic fallback: choose the first available move
-        best_move = available_moves[0]
-        # Or random fallback: best_move = random.choice(available_moves)
-
-    return best_move
-
+from tictactoe_engine import TicTacToe, find_best_move
 
 # --- Tkinter UI ---
 class TicTacToeApp:
@@ -0,0 +1,234 @@
+import collections
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tictactoe_engine import TicTacToe, find_best_move
+
+# Defaults for the session store
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_SESSION_TTL = 30 * 60  # Seconds of inactivity before a session expires
+DEFAULT_AI_TIMEOUT = 10.0  # Seconds an AI move may search before the request gives up
+
+
+# --- Session Storage ---
+class GameSession:
+    """One headless tic-tac-toe game (the state TicTacToeApp keeps in its widgets)."""
+
+    def __init__(self, session_id, human_first=True):
+        self.session_id = session_id
+        self.game = TicTacToe()
+        self.human_turn = human_first
+        self.lock = threading.Lock()  # Serializes moves within this session
+        self.ai_thinking = False  # An AI search for this session is running (the lock is not held meanwhile)
+        self.last_access = time.monotonic()
+
+    def snapshot(self):
+        """Returns a JSON-friendly view of the game state."""
+        winner, winning_line = self.game.check_winner()
+        return {
+            'session_id': self.session_id,
+            'board': list(self.game.board),
+            'human_player': self.game.human_player,
+            'ai_player': self.game.ai_player,
+            'human_turn': self.human_turn,
+            'winner': winner,
+            'winning_line': winning_line,
+            'draw': self.game.is_draw(),
+            'game_over': self.game.is_game_over(),
+        }
+
+
+class SessionStore:
+    """In-memory session store with TTL expiry and LRU eviction."""
+
+    def __init__(self, max_sessions=DEFAULT_MAX_SESSIONS, ttl=DEFAULT_SESSION_TTL, clock=time.monotonic):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1.")
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.clock = clock
+        self._sessions = collections.OrderedDict()  # Least recently used first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def create(self, human_first=True):
+        session = GameSession(secrets.token_hex(16), human_first)
+        with self._lock:
+            now = self.clock()
+            self._purge_expired_locked(now)
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)  # Evict least recently used
+            session.last_access = now
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id):
+        """Returns the session and marks it as recently used. Raises KeyError if missing or expired."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            now = self.clock()
+            if session is None or self._is_expired(session, now):
+                self._sessions.pop(session_id, None)
+                raise KeyError(f"Unknown or expired session '{session_id}'.")
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def remove(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def purge_expired(self):
+        """Drops every expired session and returns how many were removed."""
+        with self._lock:
+            return self._purge_expired_locked(self.clock())
+
+    def _is_expired(self, session, now):
+        return self.ttl is not None and now - session.last_access > self.ttl
+
+    def _purge_expired_locked(self, now):
+        # Sessions are kept in access order, so expired ones are all at the front
+        removed = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if not self._is_expired(session, now):
+                break
+            self._sessions.popitem(last=False)
+            removed += 1
+        return removed
+
+
+# --- Game Service ---
+class TicTacToeService:
+    """Serves new game / human move / AI move calls for many concurrent sessions.
+
+    The minimax search runs in a process pool so a slow search in one session
+    does not hold up requests for the others.
+    """
+
+    def __init__(self, store=None, max_workers=None, executor=None, ai_timeout=DEFAULT_AI_TIMEOUT):
+        self.store = store if store is not None else SessionStore()
+        self.ai_timeout = ai_timeout
+        self._owns_executor = executor is None
+        self.executor = executor if executor is not None else ProcessPoolExecutor(max_workers=max_workers)
+
+    def new_game(self, human_first=True):
+        return self.store.create(human_first).snapshot()
+
+    def get_state(self, session_id):
+        return self.store.get(session_id).snapshot()
+
+    def end_game(self, session_id):
+        return self.store.remove(session_id)
+
+    def human_move(self, session_id, position):
+        session = self.store.get(session_id)
+        with session.lock:
+            game = session.game
+            if game.is_game_over():
+                raise ValueError("Game is already over.")
+            if not session.human_turn or session.ai_thinking:
+                raise ValueError("It is not the human player's turn.")
+            if not isinstance(position, int) or isinstance(position, bool) or not 0 <= position < 9:
+                raise ValueError("Position must be an integer from 0 to 8.")
+            if not game.make_move(position, game.human_player):
+                raise ValueError(f"Position {position} is already taken.")
+            session.human_turn = False
+            return session.snapshot()
+
+    def ai_move(self, session_id, timeout=None):
+        """Runs the AI search for this session in the worker pool and applies its move.
+
+        The session lock is released while the search runs, so other requests
+        for the session are answered meanwhile (a second AI move is refused).
+        Raises TimeoutError if the search takes longer than `timeout` seconds
+        (default: the service's ai_timeout); the game is then left unchanged.
+        """
+        timeout = self.ai_timeout if timeout is None else timeout
+        session = self.store.get(session_id)
+        with session.lock:
+            game = session.game
+            if game.is_game_over():
+                raise ValueError("Game is already over.")
+            if session.human_turn:
+                raise ValueError("It is not the AI player's turn.")
+            if session.ai_thinking:
+                raise ValueError("An AI move is already in progress.")
+            # The game object is pickled to the worker, so the search never touches shared state
+            future = self.executor.submit(find_best_move, game, game.ai_player, game.human_player)
+            session.ai_thinking = True
+        try:
+            best_move = future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()  # Drops it if still queued; a search already running finishes unused
+            raise TimeoutError(f"The AI search took longer than {timeout} seconds.") from None
+        finally:
+            with session.lock:
+                session.ai_thinking = False
+        with session.lock:
+            if best_move != -1:
+                game.make_move(best_move, game.ai_player)
+            session.human_turn = True
+            state = session.snapshot()
+            state['ai_move'] = best_move
+            return state
+
+    def shutdown(self, wait=True):
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
+
+
+# --- HTTP Interface ---
+def create_app(service=None):
+    """Builds a Flask app exposing the service (e.g. `gunicorn "ticktack_server:create_app()"`)."""
+    from flask import Flask, jsonify, request
+
+    service = service if service is not None else TicTacToeService()
+    app = Flask(__name__)
+
+    @app.errorhandler(KeyError)
+    def handle_missing_session(e):
+        return jsonify(error=str(e.args[0]) if e.args else "Not found"), 404
+
+    @app.errorhandler(ValueError)
+    def handle_bad_move(e):
+        return jsonify(error=str(e)), 400
+
+    @app.errorhandler(TimeoutError)
+    def handle_slow_search(e):
+        return jsonify(error=str(e)), 503
+
+    @app.post("/games")
+    def new_game():
+        body = request.get_json(silent=True) or {}
+        return jsonify(service.new_game(human_first=bool(body.get('human_first', True)))), 201
+
+    @app.get("/games/<session_id>")
+    def game_state(session_id):
+        return jsonify(service.get_state(session_id))
+
+    @app.delete("/games/<session_id>")
+    def end_game(session_id):
+        if not service.end_game(session_id):
+            raise KeyError(f"Unknown or expired session '{session_id}'.")
+        return "", 204
+
+    @app.post("/games/<session_id>/move")
+    def human_move(session_id):
+        body = request.get_json(silent=True) or {}
+        return jsonify(service.human_move(session_id, body.get('position')))
+
+    @app.post("/games/<session_id>/ai-move")
+    def ai_move(session_id):
+        return jsonify(service.ai_move(session_id))
+
+    return app
+
+
+if __name__ == "__main__":
+    create_app().run(threaded=True)
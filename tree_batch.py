@@ -0,0 +1,235 @@
+import argparse
+import collections
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_tree import BINARY_MAGIC, CompactTree, SubtreeIndex, load_tree_binary, parse_tree_file
+from tree_generator import VALUE_DISTRIBUTIONS, ORDERINGS, generate_tree
+from tree_search import (SearchStats, minimax_with_path, alpha_beta_with_path, minimax_compact, alpha_beta_compact,
+                         minimax_iterative, alpha_beta_iterative, negamax_with_path, pvs_with_path, aspiration_search,
+                         mtdf_with_path, search_shape)
+from vector_search import HAVE_NUMPY, minimax_vectorized
+
+
+# --- Engines ---
+def _full_window(search):
+    """Adapts an alpha-beta engine to the fn(root, tree, is_maximizing, depth=..., stats=...) -> (value, path) form."""
+    def run(node_name, tree, is_maximizing, depth=None, stats=None):
+        return search(node_name, tree, -math.inf, math.inf, is_maximizing, depth, stats=stats)[:2]
+    return run
+
+# Engines run on every tree: name -> (tree preparation, fn(root, tree, is_maximizing, depth=..., stats=...) -> (value, path)).
+# The parallel engine is left out since the trees themselves are already spread over worker processes.
+BATCH_ENGINES = {
+    "minimax": (None, minimax_with_path),
+    "alpha-beta": (None, _full_window(alpha_beta_with_path)),
+    "minimax-compact": (CompactTree.from_tree_data, minimax_compact),
+    "alpha-beta-compact": (CompactTree.from_tree_data, _full_window(alpha_beta_compact)),
+    "minimax-iterative": (None, minimax_iterative),
+    "alpha-beta-iterative": (None, _full_window(alpha_beta_iterative)),
+    "negamax": (None, negamax_with_path),
+    "pvs": (None, pvs_with_path),
+    "aspiration": (None, aspiration_search),
+    "mtdf": (None, mtdf_with_path),
+}
+if HAVE_NUMPY:  # Complete trees only; other trees get an error row
+    BATCH_ENGINES["vectorized"] = (CompactTree.from_tree_data, minimax_vectorized)
+REFERENCE_ENGINE = "minimax"  # Other engines' values are checked against this one
+TREE_FILE_EXTENSIONS = ('.txt', '.tree', '.gtree')
+VALUE_TOLERANCE = 1e-9
+CSV_COLUMNS = ('tree', 'nodes', 'branching', 'depth', 'engine', 'value', 'agrees', 'path', 'nodes_visited',
+               'leaves_evaluated', 'cutoffs', 'eliminated_nodes', 're_searches', 'memory_hits', 'time_ms', 'error')
+
+
+# --- Tree Sources ---
+def parse_generator_spec(spec):
+    """Turns 'BxD[,key=value...]' (e.g. '4x6,seed=2,ordering=best-first') into generate_tree arguments."""
+    shape, *options = spec.split(",")
+    try:
+        branching, depth = (int(part) for part in shape.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Generator spec '{spec}' must start with BRANCHINGxDEPTH, e.g. '4x6'.") from None
+    kwargs = {'branching': branching, 'depth': depth}
+    for option in options:
+        key, _, value = option.partition("=")
+        key = key.strip()
+        if key in ('seed', 'low', 'high'):
+            try:
+                kwargs[key] = int(value)
+            except ValueError:
+                raise ValueError(f"Generator spec '{spec}': {key} must be an integer.") from None
+        elif key == 'values' and value in VALUE_DISTRIBUTIONS or key == 'ordering' and value in ORDERINGS:
+            kwargs[key] = value
+        else:
+            raise ValueError(f"Generator spec '{spec}': unknown option '{option}'.")
+    return kwargs
+
+def find_tree_files(directory):
+    """Tree definition and binary tree files in `directory`, sorted by name."""
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.lower().endswith(TREE_FILE_EXTENSIONS) and os.path.isfile(os.path.join(directory, name))]
+
+def load_source(source):
+    """Loads a ('file', path) or ('generate', kwargs) source as a CompactTree whose first node is the root."""
+    kind, arg = source
+    if kind == 'generate':
+        return generate_tree(**arg)
+    with open(arg, 'rb') as f:
+        binary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    return load_tree_binary(arg) if binary else CompactTree.from_tree_data(parse_tree_file(arg))
+
+def source_label(source):
+    kind, arg = source
+    if kind == 'generate':
+        return "generate:" + ",".join(f"{key}={value}" for key, value in arg.items())
+    return arg
+
+
+# --- Runner ---
+def compare_tree(source, engines=None, depth=None, is_maximizing=True):
+    """Runs each engine on one tree and returns a row per engine (dicts keyed by CSV_COLUMNS).
+
+    Trees are loaded here rather than passed in, so a worker process only
+    receives the source description.
+    """
+    label = source_label(source)
+    try:
+        compact = load_source(source)
+    except (OSError, ValueError) as e:
+        return [dict.fromkeys(CSV_COLUMNS, None) | {'tree': label, 'error': f"{type(e).__name__}: {e}"}]
+    root = compact.names[0]
+    tree_data = None
+    indexes = {}  # Subtree sizes for cutoff accounting, built once per tree form
+    rows = []
+    for name in engines or BATCH_ENGINES:
+        prepare_tree, run_engine = BATCH_ENGINES[name]
+        if prepare_tree == CompactTree.from_tree_data:
+            search_tree = compact
+        else:
+            if tree_data is None:
+                tree_data = compact.to_tree_data()  # Only built if a dict-based engine is asked for
+            search_tree = tree_data
+        if id(search_tree) not in indexes:
+            indexes[id(search_tree)] = SubtreeIndex.for_tree(search_tree)
+        stats = SearchStats(name, indexes[id(search_tree)])
+        row = dict.fromkeys(CSV_COLUMNS, None) | {'tree': label, 'nodes': len(compact), 'engine': name}
+        start = time.perf_counter_ns()
+        try:
+            value, path = run_engine(root, search_tree, is_maximizing, depth=depth, stats=stats)
+        except (RecursionError, ValueError) as e:
+            row['error'] = f"{type(e).__name__}: {e}"
+        else:
+            stats.elapsed_ns = time.perf_counter_ns() - start
+            row.update(value=value, path=" ".join(path), nodes_visited=stats.nodes_visited,
+                       leaves_evaluated=stats.leaves_evaluated, cutoffs=stats.cutoffs, eliminated_nodes=stats.eliminated_nodes,
+                       re_searches=stats.re_searches, memory_hits=stats.memory_hits,
+                       time_ms=round(stats.elapsed_ns / 1e6, 3))
+        rows.append(row)
+
+    if tree_data is None:
+        tree_data = compact.to_tree_data()
+    branching, search_depth = search_shape(tree_data, root, depth)
+    values = {row['engine']: row['value'] for row in rows if row['error'] is None}
+    reference = values.get(REFERENCE_ENGINE, next(iter(values.values()), None))
+    for row in rows:
+        row.update(branching=round(branching, 2), depth=search_depth)
+        if row['error'] is None:
+            row['agrees'] = math.isclose(row['value'], reference, rel_tol=0, abs_tol=VALUE_TOLERANCE)
+    return rows
+
+def run_batch(sources, engines=None, depth=None, workers=None):
+    """compare_tree over many sources, one tree per worker process at a time. Rows keep the order of `sources`."""
+    if workers == 1:
+        results = [compare_tree(source, engines, depth) for source in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(compare_tree, sources, [engines] * len(sources), [depth] * len(sources)))
+    return [row for rows in results for row in rows]
+
+
+# --- Reports ---
+def aggregate_rows(rows):
+    """Per (branching, depth, engine): trees, value agreement and pruning efficiency against full minimax.
+
+    Efficiency is the share of the reference engine's nodes that an engine
+    did not visit on the same tree (0 for minimax itself).
+    """
+    full_nodes = {row['tree']: row['nodes_visited'] for row in rows
+                  if row['engine'] == REFERENCE_ENGINE and row['error'] is None}
+    groups = collections.defaultdict(list)
+    for row in rows:
+        if row['engine'] is not None:
+            groups[(row['branching'], row['depth'], row['engine'])].append(row)
+
+    summary = []
+    for (branching, depth, engine), group in sorted(groups.items(), key=lambda item: (item[0][0] or 0, item[0][1] or 0, item[0][2])):
+        done = [row for row in group if row['error'] is None]
+        efficiencies = [1 - row['nodes_visited'] / full_nodes[row['tree']] for row in done if full_nodes.get(row['tree'])]
+        summary.append({
+            'branching': branching,
+            'depth': depth,
+            'engine': engine,
+            'trees': len(group),
+            'errors': len(group) - len(done),
+            'agreement': sum(row['agrees'] for row in done) / len(done) if done else None,
+            'mean_nodes_visited': sum(row['nodes_visited'] for row in done) / len(done) if done else None,
+            'mean_cutoffs': sum(row['cutoffs'] for row in done) / len(done) if done else None,
+            'mean_efficiency': sum(efficiencies) / len(efficiencies) if efficiencies else None,
+            'mean_time_ms': sum(row['time_ms'] for row in done) / len(done) if done else None,
+        })
+    return summary
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def write_json(rows, summary, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({'trees': rows, 'aggregate': summary}, f, indent=2)
+
+def print_summary(summary):
+    print(f"  {'b':>6} {'d':>3}  {'engine':<22} {'trees':>5} {'errors':>6} {'agree':>6} {'nodes':>12} {'pruned':>7} {'time (ms)':>10}")
+    for entry in summary:
+        agree = f"{entry['agreement']:6.0%}" if entry['agreement'] is not None else f"{'-':>6}"
+        nodes = f"{entry['mean_nodes_visited']:12.1f}" if entry['mean_nodes_visited'] is not None else f"{'-':>12}"
+        pruned = f"{entry['mean_efficiency']:7.1%}" if entry['mean_efficiency'] is not None else f"{'-':>7}"
+        elapsed = f"{entry['mean_time_ms']:10.2f}" if entry['mean_time_ms'] is not None else f"{'-':>10}"
+        print(f"  {entry['branching'] or 0:>6} {entry['depth'] or 0:>3}  {entry['engine']:<22} {entry['trees']:>5} "
+              f"{entry['errors']:>6} {agree} {nodes} {pruned} {elapsed}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every search engine over a batch of trees and report agreement and pruning.")
+    parser.add_argument("--dir", help="directory of tree definition (.txt/.tree) and binary (.gtree) files")
+    parser.add_argument("--generate", nargs="+", default=[], metavar="SPEC",
+                        help="generated trees as BxD[,seed=N][,values=...][,ordering=...], e.g. 4x6,seed=1")
+    parser.add_argument("--seeds", type=int, default=1, help="generate each spec with this many consecutive seeds")
+    parser.add_argument("--depth", type=int, default=None, help="search depth limit")
+    parser.add_argument("--engines", nargs="+", choices=list(BATCH_ENGINES), default=None)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--csv", help="write one row per tree and engine to this CSV file")
+    parser.add_argument("--json", help="write the rows and the aggregate report to this JSON file")
+    args = parser.parse_args()
+
+    sources = [('file', path) for path in find_tree_files(args.dir)] if args.dir else []
+    for spec in args.generate:
+        kwargs = parse_generator_spec(spec)
+        first_seed = kwargs.pop('seed', 0)
+        sources += [('generate', dict(kwargs, seed=first_seed + i)) for i in range(args.seeds)]
+    if not sources:
+        parser.error("no trees: pass --dir and/or --generate")
+
+    rows = run_batch(sources, args.engines, args.depth, args.workers)
+    summary = aggregate_rows(rows)
+    print(f"{len(sources)} trees, {sum(row['error'] is not None for row in rows)} errors")
+    print_summary(summary)
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        write_json(rows, summary, args.json)
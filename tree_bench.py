@@ -0,0 +1,112 @@
+import argparse
+import math
+import random
+import time
+
+from game_tree import CompactTree, load_tree_binary, save_tree_binary
+from parallel_search import parallel_alpha_beta
+from tree_generator import VALUE_DISTRIBUTIONS, ORDERINGS, generate_tree
+from tree_search import (minimax_with_path, alpha_beta_with_path, minimax_compact, alpha_beta_compact,
+                         minimax_iterative, alpha_beta_iterative)
+from vector_search import HAVE_NUMPY, minimax_vectorized
+
+# Benchmarked engines: (tree preparation, minimax, alpha-beta)
+BENCH_ENGINES = {
+    "recursive": (None, minimax_with_path, alpha_beta_with_path),
+    "compact": (CompactTree.from_tree_data, minimax_compact, alpha_beta_compact),
+    "iterative": (None, minimax_iterative, alpha_beta_iterative),
+    "parallel": (CompactTree.from_tree_data, minimax_compact, parallel_alpha_beta),
+}
+if HAVE_NUMPY:
+    # Complete trees only, e.g. 10^7 leaves: --branching 10 --depth 7 --engines recursive vectorized
+    BENCH_ENGINES["vectorized"] = (CompactTree.from_tree_data, minimax_vectorized, alpha_beta_compact)
+
+
+# --- Benchmark Trees ---
+def build_uniform_tree(branching, depth, seed=0, values='uniform', ordering='random'):
+    """Complete tree with seeded random leaves, as a CompactTree (see tree_generator.generate_tree)."""
+    return generate_tree(branching, depth, seed=seed, values=values, ordering=ordering), "N0"
+
+def build_chain_tree(depth, seed=0):
+    """A spine of `depth` non-terminals, each with one leaf sibling - deeper than the recursion limit."""
+    rng = random.Random(seed)
+    tree = {}
+    for i in range(depth):
+        tree[f"C{i}"] = {'value': None, 'children': [f"C{i + 1}", f"L{i}"], 'is_terminal': False}
+        tree[f"L{i}"] = {'value': rng.randint(-100, 100), 'children': [], 'is_terminal': True}
+    tree[f"C{depth}"] = {'value': rng.randint(-100, 100), 'children': [], 'is_terminal': True}
+    return tree, "C0"
+
+
+# --- Runner ---
+def time_call(func, *args, repeat=3):
+    """Best wall time of `repeat` runs in seconds, plus the last result (or the exception raised).
+
+    ValueError covers engines that do not accept the tree, such as the vectorized one on an incomplete tree.
+    """
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        except (RecursionError, ValueError) as e:
+            return None, e
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_benchmark(tree, root, engines=None, repeat=3):
+    """Times each engine on `tree`, which may be in dict or CompactTree form."""
+    rows = []
+    tree_data = None if isinstance(tree, CompactTree) else tree
+    for name in engines or BENCH_ENGINES:
+        prepare_tree, run_minimax, run_alpha_beta = BENCH_ENGINES[name]
+        if prepare_tree == CompactTree.from_tree_data and isinstance(tree, CompactTree):
+            search_tree = tree
+        else:
+            if tree_data is None:
+                tree_data = tree.to_tree_data()  # Only built if a dict-based engine is asked for
+            search_tree = prepare_tree(tree_data) if prepare_tree else tree_data
+        mm_time, mm_result = time_call(run_minimax, root, search_tree, True, None, repeat=repeat)
+        ab_time, ab_result = time_call(run_alpha_beta, root, search_tree, -math.inf, math.inf, True, None, repeat=repeat)
+        rows.append((name, mm_time, ab_time, mm_result, ab_result))
+    return rows
+
+def print_report(title, rows):
+    print(title)
+    print(f"  {'engine':<12} {'minimax (s)':>14} {'alpha-beta (s)':>15}  value")
+    for name, mm_time, ab_time, mm_result, ab_result in rows:
+        mm_col = f"{mm_time:14.4f}" if mm_time is not None else f"{type(mm_result).__name__:>14}"
+        ab_col = f"{ab_time:15.4f}" if ab_time is not None else f"{type(ab_result).__name__:>15}"
+        value = mm_result[0] if mm_time is not None else (ab_result[0] if ab_time is not None else "-")
+        print(f"  {name:<12} {mm_col} {ab_col}  {value}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the minimax / alpha-beta engines.")
+    parser.add_argument("--branching", type=int, default=4, help="branching factor of the uniform tree")
+    parser.add_argument("--depth", type=int, default=8, help="depth of the uniform tree")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the uniform tree's leaf values")
+    parser.add_argument("--values", choices=list(VALUE_DISTRIBUTIONS), default="uniform", help="leaf value distribution")
+    parser.add_argument("--ordering", choices=ORDERINGS, default="random", help="child ordering of the uniform tree")
+    parser.add_argument("--chain-depth", type=int, default=5000, help="depth of the deep chain tree")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--engines", nargs="+", choices=list(BENCH_ENGINES), default=None)
+    parser.add_argument("--tree-file", help="benchmark a binary tree file (see game_tree.save_tree_binary) instead")
+    parser.add_argument("--save", help="write the generated uniform tree to this binary tree file")
+    args = parser.parse_args()
+
+    if args.tree_file:
+        tree = load_tree_binary(args.tree_file)
+        print_report(f"{args.tree_file} ({len(tree)} nodes)", run_benchmark(tree, tree.names[0], args.engines, args.repeat))
+        raise SystemExit
+
+    tree, root = build_uniform_tree(args.branching, args.depth, args.seed, args.values, args.ordering)
+    if args.save:
+        save_tree_binary(tree, args.save)
+    print_report(f"Uniform tree b={args.branching} d={args.depth} {args.ordering} ({len(tree)} nodes)",
+                 run_benchmark(tree, root, args.engines, args.repeat))
+    tree, root = build_chain_tree(args.chain_depth)
+    print_report(f"Chain tree depth={args.chain_depth} ({len(tree)} nodes)",
+                 run_benchmark(tree, root, args.engines, args.repeat))
@@ -0,0 +1,135 @@
+import math
+import random
+from array import array
+
+from game_tree import FLAG_TERMINAL, CompactTree, GeneratedNames, NodeExpander
+
+# Leaf value distributions: name -> function(rng, low, high) returning one value
+VALUE_DISTRIBUTIONS = {
+    'uniform': lambda rng, low, high: low + int(rng.random() * (high - low + 1)),
+    'normal': lambda rng, low, high: min(high, max(low, round(rng.gauss((low + high) / 2, (high - low) / 6)))),
+    'win-loss': lambda rng, low, high: high if rng.random() < 0.5 else low,
+}
+# Child orderings relative to the player to move
+ORDERINGS = ('random', 'best-first', 'worst-first')
+
+
+# --- Synthetic Trees ---
+def uniform_tree_size(branching, depth):
+    """Number of nodes in a complete tree with the given branching factor and depth."""
+    if branching == 1:
+        return depth + 1
+    return (branching ** (depth + 1) - 1) // (branching - 1)
+
+def generate_tree(branching, depth, seed=0, values='uniform', ordering='random', low=-100, high=100):
+    """Builds a complete game tree directly in CompactTree form.
+
+    Nodes are numbered level by level ('N0' is the root, a max node), leaf values
+    are drawn from VALUE_DISTRIBUTIONS[values] with a seeded RNG, so the same
+    arguments always give the same tree. With ordering='best-first' every
+    node's children are sorted so the minimax-best move for the player to move
+    comes first (alpha-beta's best case); 'worst-first' is the reverse.
+    Names are generated on demand, so memory is a few typed arrays whatever the
+    tree size.
+    """
+    if branching < 1 or depth < 0:
+        raise ValueError("Branching factor must be at least 1 and depth non-negative.")
+    if values not in VALUE_DISTRIBUTIONS:
+        raise ValueError(f"Unknown value distribution '{values}'. Choose from: {', '.join(VALUE_DISTRIBUTIONS)}.")
+    if ordering not in ORDERINGS:
+        raise ValueError(f"Unknown ordering '{ordering}'. Choose from: {', '.join(ORDERINGS)}.")
+    if low > high:
+        raise ValueError("Leaf value range is empty.")
+
+    rng = random.Random(seed)
+    draw = VALUE_DISTRIBUTIONS[values]
+    size = uniform_tree_size(branching, depth)
+    internal = size - branching ** depth  # Every level but the last
+
+    # Level order: the children of internal node i are ids i*b+1 .. i*b+b
+    child_start = array('i', range(0, internal * branching + 1, branching))
+    child_start.extend([internal * branching] * (size - internal))
+    child_ids = array('i', range(1, size))
+    flags = array('B', bytes(internal)) + array('B', [FLAG_TERMINAL]) * (size - internal)
+    values_array = array('d', bytes(8 * internal))
+    values_array.extend(draw(rng, low, high) for _ in range(size - internal))
+
+    if ordering != 'random' and internal:
+        _order_children(child_start, child_ids, values_array, internal, branching, depth, ordering == 'best-first')
+    return CompactTree(GeneratedNames(size), child_start, child_ids, values_array, flags)
+
+def _order_children(child_start, child_ids, leaf_values, internal, branching, depth, best_first):
+    """Sorts each internal node's child list by minimax value, bottom-up one level at a time."""
+    minimax = array('d', leaf_values)
+    level_end = internal
+    for level in range(depth - 1, -1, -1):
+        level_start = uniform_tree_size(branching, level - 1) if level else 0
+        is_max = level % 2 == 0
+        reverse = is_max == best_first  # Best first for max: highest value first
+        for node in range(level_start, level_end):
+            start, end = child_start[node], child_start[node + 1]
+            kids = sorted(child_ids[start:end], key=minimax.__getitem__, reverse=reverse)
+            child_ids[start:end] = array('i', kids)
+            best = kids[0] if best_first else kids[-1]
+            minimax[node] = minimax[best]
+        level_end = level_start
+
+
+# --- Implicit Synthetic Trees ---
+MASK64 = (1 << 64) - 1
+
+def _mix64(x):
+    """splitmix64 finalizer: a well-spread 64-bit hash of x."""
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & MASK64
+    return x ^ (x >> 31)
+
+class _LeafRandom:
+    """Counter-based stand-in for random.Random, so each leaf's value can be drawn on its own."""
+    __slots__ = ('state',)
+
+    def __init__(self, key):
+        self.state = key
+
+    def random(self):
+        self.state = (self.state + 0x9E3779B97F4A7C15) & MASK64
+        return (_mix64(self.state) >> 11) * (1.0 / (1 << 53))
+
+    def gauss(self, mu, sigma):
+        u1, u2 = 1.0 - self.random(), self.random()
+        return mu + sigma * math.sqrt(-2.0 * math.log(u1)) * math.cos(2.0 * math.pi * u2)
+
+class ImplicitUniformTree(NodeExpander):
+    """A complete seeded tree that is never stored: nodes are (level, index) pairs and leaf
+    values are a hash of (seed, index), so even trees with billions of nodes can be searched.
+    """
+
+    def __init__(self, branching, depth, seed=0, values='uniform', low=-100, high=100):
+        if branching < 1 or depth < 0:
+            raise ValueError("Branching factor must be at least 1 and depth non-negative.")
+        if values not in VALUE_DISTRIBUTIONS:
+            raise ValueError(f"Unknown value distribution '{values}'. Choose from: {', '.join(VALUE_DISTRIBUTIONS)}.")
+        self.branching = branching
+        self.depth = depth
+        self.seed = seed
+        self.low = low
+        self.high = high
+        self._draw = VALUE_DISTRIBUTIONS[values]
+        self.root = (0, 0)
+
+    def children(self, node):
+        level, index = node
+        if level >= self.depth:
+            return
+        first = index * self.branching
+        for k in range(self.branching):
+            yield (level + 1, first + k)
+
+    def is_terminal(self, node):
+        return node[0] >= self.depth
+
+    def evaluate(self, node):
+        if node[0] < self.depth:
+            return 0  # Heuristic score at the depth limit, as for tree_data
+        key = _mix64((self.seed * 0x9E3779B97F4A7C15 + node[1]) & MASK64)
+        return self._draw(_LeafRandom(key), self.low, self.high)
@@ -0,0 +1,1110 @@
+import collections
+import json
+import math
+import time
+from collections.abc import Mapping
+
+from game_tree import FLAG_TERMINAL, DictTree, py_value, static_value
+
+
+# --- Search Instrumentation ---
+class SearchStats:
+    """Counters filled in by a search when passed as `stats=`.
+
+    Depths are plies below the search root (the root is depth 0).
+    """
+
+    def __init__(self, algorithm="", subtree_index=None):
+        self.algorithm = algorithm
+        self.subtree_index = subtree_index  # game_tree.SubtreeIndex for sizing cutoffs without walking the pruned subtrees
+        self.nodes_expanded = 0    # Non-terminal nodes whose children were searched
+        self.leaves_evaluated = 0  # Terminal nodes plus nodes scored at the depth limit
+        self.max_depth = 0
+        self.cutoffs_by_depth = collections.Counter()
+        self.eliminated_by_depth = collections.Counter()  # Nodes in pruned subtrees, by depth of the cutoff
+        self.eliminated_sizes = collections.Counter()     # Eliminated subtree size -> number of cutoffs
+        self.eliminated_leaves_by_depth = collections.Counter()  # Leaves in pruned subtrees, by depth of the cutoff
+        self.re_searches = 0  # Extra passes: PVS re-searches, aspiration failures, MTD(f) passes
+        self.memory_hits = 0  # Nodes answered from a bound store or transposition table without searching them
+        self.elapsed_ns = 0
+
+    @property
+    def nodes_visited(self):
+        return self.nodes_expanded + self.leaves_evaluated
+
+    @property
+    def cutoffs(self):
+        return sum(self.cutoffs_by_depth.values())
+
+    @property
+    def eliminated_nodes(self):
+        return sum(self.eliminated_by_depth.values())
+
+    @property
+    def eliminated_leaves(self):
+        return sum(self.eliminated_leaves_by_depth.values())
+
+    def record_leaf(self, depth):
+        self.leaves_evaluated += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def record_expand(self, depth):
+        self.nodes_expanded += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def record_cutoff(self, depth, eliminated, eliminated_leaves=None):
+        """`eliminated` is the number of nodes skipped, or None when it is unknown (implicit trees)."""
+        if eliminated == 0:  # Cutoff on the last child - nothing was skipped
+            return
+        self.cutoffs_by_depth[depth] += 1
+        if eliminated is not None:
+            self.eliminated_by_depth[depth] += eliminated
+            self.eliminated_sizes[eliminated] += 1
+        if eliminated_leaves is not None:
+            self.eliminated_leaves_by_depth[depth] += eliminated_leaves
+
+    def merge(self, other):
+        """Adds the counters of another SearchStats (e.g. from a worker process) into this one."""
+        self.nodes_expanded += other.nodes_expanded
+        self.leaves_evaluated += other.leaves_evaluated
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.cutoffs_by_depth.update(other.cutoffs_by_depth)
+        self.eliminated_by_depth.update(other.eliminated_by_depth)
+        self.eliminated_sizes.update(other.eliminated_sizes)
+        self.eliminated_leaves_by_depth.update(other.eliminated_leaves_by_depth)
+        self.re_searches += other.re_searches
+        self.memory_hits += other.memory_hits
+
+    def to_dict(self):
+        return {
+            'algorithm': self.algorithm,
+            'nodes_visited': self.nodes_visited,
+            'nodes_expanded': self.nodes_expanded,
+            'leaves_evaluated': self.leaves_evaluated,
+            'max_depth': self.max_depth,
+            'cutoffs': self.cutoffs,
+            'eliminated_nodes': self.eliminated_nodes,
+            'eliminated_leaves': self.eliminated_leaves,
+            'cutoffs_by_depth': {str(d): n for d, n in sorted(self.cutoffs_by_depth.items())},
+            'eliminated_by_depth': {str(d): n for d, n in sorted(self.eliminated_by_depth.items())},
+            'eliminated_leaves_by_depth': {str(d): n for d, n in sorted(self.eliminated_leaves_by_depth.items())},
+            'eliminated_subtree_sizes': {str(size): n for size, n in sorted(self.eliminated_sizes.items())},
+            're_searches': self.re_searches,
+            'memory_hits': self.memory_hits,
+            'elapsed_ns': self.elapsed_ns,
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+def subtree_counts(tree, roots, index=None):
+    """(nodes, leaves) in the subtrees under `roots` of a dict tree (roots included).
+
+    Read from `index` (a game_tree.SubtreeIndex for this tree) when given,
+    otherwise counted by walking the subtrees.
+    """
+    if index is not None:
+        return index.counts(roots)
+    nodes = leaves = 0
+    stack = list(roots)
+    while stack:
+        children = tree[stack.pop()]['children']
+        nodes += 1
+        if children:
+            stack.extend(children)
+        else:
+            leaves += 1
+    return nodes, leaves
+
+def compact_subtree_counts(child_start, child_ids, roots, index=None):
+    """subtree_counts for CompactTree arrays; `index` is keyed by node id."""
+    if index is not None:
+        return index.counts(roots)
+    nodes = leaves = 0
+    stack = list(roots)
+    while stack:
+        node_id = stack.pop()
+        start, end = child_start[node_id], child_start[node_id + 1]
+        nodes += 1
+        if start < end:
+            stack.extend(child_ids[start:end])
+        else:
+            leaves += 1
+    return nodes, leaves
+
+# --- Algorithm Implementation ---
+# The principal variation is built as a chain of (node, rest) pairs: extending
+# it by one node is O(1), and unwind_pv turns it into a list once at the root
+# instead of copying `[node_name] + path` at every improvement on every level.
+def unwind_pv(pv):
+    path = []
+    while pv is not None:
+        path.append(pv[0])
+        pv = pv[1]
+    return path
+
+# Searches take an optional transposition table (`table`, a dict) so that a
+# subtree shared by several parents in a DAG is searched once. Entries are keyed
+# by node, side to move, remaining depth and, for alpha-beta, the search window,
+# so a hit returns exactly what searching the node again would.
+#
+# Where the depth limit stops a search at an internal node, the node is scored
+# by `evaluate(node_name, tree)` if given, otherwise by the tree's own score
+# (game_tree.static_value, the 'eval' value, for a tree_data dict).
+#
+# `trace` (a search_trace.TraceWriter) receives an event for every node
+# entered, leaf scored, best value improved, cutoff and node exited.
+#
+# A tree_data dict (or another mapping, such as a game_tree.CompactTreeData) is
+# searched through game_tree.DictTree, so dicts and other NodeExpanders share
+# one implementation. Children are pulled from
+# tree.children(node) one at a time and nothing is kept once a subtree is done,
+# so on an implicit tree memory grows with the search depth, not the tree size.
+def _as_expander(tree, evaluate, ordering=None):
+    """(NodeExpander, score for nodes the depth limit stops at) for a search over `tree`."""
+    expander = DictTree(tree) if isinstance(tree, Mapping) else tree
+    if ordering is not None and not isinstance(expander, DictTree):
+        raise ValueError("Move orderings need a tree_data dict.")
+    if evaluate is None:
+        return expander, expander.evaluate
+    return expander, lambda node: evaluate(node, tree)
+
+def minimax_with_path(node_name, tree, is_maximizing, depth=None, stats=None, table=None, evaluate=None, trace=None):
+    """Minimax over a tree_data dict, or over any game_tree.NodeExpander (expanded lazily)."""
+    tree, evaluate = _as_expander(tree, evaluate)
+    value, pv = _minimax_pv(node_name, tree, is_maximizing, depth, 0, stats, table, evaluate, trace)
+    return value, unwind_pv(pv)
+
+def _search_leaf(node_name, ply, stats, evaluate, trace):
+    """Scores a non-terminal node that turned out to have no children."""
+    if stats is not None:
+        stats.record_leaf(ply)
+    value = evaluate(node_name)
+    if trace is not None:
+        trace.leaf(node_name, ply, value)
+    return value, (node_name, None)
+
+def _minimax_pv(node_name, tree, is_maximizing, depth, ply, stats, table, evaluate, trace=None):
+    # Base case: terminal node or depth limit reached
+    terminal = tree.is_terminal(node_name)
+    if terminal or (depth is not None and depth <= 0):
+        if stats is not None:
+            stats.record_leaf(ply)
+        value = tree.evaluate(node_name) if terminal else evaluate(node_name)
+        if trace is not None:
+            trace.leaf(node_name, ply, value)
+        return value, (node_name, None)
+    if table is not None:
+        key = (node_name, is_maximizing, depth)
+        entry = table.get(key)
+        if entry is not None:
+            if stats is not None:
+                stats.memory_hits += 1
+            if trace is not None:
+                trace.leaf(node_name, ply, entry[0])
+            return entry
+    children = tree.children(node_name)
+    if not isinstance(children, (list, tuple)):
+        children = list(children)  # Minimax visits every child anyway
+    if not children:  # Non-terminal with no children
+        return _search_leaf(node_name, ply, stats, evaluate, trace)
+    if stats is not None:
+        stats.record_expand(ply)
+    if trace is not None:
+        trace.enter(node_name, ply)
+
+    next_depth = None if depth is None else depth - 1
+    best_value, best_pv = _minimax_pv(children[0], tree, not is_maximizing, next_depth, ply + 1, stats, table, evaluate, trace)
+    best_pv = (node_name, best_pv)
+    if trace is not None:
+        trace.update(node_name, ply, best_value)
+    for child in children[1:]:
+        value, pv = _minimax_pv(child, tree, not is_maximizing, next_depth, ply + 1, stats, table, evaluate, trace)
+        if value > best_value if is_maximizing else value < best_value:
+            best_value = value
+            best_pv = (node_name, pv)
+            if trace is not None:
+                trace.update(node_name, ply, best_value)
+
+    if table is not None:
+        table[key] = (best_value, best_pv)
+    if trace is not None:
+        trace.exit(node_name, ply, best_value)
+    return best_value, best_pv
+
+def alpha_beta_with_path(node_name, tree, alpha, beta, is_maximizing, depth=None, pruned_info=None, stats=None, ordering=None,
+                         table=None, evaluate=None, trace=None):
+    """Alpha-beta search; `ordering` is an optional MoveOrdering (tree_data dicts only) that decides the order children are tried in."""
+    if pruned_info is None:
+        pruned_info = {"count": 0, "nodes": []}
+    tree, evaluate = _as_expander(tree, evaluate, ordering)
+    value, pv = _alpha_beta_pv(node_name, tree, alpha, beta, is_maximizing, depth, pruned_info, 0, stats, ordering, table, evaluate,
+                               trace)
+    return value, unwind_pv(pv), pruned_info
+
+def _skipped_counts(tree, roots, index):
+    """(nodes, leaves) under the children a cutoff skipped; None, None where the tree cannot tell cheaply."""
+    if index is not None:
+        return index.counts(roots)
+    if isinstance(tree, DictTree):
+        return subtree_counts(tree.tree_data, roots)
+    return None, None
+
+def _alpha_beta_pv(node_name, tree, alpha, beta, is_maximizing, depth, pruned_info, ply, stats, ordering, table, evaluate,
+                   trace=None):
+    # Base case: terminal node or depth limit reached
+    terminal = tree.is_terminal(node_name)
+    if terminal or (depth is not None and depth <= 0):
+        if stats is not None:
+            stats.record_leaf(ply)
+        value = tree.evaluate(node_name) if terminal else evaluate(node_name)
+        if trace is not None:
+            trace.leaf(node_name, ply, value)
+        return value, (node_name, None)
+    if table is not None:
+        key = (node_name, is_maximizing, depth, alpha, beta)
+        entry = table.get(key)
+        if entry is not None:
+            if stats is not None:
+                stats.memory_hits += 1
+            if trace is not None:
+                trace.leaf(node_name, ply, entry[0])
+            return entry
+    children = tree.children(node_name)
+    if not children:  # Non-terminal with no children (a generator is only found empty below)
+        return _search_leaf(node_name, ply, stats, evaluate, trace)
+    if ordering is not None:
+        children = ordering.order(node_name, children, tree.tree_data, is_maximizing, ply, depth)
+
+    next_depth = None if depth is None else depth - 1
+    best_value = -math.inf if is_maximizing else math.inf
+    best_pv = None
+    for i, child in enumerate(children):
+        if best_pv is None:  # First child: the node is expanded
+            if stats is not None:
+                stats.record_expand(ply)
+            if trace is not None:
+                trace.enter(node_name, ply, alpha, beta)
+        value, pv = _alpha_beta_pv(child, tree, alpha, beta, not is_maximizing, next_depth, pruned_info, ply + 1, stats,
+                                   ordering, table, evaluate, trace)
+        if best_pv is None or (value > best_value if is_maximizing else value < best_value):
+            best_value = value
+            best_pv = (node_name, pv)
+            if is_maximizing:
+                alpha = max(alpha, best_value)
+            else:
+                beta = min(beta, best_value)
+            if trace is not None:
+                trace.update(node_name, ply, best_value, alpha, beta)
+            if beta <= alpha:
+                # Cutoff - prune the remaining children. They are only listed when the
+                # children came as a sequence; a generator is left unconsumed, so the
+                # skipped moves are never even generated (and their number is unknown)
+                if isinstance(children, (list, tuple)):
+                    remaining = children[i + 1:]
+                    pruned_info["count"] += len(remaining)
+                    pruned_info["nodes"].extend(remaining)
+                    if remaining:  # A cutoff on the last child skips nothing
+                        if stats is not None:
+                            stats.record_cutoff(ply, *_skipped_counts(tree, remaining, stats.subtree_index))
+                        if trace is not None:
+                            trace.cutoff(node_name, ply, len(remaining), alpha, beta)
+                elif stats is not None:
+                    stats.record_cutoff(ply, None)
+                if ordering is not None:
+                    ordering.record_cutoff(node_name, child, tree.tree_data, ply, depth)
+                break
+    if best_pv is None:  # A generator with no moves
+        return _search_leaf(node_name, ply, stats, evaluate, trace)
+
+    if table is not None:
+        table[key] = (best_value, best_pv)
+    if trace is not None:
+        trace.exit(node_name, ply, best_value)
+    return best_value, best_pv
+
+# --- Move Ordering ---
+# Alpha-beta prunes most when the best child is tried first. A MoveOrdering
+# reorders each node's children before they are searched and is told which
+# child caused each cutoff. Node names are unique in these trees, so killer and
+# history tables are keyed by move slot (the child's position in the
+# definition), the explicit-tree counterpart of a move in a real game.
+class MoveOrdering:
+    """Keeps children in definition order; subclasses override order()."""
+    name = "Definition order"
+
+    def __init__(self):
+        self.nodes_examined = 0  # Extra nodes looked at to decide the order
+
+    def order(self, node_name, children, tree, is_maximizing, ply, depth):
+        return children
+
+    def record_cutoff(self, node_name, child, tree, ply, depth):
+        pass
+
+def _move_slot(tree, node_name, child):
+    return tree[node_name]['children'].index(child)
+
+class StaticValueOrdering(MoveOrdering):
+    """Tries first the children with the best leaf value reachable within `lookahead` plies."""
+    name = "Static value"
+
+    def __init__(self, lookahead=1):
+        super().__init__()
+        self.lookahead = lookahead
+
+    def order(self, node_name, children, tree, is_maximizing, ply, depth):
+        best = max if is_maximizing else min
+        def estimate(name, plies):
+            self.nodes_examined += 1
+            node = tree[name]
+            if node['is_terminal'] or plies <= 0 or not node['children']:
+                return static_value(node)  # Same heuristic as the depth limit
+            return best(estimate(child, plies - 1) for child in node['children'])
+        return sorted(children, key=lambda child: estimate(child, self.lookahead - 1), reverse=is_maximizing)
+
+class KillerMoveOrdering(MoveOrdering):
+    """Tries first the move slots that recently caused a cutoff at the same ply."""
+    name = "Killer moves"
+
+    def __init__(self, slots=2):
+        super().__init__()
+        self.slots = slots
+        self.killers = collections.defaultdict(list)  # ply -> most recent cutoff slots first
+
+    def order(self, node_name, children, tree, is_maximizing, ply, depth):
+        killers = [slot for slot in self.killers.get(ply, ()) if slot < len(children)]
+        if not killers:
+            return children
+        return [children[slot] for slot in killers] + [c for i, c in enumerate(children) if i not in killers]
+
+    def record_cutoff(self, node_name, child, tree, ply, depth):
+        slot = _move_slot(tree, node_name, child)
+        killers = self.killers[ply]
+        if slot in killers:
+            killers.remove(slot)
+        killers.insert(0, slot)
+        del killers[self.slots:]
+
+class HistoryOrdering(MoveOrdering):
+    """Orders move slots by how often (weighted by remaining depth) they caused cutoffs anywhere in the tree."""
+    name = "History heuristic"
+
+    def __init__(self):
+        super().__init__()
+        self.history = collections.Counter()  # move slot -> score
+
+    def order(self, node_name, children, tree, is_maximizing, ply, depth):
+        if not self.history:
+            return children
+        slots = sorted(range(len(children)), key=lambda slot: -self.history[slot])
+        return [children[slot] for slot in slots]
+
+    def record_cutoff(self, node_name, child, tree, ply, depth):
+        self.history[_move_slot(tree, node_name, child)] += 1 if depth is None else depth * depth
+
+class ShallowSearchOrdering(MoveOrdering):
+    """Orders children by the values of a depth-limited minimax pass over each of them."""
+    name = "Shallow search"
+
+    def __init__(self, depth=2):
+        super().__init__()
+        self.depth = depth
+
+    def order(self, node_name, children, tree, is_maximizing, ply, depth):
+        shallow_depth = self.depth if depth is None else min(self.depth, depth - 1)
+        stats = SearchStats()
+        scores = {child: minimax_with_path(child, tree, not is_maximizing, shallow_depth, stats)[0] for child in children}
+        self.nodes_examined += stats.nodes_visited
+        return sorted(children, key=scores.__getitem__, reverse=is_maximizing)
+
+def search_shape(tree, root, depth=None):
+    """Returns (average branching factor, depth) of the part of the tree a search from `root` covers."""
+    internal = edges = max_depth = 0
+    stack = [(root, 0)]
+    while stack:
+        name, level = stack.pop()
+        node = tree[name]
+        max_depth = max(max_depth, level)
+        if node['is_terminal'] or not node['children'] or (depth is not None and level >= depth):
+            continue
+        internal += 1
+        edges += len(node['children'])
+        stack.extend((child, level + 1) for child in node['children'])
+    return (edges / internal if internal else 0), max_depth
+
+def best_case_leaves(branching, depth):
+    """Knuth-Moore minimum leaf count for alpha-beta on a uniform tree: b^ceil(d/2) + b^floor(d/2) - 1."""
+    if depth <= 0 or branching <= 0:
+        return 1
+    return round(branching ** math.ceil(depth / 2) + branching ** (depth // 2) - 1)
+
+# --- Iterative Deepening ---
+# An anytime driver: alpha-beta to depth 1, 2, 3, ... with each iteration
+# trying the previous one's principal variation first, stopping at a
+# wall-clock deadline with the result of the deepest iteration that finished.
+class SearchTimeout(Exception):
+    """Raised from inside a search whose deadline has passed."""
+
+class PVFirstOrdering(MoveOrdering):
+    """Searches a known principal variation first and aborts the search once `deadline` (perf_counter) passes."""
+    name = "Previous PV first"
+
+    def __init__(self, pv=(), deadline=None):
+        super().__init__()
+        self.pv = list(pv)
+        self.deadline = deadline
+
+    def order(self, node_name, children, tree, is_maximizing, ply, depth):
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+        if ply + 1 < len(self.pv) and self.pv[ply] == node_name:
+            move = self.pv[ply + 1]
+            if move in children:
+                return [move] + [child for child in children if child != move]
+        return children
+
+def iterative_deepening(node_name, tree, is_maximizing=True, max_depth=None, time_limit=None, evaluate=None, stats=None):
+    """Alpha-beta over a tree_data dict to increasing depths until `max_depth`, the bottom
+    of the tree or `time_limit` seconds.
+
+    Returns (value, path, depth) from the deepest iteration that completed.
+    The first iteration always runs to the end so there is a move to return;
+    later ones are abandoned as soon as the deadline passes.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    cut_off = False  # Whether the current iteration stopped anywhere above the bottom of the tree
+
+    def evaluate_at_limit(name, tree):
+        nonlocal cut_off
+        if tree[name]['children']:
+            cut_off = True
+        return evaluate(name, tree) if evaluate is not None else static_value(tree[name])
+
+    value, path, completed = None, [node_name], None
+    depth = 1 if max_depth is None else min(1, max_depth)
+    while max_depth is None or depth <= max_depth:
+        cut_off = False
+        ordering = PVFirstOrdering(path, None if completed is None else deadline)
+        try:
+            value, path, _ = alpha_beta_with_path(node_name, tree, -math.inf, math.inf, is_maximizing, depth=depth,
+                                                  stats=stats, ordering=ordering, evaluate=evaluate_at_limit)
+        except SearchTimeout:
+            break
+        finally:
+            if stats is not None and completed is not None:
+                stats.re_searches += 1
+        completed = depth
+        if not cut_off:
+            break  # The whole tree has been searched; going deeper changes nothing
+        depth += 1
+    return value, path, completed
+
+# --- Compact Tree Variants ---
+# Same algorithms as above, run on a game_tree.CompactTree. Nodes are integer
+# ids, so each step is a few array reads instead of string-keyed dict lookups.
+def minimax_compact(node_name, tree, is_maximizing, depth=None, stats=None):
+    """minimax_with_path on a CompactTree. `node_name` may also be a node id."""
+    root_id = tree.node_id(node_name) if isinstance(node_name, str) else node_name
+    value, pv = _minimax_compact(tree.child_start, tree.child_ids, tree.values, tree.flags,
+                                 root_id, is_maximizing, depth, 0, stats)
+    names = tree.names
+    return py_value(value), [names[i] for i in unwind_pv(pv)]
+
+def _minimax_compact(child_start, child_ids, values, flags, node_id, is_maximizing, depth, ply, stats):
+    start, end = child_start[node_id], child_start[node_id + 1]
+    terminal = flags[node_id] & FLAG_TERMINAL
+    if terminal or (depth is not None and depth <= 0) or start == end:
+        if stats is not None:
+            stats.record_leaf(ply)
+        return values[node_id], (node_id, None)
+    if stats is not None:
+        stats.record_expand(ply)
+
+    next_depth = None if depth is None else depth - 1
+    best_pv = None
+    if is_maximizing:
+        best_value = -math.inf
+        for k in range(start, end):
+            value, pv = _minimax_compact(child_start, child_ids, values, flags, child_ids[k], False, next_depth, ply + 1, stats)
+            if value > best_value:
+                best_value = value
+                best_pv = (node_id, pv)
+    else:
+        best_value = math.inf
+        for k in range(start, end):
+            value, pv = _minimax_compact(child_start, child_ids, values, flags, child_ids[k], True, next_depth, ply + 1, stats)
+            if value < best_value:
+                best_value = value
+                best_pv = (node_id, pv)
+
+    return best_value, best_pv
+
+def alpha_beta_compact(node_name, tree, alpha, beta, is_maximizing, depth=None, pruned_info=None, stats=None):
+    """alpha_beta_with_path on a CompactTree. `node_name` may also be a node id."""
+    if pruned_info is None:
+        pruned_info = {"count": 0, "nodes": []}
+    root_id = tree.node_id(node_name) if isinstance(node_name, str) else node_name
+    pruned_ids = []
+    value, pv = _alpha_beta_compact(tree.child_start, tree.child_ids, tree.values, tree.flags,
+                                    root_id, alpha, beta, is_maximizing, depth, pruned_ids, 0, stats)
+    names = tree.names
+    pruned_info["count"] += len(pruned_ids)
+    pruned_info["nodes"].extend(names[i] for i in pruned_ids)
+    return py_value(value), [names[i] for i in unwind_pv(pv)], pruned_info
+
+def _alpha_beta_compact(child_start, child_ids, values, flags, node_id, alpha, beta, is_maximizing, depth, pruned_ids, ply, stats):
+    start, end = child_start[node_id], child_start[node_id + 1]
+    terminal = flags[node_id] & FLAG_TERMINAL
+    if terminal or (depth is not None and depth <= 0) or start == end:
+        if stats is not None:
+            stats.record_leaf(ply)
+        return values[node_id], (node_id, None)
+    if stats is not None:
+        stats.record_expand(ply)
+
+    next_depth = None if depth is None else depth - 1
+    best_pv = None
+    if is_maximizing:
+        best_value = -math.inf
+        for k in range(start, end):
+            value, pv = _alpha_beta_compact(child_start, child_ids, values, flags, child_ids[k],
+                                            alpha, beta, False, next_depth, pruned_ids, ply + 1, stats)
+            if value > best_value:
+                best_value = value
+                best_pv = (node_id, pv)
+            alpha = max(alpha, best_value)
+            if beta <= alpha:
+                pruned_ids.extend(child_ids[k + 1:end])  # Beta cutoff
+                if stats is not None:
+                    stats.record_cutoff(ply, *compact_subtree_counts(child_start, child_ids, child_ids[k + 1:end],
+                                                                      stats.subtree_index))
+                break
+    else:
+        best_value = math.inf
+        for k in range(start, end):
+            value, pv = _alpha_beta_compact(child_start, child_ids, values, flags, child_ids[k],
+                                            alpha, beta, True, next_depth, pruned_ids, ply + 1, stats)
+            if value < best_value:
+                best_value = value
+                best_pv = (node_id, pv)
+            beta = min(beta, best_value)
+            if beta <= alpha:
+                pruned_ids.extend(child_ids[k + 1:end])  # Alpha cutoff
+                if stats is not None:
+                    stats.record_cutoff(ply, *compact_subtree_counts(child_start, child_ids, child_ids[k + 1:end],
+                                                                      stats.subtree_index))
+                break
+
+    return best_value, best_pv
+
+# --- Iterative (Explicit Stack) Variants ---
+# Same results as minimax_with_path / alpha_beta_with_path, but the recursion
+# is replaced by a list of frames, so tree depth is not bounded by Python's
+# recursion limit. Paths are collected leaf-first and reversed once at the root.
+def minimax_iterative(node_name, tree, is_maximizing, depth=None, stats=None):
+    # Frame: [name, children, next_child, is_maximizing, child_depth, best_value, best_path_reversed]
+    stack = []
+    pending = (node_name, is_maximizing, depth)
+    while True:
+        name, is_max, d = pending
+        node = tree[name]
+        children = node['children']
+        if node['is_terminal'] or (d is not None and d <= 0) or not children:
+            if stats is not None:
+                stats.record_leaf(len(stack))
+            value, rev_path = static_value(node), [name]
+        else:
+            if stats is not None:
+                stats.record_expand(len(stack))
+            stack.append([name, children, 0, is_max, None if d is None else d - 1,
+                          -math.inf if is_max else math.inf, None])
+            pending = (children[0], not is_max, None if d is None else d - 1)
+            continue
+
+        # Hand the finished child's result up until some frame has children left
+        while stack:
+            frame = stack[-1]
+            if (value > frame[5]) if frame[3] else (value < frame[5]):
+                frame[5] = value
+                frame[6] = rev_path
+            frame[2] += 1
+            if frame[2] < len(frame[1]):
+                pending = (frame[1][frame[2]], not frame[3], frame[4])
+                break
+            stack.pop()
+            value, rev_path = frame[5], frame[6]
+            if rev_path is None:
+                rev_path = []
+            else:
+                rev_path.append(frame[0])
+        else:
+            rev_path.reverse()
+            return value, rev_path
+
+def alpha_beta_iterative(node_name, tree, alpha, beta, is_maximizing, depth=None, pruned_info=None, stats=None):
+    if pruned_info is None:
+        pruned_info = {"count": 0, "nodes": []}
+
+    # Frame: [name, children, next_child, is_maximizing, child_depth, best_value, best_path_reversed, alpha, beta]
+    stack = []
+    pending = (node_name, is_maximizing, depth, alpha, beta)
+    while True:
+        name, is_max, d, a, b = pending
+        node = tree[name]
+        children = node['children']
+        if node['is_terminal'] or (d is not None and d <= 0) or not children:
+            if stats is not None:
+                stats.record_leaf(len(stack))
+            value, rev_path = static_value(node), [name]
+        else:
+            if stats is not None:
+                stats.record_expand(len(stack))
+            stack.append([name, children, 0, is_max, None if d is None else d - 1,
+                          -math.inf if is_max else math.inf, None, a, b])
+            pending = (children[0], not is_max, None if d is None else d - 1, a, b)
+            continue
+
+        while stack:
+            frame = stack[-1]
+            children = frame[1]
+            i = frame[2]
+            if frame[3]:
+                if value > frame[5]:
+                    frame[5] = value
+                    frame[6] = rev_path
+                frame[7] = max(frame[7], frame[5])
+            else:
+                if value < frame[5]:
+                    frame[5] = value
+                    frame[6] = rev_path
+                frame[8] = min(frame[8], frame[5])
+            cutoff = frame[8] <= frame[7]
+            if cutoff:
+                # Beta cutoff (max) / alpha cutoff (min) - prune remaining children
+                pruned_info["count"] += len(children) - (i + 1)
+                pruned_info["nodes"].extend(children[i + 1:])
+                if stats is not None:
+                    stats.record_cutoff(len(stack) - 1, *subtree_counts(tree, children[i + 1:], stats.subtree_index))
+            elif i + 1 < len(children):
+                frame[2] = i + 1
+                pending = (children[i + 1], not frame[3], frame[4], frame[7], frame[8])
+                break
+            stack.pop()
+            value, rev_path = frame[5], frame[6]
+            if rev_path is None:
+                rev_path = []
+            else:
+                rev_path.append(frame[0])
+        else:
+            rev_path.reverse()
+            return value, rev_path, pruned_info
+
+# --- Negamax Family ---
+# These engines search in negamax form: every node maximizes from the point of
+# view of the side to move (`color` is +1 for the root's max player, -1 for
+# min), with fail-soft alpha-beta bounds. The public functions take the same
+# leading arguments as minimax_with_path and return (value, path) from the
+# root's perspective.
+NULL_WINDOW = 1          # Width of the zero window used by PVS and MTD(f)
+ASPIRATION_DELTA = 10    # Initial half-width of the aspiration window
+
+def _negamax_pv(node_name, tree, alpha, beta, color, depth, ply, stats):
+    node = tree[node_name]
+    children = node['children']
+    if node['is_terminal'] or (depth is not None and depth <= 0) or not children:
+        if stats is not None:
+            stats.record_leaf(ply)
+        return color * static_value(node), (node_name, None)
+    if stats is not None:
+        stats.record_expand(ply)
+
+    next_depth = None if depth is None else depth - 1
+    best_value = -math.inf
+    best_pv = None
+    for i, child in enumerate(children):
+        value, pv = _negamax_pv(child, tree, -beta, -alpha, -color, next_depth, ply + 1, stats)
+        value = -value
+        if value > best_value:
+            best_value = value
+            best_pv = (node_name, pv)
+        if best_value > alpha:
+            alpha = best_value
+        if alpha >= beta:
+            if stats is not None:
+                stats.record_cutoff(ply, *subtree_counts(tree, children[i + 1:], stats.subtree_index))
+            break
+    return best_value, best_pv
+
+def negamax_with_path(node_name, tree, is_maximizing=True, depth=None, alpha=-math.inf, beta=math.inf, stats=None):
+    """Fail-soft alpha-beta in negamax form."""
+    color = 1 if is_maximizing else -1
+    value, pv = _negamax_pv(node_name, tree, -beta if color < 0 else alpha, -alpha if color < 0 else beta,
+                            color, depth, 0, stats)
+    return color * value, unwind_pv(pv)
+
+def _pvs_pv(node_name, tree, alpha, beta, color, depth, ply, stats):
+    node = tree[node_name]
+    children = node['children']
+    if node['is_terminal'] or (depth is not None and depth <= 0) or not children:
+        if stats is not None:
+            stats.record_leaf(ply)
+        return color * static_value(node), (node_name, None)
+    if stats is not None:
+        stats.record_expand(ply)
+
+    next_depth = None if depth is None else depth - 1
+    best_value = -math.inf
+    best_pv = None
+    for i, child in enumerate(children):
+        if i == 0 or alpha == -math.inf:
+            value, pv = _pvs_pv(child, tree, -beta, -alpha, -color, next_depth, ply + 1, stats)
+            value = -value
+        else:
+            # Zero-window test: can this child beat the current best?
+            value, pv = _pvs_pv(child, tree, -alpha - NULL_WINDOW, -alpha, -color, next_depth, ply + 1, stats)
+            value = -value
+            if alpha < value < beta:
+                if stats is not None:
+                    stats.re_searches += 1
+                value, pv = _pvs_pv(child, tree, -beta, -value, -color, next_depth, ply + 1, stats)
+                value = -value
+        if value > best_value:
+            best_value = value
+            best_pv = (node_name, pv)
+        if best_value > alpha:
+            alpha = best_value
+        if alpha >= beta:
+            if stats is not None:
+                stats.record_cutoff(ply, *subtree_counts(tree, children[i + 1:], stats.subtree_index))
+            break
+    return best_value, best_pv
+
+def pvs_with_path(node_name, tree, is_maximizing=True, depth=None, alpha=-math.inf, beta=math.inf, stats=None):
+    """Principal variation search (NegaScout): full window for the first child, zero windows for the rest."""
+    color = 1 if is_maximizing else -1
+    value, pv = _pvs_pv(node_name, tree, -beta if color < 0 else alpha, -alpha if color < 0 else beta,
+                        color, depth, 0, stats)
+    return color * value, unwind_pv(pv)
+
+def aspiration_search(node_name, tree, is_maximizing=True, depth=None, guess=0, delta=ASPIRATION_DELTA, stats=None):
+    """PVS inside a window of +/-delta around `guess`, widened and re-searched when the result falls outside."""
+    color = 1 if is_maximizing else -1
+    alpha, beta = color * guess - delta, color * guess + delta
+    failures = 0
+    while True:
+        value, pv = _pvs_pv(node_name, tree, alpha, beta, color, depth, 0, stats)
+        if alpha < value < beta or (alpha == -math.inf and beta == math.inf):
+            return color * value, unwind_pv(pv)
+        # Fail low / fail high: the true value lies beyond `value`, so widen on that side
+        failures += 1
+        delta *= 2
+        if stats is not None:
+            stats.re_searches += 1
+        if value <= alpha:
+            alpha = -math.inf if failures > 2 else value - delta
+        else:
+            beta = math.inf if failures > 2 else value + delta
+
+def _alpha_beta_memory(node_name, tree, alpha, beta, color, depth, ply, memory, stats):
+    node = tree[node_name]
+    children = node['children']
+    if node['is_terminal'] or (depth is not None and depth <= 0) or not children:
+        if stats is not None:
+            stats.record_leaf(ply)
+        return color * static_value(node)
+
+    key = (node_name, color, depth)
+    entry = memory.get(key)
+    if entry is not None:
+        lower, upper, _ = entry
+        if lower >= beta or upper <= alpha or lower == upper:
+            if stats is not None:
+                stats.memory_hits += 1
+            return lower if lower >= beta or lower == upper else upper
+        alpha = max(alpha, lower)
+        beta = min(beta, upper)
+    if stats is not None:
+        stats.record_expand(ply)
+
+    original_alpha, original_beta = alpha, beta
+    next_depth = None if depth is None else depth - 1
+    best_value = -math.inf
+    best_child = None
+    for i, child in enumerate(children):
+        value = -_alpha_beta_memory(child, tree, -beta, -alpha, -color, next_depth, ply + 1, memory, stats)
+        if value > best_value:
+            best_value = value
+            best_child = child
+        if best_value > alpha:
+            alpha = best_value
+        if alpha >= beta:
+            if stats is not None:
+                stats.record_cutoff(ply, *subtree_counts(tree, children[i + 1:], stats.subtree_index))
+            break
+
+    # Store what this search proved about the node
+    lower, upper, stored_child = entry if entry is not None else (-math.inf, math.inf, None)
+    if best_value <= original_alpha:
+        upper = best_value
+    elif best_value >= original_beta:
+        lower = best_value
+        stored_child = best_child
+    else:
+        lower = upper = best_value
+        stored_child = best_child
+    memory[key] = (lower, upper, stored_child)
+    return best_value
+
+def mtdf_with_path(node_name, tree, is_maximizing=True, depth=None, first_guess=0, memory=None, stats=None):
+    """MTD(f): a sequence of zero-window alpha-beta searches backed by a bound store.
+
+    `memory` maps (node, side to move, remaining depth) to (lower bound, upper
+    bound, best child); pass the same dict in again to reuse bounds from an
+    earlier search.
+    """
+    if memory is None:
+        memory = {}
+    color = 1 if is_maximizing else -1
+    g = color * first_guess
+    lower, upper = -math.inf, math.inf
+    passes = 0
+    while lower < upper:
+        beta = g + NULL_WINDOW if g == lower else g
+        g = _alpha_beta_memory(node_name, tree, beta - NULL_WINDOW, beta, color, depth, 0, memory, stats)
+        if g < beta:
+            upper = g
+        else:
+            lower = g
+        passes += 1
+    if stats is not None:
+        stats.re_searches += passes - 1
+    return color * g, _memory_pv(node_name, color, depth, memory)
+
+def _memory_pv(node_name, color, depth, memory):
+    """Follows the best children recorded in an MTD(f) bound store."""
+    path = [node_name]
+    while True:
+        entry = memory.get((node_name, color, depth))
+        if entry is None or entry[2] is None:
+            return path
+        node_name = entry[2]
+        color = -color
+        depth = None if depth is None else depth - 1
+        path.append(node_name)
+
+# --- Expectiminimax ---
+# Chance nodes (tree_data nodes with a 'chance' list of probabilities) are worth
+# the probability-weighted mean of their children. They do not change the side
+# to move: a chance node reached with is_maximizing=True leads to MAX nodes.
+# The path through a chance node follows its most likely outcome.
+def leaf_value_bounds(tree, depth=None):
+    """(lowest, highest) value a leaf of a dict tree can return, for Star1/Star2 pruning."""
+    values = [static_value(node) for node in tree.values()
+              if node['is_terminal'] or depth is not None or not node['children']]
+    return (min(values), max(values)) if values else (0, 0)
+
+def _likeliest(probabilities):
+    return max(range(len(probabilities)), key=probabilities.__getitem__)
+
+def expectiminimax_with_path(node_name, tree, is_maximizing=True, depth=None, stats=None):
+    """Full expectiminimax over a dict tree with chance nodes; returns (value, path)."""
+    value, pv = _expectiminimax_pv(node_name, tree, is_maximizing, depth, 0, stats)
+    return value, unwind_pv(pv)
+
+def _expectiminimax_pv(node_name, tree, is_maximizing, depth, ply, stats):
+    node = tree[node_name]
+    children = node['children']
+    if node['is_terminal'] or (depth is not None and depth <= 0) or not children:
+        if stats is not None:
+            stats.record_leaf(ply)
+        return static_value(node), (node_name, None)
+    if stats is not None:
+        stats.record_expand(ply)
+    next_depth = None if depth is None else depth - 1
+
+    probabilities = node.get('chance')
+    if probabilities is not None:
+        likeliest = _likeliest(probabilities)
+        expected = 0
+        for i, child in enumerate(children):
+            value, pv = _expectiminimax_pv(child, tree, is_maximizing, next_depth, ply + 1, stats)
+            expected += probabilities[i] * value
+            if i == likeliest:
+                best_pv = (node_name, pv)
+        return expected, best_pv
+
+    best_value = -math.inf if is_maximizing else math.inf
+    best_pv = None
+    for child in children:
+        value, pv = _expectiminimax_pv(child, tree, not is_maximizing, next_depth, ply + 1, stats)
+        if value > best_value if is_maximizing else value < best_value:
+            best_value = value
+            best_pv = (node_name, pv)
+    return best_value, best_pv
+
+def star1_with_path(node_name, tree, is_maximizing=True, depth=None, bounds=None, stats=None):
+    """Expectiminimax with Ballard's Star1 pruning at chance nodes.
+
+    `bounds` is (lowest, highest) leaf value (leaf_value_bounds by default):
+    after some outcomes of a chance node are searched, the rest are assumed to
+    lie within them, which bounds the node's value and narrows the window
+    each remaining outcome is searched with. Returns (value, path).
+    """
+    if bounds is None:
+        bounds = leaf_value_bounds(tree, depth)
+    value, pv = _star_pv(node_name, tree, -math.inf, math.inf, is_maximizing, depth, bounds, None, 0, stats)
+    return value, unwind_pv(pv)
+
+def star2_with_path(node_name, tree, is_maximizing=True, depth=None, bounds=None, memory=None, stats=None):
+    """Star1 plus Star2 probing: before a chance node's outcomes are searched in full,
+    the first move of each one is searched to bound it (a lower bound under MAX,
+    an upper bound under MIN), which can cut the chance node off after a few
+    probes and tightens the Star1 windows otherwise.
+
+    Probed moves are searched again by the full pass, so results go into the
+    bound store `memory` ((node, is_maximizing, depth) -> (lower, upper, pv),
+    shared between calls if given). Returns (value, path).
+    """
+    if bounds is None:
+        bounds = leaf_value_bounds(tree, depth)
+    if memory is None:
+        memory = {}
+    value, pv = _star_pv(node_name, tree, -math.inf, math.inf, is_maximizing, depth, bounds, memory, 0, stats)
+    return value, unwind_pv(pv)
+
+def _star_pv(node_name, tree, alpha, beta, is_maximizing, depth, bounds, memory, ply, stats):
+    """Star1 search of a node, with Star2 probing and a bound store when `memory` is a dict."""
+    node = tree[node_name]
+    children = node['children']
+    if node['is_terminal'] or (depth is not None and depth <= 0) or not children:
+        if stats is not None:
+            stats.record_leaf(ply)
+        return static_value(node), (node_name, None)
+    if memory is not None:
+        key = (node_name, is_maximizing, depth)
+        lower, upper, stored_pv = memory.get(key, (-math.inf, math.inf, None))
+        if lower >= beta or upper <= alpha or lower == upper:
+            if stats is not None:
+                stats.memory_hits += 1
+            return (upper if upper <= alpha else lower), stored_pv or (node_name, None)
+        alpha = max(alpha, lower)
+        beta = min(beta, upper)
+    if stats is not None:
+        stats.record_expand(ply)
+
+    probabilities = node.get('chance')
+    if probabilities is not None:
+        value, pv = _star_chance(node_name, children, probabilities, tree, alpha, beta, is_maximizing, depth, bounds, memory, ply, stats)
+    else:
+        value, pv = _star_decision(node_name, children, tree, alpha, beta, is_maximizing, depth, bounds, memory, ply, stats)
+
+    if memory is not None:
+        if value <= alpha:
+            upper = value
+        elif value >= beta:
+            lower = value
+        else:
+            lower = upper = value
+            stored_pv = pv
+        memory[key] = (lower, upper, stored_pv)
+    return value, pv
+
+def _star_decision(node_name, children, tree, alpha, beta, is_maximizing, depth, bounds, memory, ply, stats):
+    # MAX / MIN node: fail-soft alpha-beta, so a value outside the window is still a bound
+    next_depth = None if depth is None else depth - 1
+    best_value = -math.inf if is_maximizing else math.inf
+    best_pv = None
+    for i, child in enumerate(children):
+        value, pv = _star_pv(child, tree, alpha, beta, not is_maximizing, next_depth, bounds, memory, ply + 1, stats)
+        if value > best_value if is_maximizing else value < best_value:
+            best_value = value
+            best_pv = (node_name, pv)
+        if is_maximizing:
+            alpha = max(alpha, best_value)
+        else:
+            beta = min(beta, best_value)
+        if beta <= alpha:
+            if stats is not None:
+                stats.record_cutoff(ply, *subtree_counts(tree, children[i + 1:], stats.subtree_index))
+            break
+    return best_value, best_pv
+
+def _can_probe(children, tree, depth):
+    """Star2 needs every outcome to be a MAX/MIN node with a move to probe."""
+    if depth is not None and depth < 2:
+        return False
+    for child in children:
+        node = tree[child]
+        if node['is_terminal'] or not node['children'] or 'chance' in node:
+            return False
+    return True
+
+def _star_chance(node_name, children, probabilities, tree, alpha, beta, is_maximizing, depth, bounds, memory, ply, stats):
+    lower, upper = bounds
+    next_depth = None if depth is None else depth - 1
+    low = [lower] * len(children)   # Per-outcome bounds, tightened by Star2 probes
+    high = [upper] * len(children)
+
+    if memory is not None and lower < upper and _can_probe(children, tree, depth):
+        probe_depth = None if depth is None else depth - 2
+        for i, child in enumerate(children):
+            p = probabilities[i]
+            first_move = tree[child]['children'][0]
+            if is_maximizing:
+                # A MAX outcome is worth at least its first move
+                others = sum(q * v for q, v in zip(probabilities, low)) - p * low[i]
+                probe_beta = min(upper, (beta - others) / p)
+                if probe_beta <= lower:  # The bounds from earlier probes already reach beta
+                    if stats is not None:
+                        stats.record_cutoff(ply, *subtree_counts(tree, children[i:], stats.subtree_index))
+                    return others + p * low[i], (node_name, None)
+                value, _ = _star_pv(first_move, tree, lower, probe_beta, False, probe_depth, bounds, memory, ply + 2, stats)
+                low[i] = max(low[i], value)
+            else:
+                # A MIN outcome is worth at most its first move
+                others = sum(q * v for q, v in zip(probabilities, high)) - p * high[i]
+                probe_alpha = max(lower, (alpha - others) / p)
+                if probe_alpha >= upper:
+                    if stats is not None:
+                        stats.record_cutoff(ply, *subtree_counts(tree, children[i:], stats.subtree_index))
+                    return others + p * high[i], (node_name, None)
+                value, _ = _star_pv(first_move, tree, probe_alpha, upper, True, probe_depth, bounds, memory, ply + 2, stats)
+                high[i] = min(high[i], value)
+
+    # Star1: search each outcome with the window that would decide the chance node
+    searched = 0  # Probability-weighted sum of the outcomes searched so far
+    low_rest = sum(p * v for p, v in zip(probabilities, low))
+    high_rest = sum(p * v for p, v in zip(probabilities, high))
+    likeliest = _likeliest(probabilities)
+    best_pv = (node_name, None)
+    for i, child in enumerate(children):
+        p = probabilities[i]
+        low_rest -= p * low[i]
+        high_rest -= p * high[i]
+        child_alpha = (alpha - searched - high_rest) / p
+        child_beta = (beta - searched - low_rest) / p
+        if child_alpha >= high[i] or child_beta <= low[i]:
+            # Decided without searching this outcome at all
+            if stats is not None:
+                stats.record_cutoff(ply, *subtree_counts(tree, children[i:], stats.subtree_index))
+            if child_alpha >= high[i]:
+                return searched + p * high[i] + high_rest, (node_name, None)
+            return searched + p * low[i] + low_rest, (node_name, None)
+        if low[i] >= high[i]:  # Outcome already known exactly from its probe
+            searched += p * low[i]
+            continue
+        window = max(child_alpha, low[i]), min(child_beta, high[i])
+        if window[0] >= window[1]:  # Narrowed to nothing by rounding: search for the exact value instead
+            window = low[i], high[i]
+        value, pv = _star_pv(child, tree, window[0], window[1], is_maximizing, next_depth, bounds, memory, ply + 1, stats)
+        searched += p * value
+        if i == likeliest:
+            best_pv = (node_name, pv)
+        if value <= child_alpha or value >= child_beta:
+            if stats is not None:
+                stats.record_cutoff(ply, *subtree_counts(tree, children[i + 1:], stats.subtree_index))
+            return searched + (high_rest if value <= child_alpha else low_rest), (node_name, None)
+    return searched, best_pv
@@ -0,0 +1,100 @@
+from game_tree import CompactTree, py_value
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the vectorized engine needs it
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+# --- Level Extraction ---
+def _require_numpy():
+    if np is None:
+        raise ImportError("The vectorized search needs NumPy (pip install numpy).")
+
+def tree_levels(tree, root_id, depth=None):
+    """Splits a complete tree into levels of node ids, the root level first.
+
+    Every node on a level must have the same number of children (the
+    branching factor) or, on the last level, none. A level is returned as a
+    slice when its ids are consecutive - as in generate_tree's level order -
+    so leaf values can be read without a copy, and as an id array otherwise.
+    Levels stop at `depth` plies when a depth limit is given. Raises
+    ValueError if the tree is not complete.
+    """
+    _require_numpy()
+    child_start = np.frombuffer(tree.child_start, dtype=np.int32)
+    child_ids = np.frombuffer(tree.child_ids, dtype=np.int32)
+    branching = int(child_start[root_id + 1] - child_start[root_id])
+    levels = [slice(root_id, root_id + 1)]
+    while branching and (depth is None or len(levels) <= depth):
+        nodes = levels[-1]
+        if isinstance(nodes, slice):
+            counts = np.diff(child_start[nodes.start:nodes.stop + 1])
+        else:
+            counts = child_start[nodes + 1] - child_start[nodes]
+        if not np.any(counts):
+            break
+        if np.any(counts != branching):
+            raise ValueError(f"Tree is not complete: ply {len(levels) - 1} mixes nodes with and without "
+                             f"{branching} children.")
+        if isinstance(nodes, slice):
+            children = child_ids[child_start[nodes.start]:child_start[nodes.stop]]
+        else:
+            children = child_ids[(child_start[nodes][:, None] + np.arange(branching)).ravel()]
+        first = int(children[0])
+        if int(children[-1]) - first == len(children) - 1 and np.all(np.diff(children) == 1):
+            levels.append(slice(first, first + len(children)))
+        else:
+            levels.append(children)
+    return levels, branching
+
+
+# --- Vectorized Minimax ---
+def minimax_vectorized(node_name, tree, is_maximizing, depth=None, stats=None):
+    """minimax_with_path for complete trees, one NumPy reduction per level.
+
+    The values on the deepest searched level (leaf values, or the static
+    `eval` values at a depth limit) are reshaped to (-1, b) and reduced with
+    max/min, alternating up to the root. The principal variation is then
+    recovered top-down with argmax/argmin over the kept level values; both
+    take the first of equal children, as the recursive search's strict `>`
+    and `<` do. `tree` may be a CompactTree or a dict tree, and `node_name`
+    may also be a node id. Raises ValueError if the tree below the root is
+    not complete.
+    """
+    _require_numpy()
+    if not isinstance(tree, CompactTree):
+        tree = CompactTree.from_tree_data(tree)
+    root_id = tree.node_id(node_name) if isinstance(node_name, str) else node_name
+    levels, branching = tree_levels(tree, root_id, depth)
+    values = np.frombuffer(tree.values, dtype=np.float64)
+
+    # Bottom-up: level_values[k] holds the minimax value of every node on level k
+    height = len(levels) - 1
+    level_values = [None] * len(levels)
+    level_values[height] = values[levels[height]]  # A view for a slice, a gather for an id array
+    for ply in range(height - 1, -1, -1):
+        grouped = level_values[ply + 1].reshape(-1, branching)
+        maximizing = is_maximizing if ply % 2 == 0 else not is_maximizing
+        level_values[ply] = grouped.max(axis=1) if maximizing else grouped.min(axis=1)
+
+    # Top-down: follow the best child from the root
+    position = 0
+    path_ids = [root_id]
+    for ply in range(height):
+        start = position * branching
+        children = level_values[ply + 1][start:start + branching]
+        maximizing = is_maximizing if ply % 2 == 0 else not is_maximizing
+        position = start + int(children.argmax() if maximizing else children.argmin())
+        nodes = levels[ply + 1]
+        path_ids.append(nodes.start + position if isinstance(nodes, slice) else int(nodes[position]))
+
+    if stats is not None:
+        for ply in range(height):
+            stats.nodes_expanded += branching ** ply
+        stats.leaves_evaluated += branching ** height
+        stats.max_depth = max(stats.max_depth, height)
+    names = tree.names
+    return py_value(float(level_values[0][0])), [names[i] for i in path_ids]
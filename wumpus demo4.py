@@ -12,27 +12,323 @@ CELL_SIZE = 80
 ICON_SCALE_FACTOR = 0.7
 ICON_SIZE = (int(CELL_SIZE * ICON_SCALE_FACTOR), int(CELL_SIZE * ICON_SCALE_FACTOR))
 WIN_EXIT_DELAY_MS = 3000
+KB_SEARCH_DECISIONS = 20000  # Branching budget for one knowledge base query before it answers "unknown"
+PIT_PRIOR = 0.2  # Chance that any given unexplored cell holds a pit, for risk estimates
+MAX_EXACT_COMPONENT = 20  # Frontier cells one breeze component may have before its pits are estimated locally
+
+# KnowledgeGrid - one bit per cell for the agent's knowledge
+class KnowledgeGrid:
+    """A size x size grid of booleans packed into one Python int (bit x * size + y).
+
+    grid[x][y] reads and assigns single cells like the nested lists it
+    replaces. &, |, ~ and neighbours() work on every cell at once, e.g.
+    safe = ~possible_wumpus & ~possible_pit.
+    """
+
+    def __init__(self, size, bits=0):
+        self.size = size
+        self.full = (1 << size * size) - 1
+        self.bits = bits & self.full
+
+    @classmethod
+    def filled(cls, size):
+        return cls(size, -1)
+
+    @classmethod
+    def cell(cls, size, x, y):
+        return cls(size, 1 << (x * size + y))
+
+    def get(self, x, y):
+        return self.bits >> (x * self.size + y) & 1 == 1
+
+    def set(self, x, y, value=True):
+        if value:
+            self.bits |= 1 << (x * self.size + y)
+        else:
+            self.bits &= ~(1 << (x * self.size + y))
+
+    def __getitem__(self, x):
+        return _KnowledgeRow(self, x)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, cell):
+        return self.get(*cell)
+
+    def count(self):
+        return bin(self.bits).count("1")
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __eq__(self, other):
+        return isinstance(other, KnowledgeGrid) and self.size == other.size and self.bits == other.bits
+
+    def __and__(self, other):
+        return KnowledgeGrid(self.size, self.bits & other.bits)
+
+    def __or__(self, other):
+        return KnowledgeGrid(self.size, self.bits | other.bits)
+
+    def __invert__(self):
+        return KnowledgeGrid(self.size, ~self.bits)
+
+    def __iand__(self, other):
+        self.bits &= other.bits
+        return self
+
+    def __ior__(self, other):
+        self.bits |= other.bits
+        return self
+
+    def neighbours(self):
+        """The cells next to (not diagonal to) any set cell."""
+        first_column, last_column = _column_masks(self.size)
+        bits = self.bits
+        moved = (bits << self.size) | (bits >> self.size)  # x + 1 and x - 1
+        moved |= (bits << 1) & ~first_column  # y + 1, without wrapping onto the next row
+        moved |= (bits >> 1) & ~last_column  # y - 1
+        return KnowledgeGrid(self.size, moved)
+
+    def cells(self):
+        """(x, y) of every set cell, in bit order."""
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            yield divmod(low.bit_length() - 1, self.size)
+            bits ^= low
+
+class _KnowledgeRow:
+    """grid[x] of a KnowledgeGrid: indexing it with y reads or assigns one cell."""
+
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.x = x
+
+    def __getitem__(self, y):
+        return self.grid.get(self.x, y)
+
+    def __setitem__(self, y, value):
+        self.grid.set(self.x, y, value)
+
+    def __len__(self):
+        return self.grid.size
+
+    def __iter__(self):
+        return (self.grid.get(self.x, y) for y in range(self.grid.size))
+
+_COLUMN_MASKS = {}
+
+def _column_masks(size):
+    """Bits of the y == 0 and y == size - 1 cells of a KnowledgeGrid."""
+    masks = _COLUMN_MASKS.get(size)
+    if masks is None:
+        first = sum(1 << (x * size) for x in range(size))
+        masks = _COLUMN_MASKS[size] = (first, first << (size - 1))
+    return masks
+
+# PropositionalKB - CNF clauses over the agent's hazard variables
+class _SearchBudgetExceeded(Exception):
+    pass
+
+class PropositionalKB:
+    """A CNF knowledge base with incremental unit propagation over two watched literals.
+
+    Variables are numbered from 1 and a literal is +var or -var. Clauses are
+    added one at a time and propagated at once, so the literals fixed so far
+    are always known (take_fixed). entails() goes further with a DPLL search
+    under the negated query, branching only on variables of clauses that are
+    not yet satisfied.
+    """
+
+    def __init__(self, num_vars):
+        self.values = [None] * (num_vars + 1)  # Per variable: True, False or None (unassigned)
+        self.clauses = []
+        self.watches = collections.defaultdict(list)  # Literal -> indexes of the clauses watching it
+        self.trail = []  # Assigned literals in order
+        self.levels = []  # Trail length at each decision
+        self.queue_head = 0  # Trail position up to which assignments have been propagated
+        self.reported = 0  # Trail position up to which take_fixed has returned literals
+
+    def value(self, lit):
+        value = self.values[abs(lit)]
+        if value is None:
+            return None
+        return value if lit > 0 else not value
+
+    def add_clause(self, lits):
+        """Adds a clause and propagates it. Raises ValueError if it contradicts the knowledge base."""
+        lits = set(lits)
+        if any(-lit in lits for lit in lits) or any(self.value(lit) for lit in lits):
+            return  # Always or already satisfied
+        lits = [lit for lit in lits if self.value(lit) is None]
+        if not lits:
+            raise ValueError("Clause contradicts the knowledge base.")
+        if len(lits) == 1:
+            self._assign(lits[0])
+        else:
+            self.watches[lits[0]].append(len(self.clauses))
+            self.watches[lits[1]].append(len(self.clauses))
+            self.clauses.append(lits)
+        if not self._propagate():
+            raise ValueError("Clause contradicts the knowledge base.")
+
+    def take_fixed(self):
+        """Literals proven true since the last call."""
+        fixed = self.trail[self.reported:]
+        self.reported = len(self.trail)
+        return fixed
+
+    def entails(self, lit, max_decisions=KB_SEARCH_DECISIONS):
+        """Whether `lit` follows from the clauses. A search over budget answers False (not proven)."""
+        value = self.value(lit)
+        if value is not None:
+            return value
+        self.levels.append(len(self.trail))
+        self._assign(-lit)
+        try:
+            return not self._search([max_decisions])
+        except _SearchBudgetExceeded:
+            return False
+        finally:
+            self._backtrack(0)
+
+    def _assign(self, lit):
+        self.values[abs(lit)] = lit > 0
+        self.trail.append(lit)
+
+    def _backtrack(self, level):
+        if level < len(self.levels):
+            for lit in self.trail[self.levels[level]:]:
+                self.values[abs(lit)] = None
+            del self.trail[self.levels[level]:]
+            del self.levels[level:]
+        self.queue_head = len(self.trail)
+
+    def _propagate(self):
+        """Unit propagation from the unpropagated trail; False on a conflict."""
+        while self.queue_head < len(self.trail):
+            false_lit = -self.trail[self.queue_head]
+            self.queue_head += 1
+            watching = self.watches[false_lit]
+            kept = []
+            for n, index in enumerate(watching):
+                clause = self.clauses[index]
+                if clause[0] == false_lit:  # Keep the false watch in slot 1
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.value(clause[0]) is True:
+                    kept.append(index)
+                    continue
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches[clause[1]].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if self.value(clause[0]) is False:
+                        kept.extend(watching[n + 1:])
+                        self.watches[false_lit] = kept
+                        self.queue_head = len(self.trail)
+                        return False
+                    self._assign(clause[0])
+            self.watches[false_lit] = kept
+        return True
+
+    def _search(self, budget):
+        if not self._propagate():
+            return False
+        var = self._branch_variable()
+        if var is None:
+            return True  # Every clause is satisfied; the remaining variables are free
+        level = len(self.levels)
+        for lit in (var, -var):
+            budget[0] -= 1
+            if budget[0] < 0:
+                raise _SearchBudgetExceeded()
+            self.levels.append(len(self.trail))
+            self._assign(lit)
+            if self._search(budget):
+                return True
+            self._backtrack(level)
+        return False
+
+    def _branch_variable(self):
+        """An unassigned variable from the first clause not yet satisfied, or None if all are."""
+        for clause in self.clauses:
+            unassigned = None
+            for lit in clause:
+                value = self.value(lit)
+                if value:
+                    break
+                if value is None and unassigned is None:
+                    unassigned = abs(lit)
+            else:
+                return unassigned
+        return None
+
+def _pit_marginals(variables, clauses, prior):
+    """P(pit) for each variable given that every clause (a tuple of variables) holds at least one pit.
+
+    Enumerates the assignments of `variables`, abandoning a branch as soon
+    as one of its clauses has no pit left, and weights each model by the
+    independent pit prior.
+    """
+    variables = sorted(variables)
+    position = {var: i for i, var in enumerate(variables)}
+    # Each clause is checked once its last variable has been assigned
+    closing = collections.defaultdict(list)
+    for clause in clauses:
+        closing[max(position[var] for var in clause)].append([position[var] for var in clause])
+    assignment = [False] * len(variables)
+    weights = [0.0] * len(variables)
+    total = 0.0
+
+    def enumerate_from(i, weight):
+        nonlocal total
+        if i == len(variables):
+            total += weight
+            for k, has_pit in enumerate(assignment):
+                if has_pit:
+                    weights[k] += weight
+            return
+        for has_pit, factor in ((True, prior), (False, 1 - prior)):
+            assignment[i] = has_pit
+            if all(any(assignment[k] for k in clause) for clause in closing[i]):
+                enumerate_from(i + 1, weight * factor)
+        assignment[i] = False
+
+    enumerate_from(0, 1.0)
+    return {var: weights[i] / total if total else prior for i, var in enumerate(variables)}
 
 # WumpusSolverAgent - ADD THIS CLASS HERE, BEFORE ANY OTHER CLASSES
 class WumpusSolverAgent:
-    def __init__(self, world_instance):
+    def __init__(self, world_instance, probabilistic=False):
         self.world = world_instance
+        self.probabilistic = probabilistic  # Step onto the least risky frontier cell instead of giving up
         self.size = world_instance.size
         
         # Agent's internal state
         self.agent_pos = world_instance.agent_pos
         self.has_gold = False
+        self.safe_unvisited = set()  # Safe cells not yet visited, added as they become safe (the planner's targets)
+        self.marked_goal = None  # Gold position a risk-tolerant path has been marked to
+        self.known_wumpus = None  # Cell the knowledge base has proven holds the wumpus
+        self.known_pits = set()  # Cells it has proven hold pits
+        self.kb = PropositionalKB(2 * self.size * self.size)
+        self.pit_marginal_cache = {}  # Breeze component (variables, clauses) -> its pit probabilities
         self.knowledge = self._initialize_knowledge()
         self.plan = []
         self.actions_taken = []
 
     def _initialize_knowledge(self):
         knowledge = {
-            'visited': [[False for _ in range(self.size)] for _ in range(self.size)],
-            'safe': [[False for _ in range(self.size)] for _ in range(self.size)],
+            'visited': KnowledgeGrid(self.size),
+            'safe': KnowledgeGrid(self.size),
             # Initially, assume hazards could be anywhere except start
-            'possible_wumpus': [[True for _ in range(self.size)] for _ in range(self.size)],
-            'possible_pit': [[True for _ in range(self.size)] for _ in range(self.size)],
+            'possible_wumpus': KnowledgeGrid.filled(self.size),
+            'possible_pit': KnowledgeGrid.filled(self.size),
         }
         # Start cell is visited and known safe, cannot contain hazards
         start_x, start_y = self.agent_pos
@@ -40,8 +336,16 @@ class WumpusSolverAgent:
         knowledge['safe'][start_x][start_y] = True
         knowledge['possible_wumpus'][start_x][start_y] = False
         knowledge['possible_pit'][start_x][start_y] = False
+        self.kb.add_clause([-self._wumpus_var(start_x, start_y)])
+        self.kb.add_clause([-self._pit_var(start_x, start_y)])
         return knowledge
 
+    def _wumpus_var(self, x, y):
+        return x * self.size + y + 1
+
+    def _pit_var(self, x, y):
+        return self.size * self.size + x * self.size + y + 1
+
     def _is_valid(self, x, y):
         return 0 <= x < self.size and 0 <= y < self.size
 
@@ -54,36 +358,190 @@ class WumpusSolverAgent:
         return adj
 
     def _update_knowledge(self):
+        """Adds the percepts at the agent's cell; only that cell and its neighbours can change."""
         x, y = self.agent_pos
         if not self.knowledge['visited'][x][y]:
              self.knowledge['visited'][x][y] = True
+        self.safe_unvisited.discard((x, y))
 
         # Get percepts at the current location
         perceived_stench = (x, y) in self.world.stench
         perceived_breeze = (x, y) in self.world.breeze
 
-        adjacent_cells = self._get_adjacent(x, y)
-
-        # Update safety based on lack of percepts
-        if not perceived_stench:
+        # Tell the knowledge base what the percepts say about the neighbours
+        kb = self.kb
+        adjacent = KnowledgeGrid.cell(self.size, x, y).neighbours()
+        adjacent_cells = list(adjacent.cells())
+        kb.add_clause([-self._wumpus_var(x, y)])  # The agent is alive here
+        kb.add_clause([-self._pit_var(x, y)])
+        if perceived_stench:
+            kb.add_clause([self._wumpus_var(nx, ny) for nx, ny in adjacent_cells])
+            # There is one wumpus: it is next to this cell, so nowhere else, and not in two of these cells
+            for cx, cy in (self.knowledge['possible_wumpus'] & ~adjacent).cells():
+                kb.add_clause([-self._wumpus_var(cx, cy)])
+            candidates = [cell for cell in adjacent_cells if self.knowledge['possible_wumpus'][cell[0]][cell[1]]]
+            for i, (ax, ay) in enumerate(candidates):
+                for bx, by in candidates[i + 1:]:
+                    kb.add_clause([-self._wumpus_var(ax, ay), -self._wumpus_var(bx, by)])
+        else:
             for nx, ny in adjacent_cells:
-                self.knowledge['possible_wumpus'][nx][ny] = False
-        if not perceived_breeze:
+                kb.add_clause([-self._wumpus_var(nx, ny)])
+        if perceived_breeze:
+            kb.add_clause([self._pit_var(nx, ny) for nx, ny in adjacent_cells])
+        else:
             for nx, ny in adjacent_cells:
-                self.knowledge['possible_pit'][nx][ny] = False
-        
-        # Mark cells as safe if known no wumpus AND no pit
-        for r in range(self.size):
-            for c in range(self.size):
-                if not self.knowledge['possible_wumpus'][r][c] and not self.knowledge['possible_pit'][r][c]:
-                    self.knowledge['safe'][r][c] = True
+                kb.add_clause([-self._pit_var(nx, ny)])
+        self._propagate_safety(self._absorb_facts())
                 
-        # Try to locate the gold through more aggressive exploration
-        if self.world.gold_pos is not None:
+        # Try to locate the gold through more aggressive exploration. The probabilistic
+        # mode takes its risks from its own estimates instead, so it skips this shortcut.
+        if not self.probabilistic and self.world.gold_pos is not None and self.world.gold_pos != self.marked_goal:
             gold_x, gold_y = self.world.gold_pos
-            # If we can see the gold position (through the world object), mark a path to it
+            # If we can see the gold position (through the world object), mark a path to it once;
+            # a path found from any cell the agent can reach is as good as one from the next
+            self.marked_goal = self.world.gold_pos
             self._mark_path_to_goal(gold_x, gold_y)
 
+    def _absorb_facts(self):
+        """Copies the literals the knowledge base has newly proven into the grids; returns the cells they cleared."""
+        cells = self.size * self.size
+        cleared = []
+        for lit in self.kb.take_fixed():
+            index = abs(lit) - 1
+            is_pit = index >= cells
+            x, y = divmod(index - cells if is_pit else index, self.size)
+            if lit > 0:
+                if is_pit:
+                    self.known_pits.add((x, y))
+                else:
+                    self.known_wumpus = (x, y)
+            else:
+                self.knowledge['possible_pit' if is_pit else 'possible_wumpus'][x][y] = False
+                cleared.append((x, y))
+        return cleared
+
+    def _prove_frontier_safe(self):
+        """Searches the knowledge base for unvisited cells next to visited ones that are provably safe.
+
+        Unit propagation misses conclusions that need case analysis; this runs
+        the full search, so it is only used when nothing is left to explore.
+        """
+        knowledge = self.knowledge
+        frontier = knowledge['visited'].neighbours() & ~knowledge['visited'] & ~knowledge['safe']
+        for x, y in frontier.cells():
+            no_wumpus, no_pit = -self._wumpus_var(x, y), -self._pit_var(x, y)
+            if self.kb.entails(no_wumpus) and self.kb.entails(no_pit):
+                self.kb.add_clause([no_wumpus])
+                self.kb.add_clause([no_pit])
+        self._propagate_safety(self._absorb_facts())
+        return bool(self.safe_unvisited)
+
+    def _hazard_probabilities(self, cells):
+        """P(wumpus or pit) for each of `cells`, given everything perceived so far.
+
+        Pits are independent with PIT_PRIOR, so only the breeze clauses over
+        the frontier matter. Those are split into independent components,
+        each enumerated once and remembered until its clauses change. The
+        single wumpus is equally likely in every cell not ruled out.
+        """
+        cells_per_grid = self.size * self.size
+        kb = self.kb
+        # Breeze clauses not yet satisfied, reduced to their undecided pit variables
+        clauses = set()
+        for clause in kb.clauses:
+            if clause[0] > cells_per_grid and not any(kb.value(lit) for lit in clause):
+                clauses.add(tuple(sorted(lit for lit in clause if kb.value(lit) is None)))
+
+        # Union-find over the clause variables splits them into independent components
+        parent = {}
+        def find(var):
+            while parent.setdefault(var, var) != var:
+                parent[var] = parent[parent[var]]
+                var = parent[var]
+            return var
+        for clause in clauses:
+            for var in clause[1:]:
+                parent[find(var)] = find(clause[0])
+        components = collections.defaultdict(list)
+        for clause in clauses:
+            components[find(clause[0])].append(clause)
+
+        pit_probability = {}
+        for component in components.values():
+            key = tuple(sorted(component))
+            marginals = self.pit_marginal_cache.get(key)
+            if marginals is None:
+                variables = {var for clause in component for var in clause}
+                if len(variables) <= MAX_EXACT_COMPONENT:
+                    marginals = _pit_marginals(variables, component, PIT_PRIOR)
+                else:
+                    # Too many cells to enumerate together: use only the clauses each cell is in
+                    marginals = {}
+                    for var in variables:
+                        local = [clause for clause in component if var in clause]
+                        local_vars = {v for clause in local for v in clause}
+                        marginals[var] = _pit_marginals(local_vars, local, PIT_PRIOR)[var]
+                self.pit_marginal_cache[key] = marginals
+            pit_probability.update(marginals)
+
+        wumpus_candidates = self.knowledge['possible_wumpus'].count()
+        risks = {}
+        for x, y in cells:
+            pit_var = self._pit_var(x, y)
+            known = kb.value(pit_var)
+            p_pit = pit_probability.get(pit_var, PIT_PRIOR) if known is None else float(known)
+            if self.known_wumpus is not None:
+                p_wumpus = float(self.known_wumpus == (x, y))
+            elif self.knowledge['possible_wumpus'][x][y]:
+                p_wumpus = 1 / wumpus_candidates
+            else:
+                p_wumpus = 0.0
+            risks[(x, y)] = 1 - (1 - p_pit) * (1 - p_wumpus)
+        return risks
+
+    def _plan_least_risky_move(self):
+        """A path through safe cells onto the frontier cell least likely to hold a hazard, or None."""
+        knowledge = self.knowledge
+        frontier = list((knowledge['visited'].neighbours() & ~knowledge['visited'] & ~knowledge['safe']).cells())
+        if not frontier:
+            return None
+        risks = self._hazard_probabilities(frontier)
+        ax, ay = self.agent_pos
+        for target in sorted(frontier, key=lambda cell: (risks[cell], abs(cell[0] - ax) + abs(cell[1] - ay))):
+            if risks[target] >= 1:
+                return None
+            tx, ty = target
+            approach = {cell for cell in self._get_adjacent(tx, ty) if knowledge['safe'][cell[0]][cell[1]]}
+            path = self._find_safe_path(self.agent_pos, lambda pos: pos in approach)
+            if path is None:
+                continue
+            end_x = ax + sum(dx for dx, _ in path)
+            end_y = ay + sum(dy for _, dy in path)
+            if (end_x, end_y) in approach:  # Not _find_safe_path's blind first move
+                self.actions_taken.append(f'Take Risk - {risks[target]:.0%} Hazard at {target}')
+                return path + [(tx - end_x, ty - end_y)]
+        return None
+
+    def _note_gold_pickup(self):
+        """The world picks the gold up as the agent steps onto it; record that as the grab."""
+        if self.world.has_gold and not self.has_gold:
+            self.has_gold = True
+            self.actions_taken.append('Grab Gold')
+
+    def _propagate_safety(self, worklist):
+        """Marks safe every cell on the worklist that is known to hold neither a wumpus nor a pit."""
+        while worklist:
+            x, y = worklist.pop()
+            if not self.knowledge['possible_wumpus'][x][y] and not self.knowledge['possible_pit'][x][y]:
+                self._mark_safe(x, y)
+
+    def _mark_safe(self, x, y):
+        if self.knowledge['safe'][x][y]:
+            return
+        self.knowledge['safe'][x][y] = True
+        if not self.knowledge['visited'][x][y]:
+            self.safe_unvisited.add((x, y))
+
     def _find_safe_path(self, start, goal_condition_func):
         """Uses BFS to find shortest path in known safe squares."""
         # If already at goal, return empty path
@@ -97,6 +555,7 @@ class WumpusSolverAgent:
         
         q = collections.deque([(start, [])]) # ((x, y), path_list)
         visited_path = {start}
+        safe = self.knowledge['safe']
 
         while q:
             (curr_x, curr_y), path = q.popleft()
@@ -105,7 +564,7 @@ class WumpusSolverAgent:
                 next_x, next_y = curr_x + dx, curr_y + dy
                 
                 if self._is_valid(next_x, next_y) and \
-                   self.knowledge['safe'][next_x][next_y] and \
+                   safe.get(next_x, next_y) and \
                    (next_x, next_y) not in visited_path:
                     
                     new_path = path + [(dx, dy)]
@@ -183,7 +642,7 @@ class WumpusSolverAgent:
                 for dx, dy in path:
                     next_x, next_y = current_x + dx, current_y + dy
                     # Mark this cell as safer (not guaranteed safe, but worth exploring)
-                    self.knowledge['safe'][next_x][next_y] = True
+                    self._mark_safe(next_x, next_y)
                     current_x, current_y = next_x, next_y
                 return
             
@@ -269,21 +728,24 @@ class WumpusSolverAgent:
                 success, message = self.world.move_agent(dx, dy)
                 self.actions_taken.append(action_name)
                 self.agent_pos = self.world.agent_pos # Update internal tracker
+                self._note_gold_pickup()
                 if not success or self.world.game_over:
                      break # Plan failed or game ended unexpectedly
                 continue
 
             # 4. Find a new plan: Explore safe unvisited square or return home
+            if not self.has_gold and not self.safe_unvisited and self.actions_taken:
+                self._prove_frontier_safe()
             target_condition = None
             if self.has_gold:
                 # Plan to go home
                 target_condition = lambda pos: pos == (start_x, start_y)
-            else:
+            elif self.safe_unvisited or not self.actions_taken:
                 # Plan to explore nearest safe, unvisited square
-                target_condition = lambda pos: self.knowledge['safe'][pos[0]][pos[1]] and \
-                                               not self.knowledge['visited'][pos[0]][pos[1]]
+                target_condition = lambda pos: pos in self.safe_unvisited
 
-            self.plan = self._find_safe_path(self.agent_pos, target_condition)
+            # Nothing safe is left to explore: no need to search for it
+            self.plan = self._find_safe_path(self.agent_pos, target_condition) if target_condition else None
 
             if self.plan is None:
                 # If we have gold, prioritize getting home even with some risk
@@ -294,6 +756,12 @@ class WumpusSolverAgent:
                     if risk_path:
                         self.plan = risk_path
                         continue
+                elif self.probabilistic:
+                    # Nothing is provably safe: take the smallest risk on offer
+                    risk_path = self._plan_least_risky_move()
+                    if risk_path:
+                        self.plan = risk_path
+                        continue
                         
                 # Truly stuck with no options
                 self.actions_taken.append('Get Stuck')
@@ -306,6 +774,7 @@ class WumpusSolverAgent:
                  success, message = self.world.move_agent(dx, dy)
                  self.actions_taken.append(action_name)
                  self.agent_pos = self.world.agent_pos
+                 self._note_gold_pickup()
                  if not success or self.world.game_over:
                      break
             else:
@@ -592,6 +1061,11 @@ class WumpusWorldUI(tk.Frame):
                                       command=self.show_solution)
         self.solve_button.pack(pady=5, fill="x")
 
+        # When nothing is provably safe, let the solver step onto the least risky cell
+        self.take_risks_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(solver_frame, text="Take calculated risks", variable=self.take_risks_var,
+                       font=("Arial", 9), bg=self.colors['background'], fg=self.colors['text']).pack(anchor='w')
+
     def create_utility_buttons(self, parent_frame):
         """Creates utility buttons like Exit."""
         utility_frame = tk.Frame(parent_frame, bg=self.colors['background'])
@@ -755,7 +1229,7 @@ class WumpusWorldUI(tk.Frame):
             # REGULAR CASE: If not at start, use the solver
             import copy
             temp_world = copy.deepcopy(self.world)
-            solver = WumpusSolverAgent(temp_world)
+            solver = WumpusSolverAgent(temp_world, probabilistic=self.take_risks_var.get())
             
             # Run the solver to get the solution path
             solution_moves = solver.solve()